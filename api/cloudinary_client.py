@@ -0,0 +1,219 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+import cloudinary
+from cloudinary import utils
+from cloudinary.exceptions import Error
+
+import urllib3
+from urllib3.exceptions import HTTPError
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+#? public ids per delete_resources call, most cloudinary accepts
+DELETE_BATCH_SIZE = 100
+
+
+class Metrics:
+    '''
+        Thread safe count and timings (seconds) of operations,
+        for the current process
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, operation, seconds, failed=False):
+        with self.lock:
+            stats = self.stats.setdefault(operation, {
+                'count': 0,
+                'failed': 0,
+                'total': 0.0,
+                'max': 0.0,
+            })
+            stats['count'] += 1
+            stats['failed'] += failed
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+
+    def get(self):
+        '''
+            Returns a copy of stats per operation, with average timings
+        '''
+        with self.lock:
+            return {
+                operation: {
+                    **stats,
+                    'average': stats['total'] / stats['count'],
+                }
+                for operation, stats in self.stats.items()
+            }
+
+    def clear(self):
+        with self.lock:
+            self.stats.clear()
+
+
+class CloudinaryClient:
+    '''
+        Calls cloudinary over a pool of kept alive HTTP connections
+
+        The cloudinary SDK keeps one connection per host, a pool shared by
+        threads of the process lets uploads and deletes run in parallel
+        without opening a connection each. Requests are built and signed
+        with the SDK's public utils and sent on the pool.
+
+        Note: settings.CLOUDINARY_UPLOAD_PREFIX points it to another
+        server (e.g. a fake server in tests)
+    '''
+
+    def __init__(self):
+        self.http = utils.get_http_connector(
+            cloudinary.config(),
+            {
+                **cloudinary.CERT_KWARGS,
+                'maxsize':
+                settings.CLOUDINARY_POOL_SIZE,
+                'timeout':
+                urllib3.Timeout(
+                    connect=settings.CLOUDINARY_CONNECT_TIMEOUT,
+                    read=settings.CLOUDINARY_READ_TIMEOUT,
+                ),
+            },
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.CLOUDINARY_POOL_SIZE,
+            thread_name_prefix='cloudinary',
+        )
+        self.headers = urllib3.make_headers(
+            user_agent=cloudinary.get_user_agent())
+        self.metrics = Metrics()
+
+    def get_options(self):
+        if settings.CLOUDINARY_UPLOAD_PREFIX:
+            return {'upload_prefix': settings.CLOUDINARY_UPLOAD_PREFIX}
+
+        return {}
+
+    def request(self, method, url, fields, headers=None):
+        '''
+            Sends a request on the pool
+
+            returns:
+                - decoded JSON response
+
+            raises:
+                - cloudinary.exceptions.Error, when the request fails or
+                  cloudinary answers with an error
+        '''
+        try:
+            response = self.http.request(
+                method,
+                url,
+                fields=fields,
+                headers={
+                    **self.headers,
+                    **(headers or {}),
+                },
+            )
+            result = json.loads(response.data.decode())
+        except (HTTPError, OSError, ValueError) as ex:
+            raise Error(f'cloudinary {method} {url} failed - {ex!r}')
+
+        if 'error' in result:
+            raise Error(result['error']['message'])
+
+        return result
+
+    @contextmanager
+    def timed(self, operation):
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            seconds = time.perf_counter() - start
+            self.metrics.record(operation, seconds, failed=failed)
+            logger.info(f'cloudinary {operation} took {seconds * 1000:.0f}ms')
+
+    def upload(self, content, public_id):
+        '''
+            Uploads an encoded image under given public_id
+
+            returns:
+                - secure url of the uploaded image
+        '''
+        options = self.get_options()
+        params = utils.sign_request(
+            utils.build_upload_params(public_id=public_id),
+            options,
+        )
+
+        with self.timed('upload'):
+            uploaded = self.request(
+                'POST',
+                utils.cloudinary_api_url('upload', **options),
+                [*params.items(), ('file', ('file', content))],
+            )
+
+        return uploaded['secure_url']
+
+    def upload_many(self, items):
+        '''
+            Uploads (content, public_id) items in parallel
+
+            returns:
+                - secure urls, in order of items
+        '''
+        return list(self.executor.map(lambda item: self.upload(*item), items))
+
+    def delete(self, public_ids):
+        '''
+            Deletes images of given public_ids, batches of up to
+            DELETE_BATCH_SIZE in parallel
+
+            returns:
+                - dict of public_id to outcome ('deleted', 'not_found')
+        '''
+        batches = [
+            public_ids[index:index + DELETE_BATCH_SIZE]
+            for index in range(0, len(public_ids), DELETE_BATCH_SIZE)
+        ]
+
+        options = self.get_options()
+        url = utils.base_api_url(['resources', 'image', 'upload'], **options)
+        config = cloudinary.config()
+        auth = urllib3.make_headers(
+            basic_auth=f'{config.api_key}:{config.api_secret}')
+
+        def delete_batch(batch):
+            with self.timed('delete'):
+                return self.request(
+                    'DELETE',
+                    url,
+                    [('public_ids[]', public_id) for public_id in batch],
+                    headers=auth,
+                )['deleted']
+
+        deleted = {}
+        for result in self.executor.map(delete_batch, batches):
+            deleted.update(result)
+
+        return deleted
+
+
+@lru_cache(maxsize=None)
+def get_cloudinary_client():
+    '''
+        Returns the CloudinaryClient of the process
+    '''
+    return CloudinaryClient()
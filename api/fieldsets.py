@@ -0,0 +1,187 @@
+from rest_framework import permissions, serializers
+
+#? query params selecting the sparse fieldset
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+INCLUDE_PARAM = 'include'
+
+
+def parse_fieldset(value):
+    '''
+        Parses a comma separated list of (dotted) field paths
+
+        returns:
+            - frozenset of paths, None if param was not passed
+    '''
+    if value is None:
+        return None
+
+    return frozenset(path.strip() for path in value.split(',') if path.strip())
+
+
+def get_sparse_fieldset(request):
+    '''
+        Returns the (fields, expand, include) sparse fieldset asked by
+        the request
+
+        Note: only read (safe) requests can ask for a sparse fieldset
+    '''
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None, None, None
+
+    return (
+        parse_fieldset(request.query_params.get(FIELDS_PARAM)),
+        parse_fieldset(request.query_params.get(EXPAND_PARAM)),
+        parse_fieldset(request.query_params.get(INCLUDE_PARAM)),
+    )
+
+
+def _tree(paths):
+    '''
+        Groups dotted paths by their first field
+
+        returns:
+            - dict of field name to the set of remaining paths,
+              None for a field named without any remaining path
+    '''
+    tree = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        if not rest:
+            tree[name] = None
+        elif tree.get(name, frozenset()) is not None:
+            tree[name] = tree.get(name, frozenset()) | {rest}
+
+    return tree
+
+
+def _nested(field):
+    '''
+        Returns the nested ModelSerializer displaying given field, if any
+    '''
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+
+    if isinstance(field, serializers.ModelSerializer):
+        return field
+
+    return None
+
+
+def _collapsed(name, field):
+    '''
+        Returns a primary key field standing in for a nested serializer
+    '''
+    kwargs = {}
+    if field.source and field.source != name:
+        kwargs['source'] = field.source
+
+    return serializers.PrimaryKeyRelatedField(
+        read_only=True,
+        many=isinstance(field, serializers.ListSerializer),
+        **kwargs,
+    )
+
+
+def prune_fields(fields, only=None, expand=None):
+    '''
+        Prunes serializer fields in place to given sparse fieldset
+
+        args:
+            - fields: serializer fields, name to field mapping
+            - only: (dotted) paths of fields to keep, None keeps all.
+              e.g. `id,name,college.name`
+            - expand: (dotted) paths of nested serializers to display,
+              None displays all. Nested serializers not expanded are
+              displayed as primary keys
+    '''
+    only_tree = _tree(only) if only is not None else None
+    expand_tree = _tree(expand) if expand is not None else None
+
+    for name in list(fields):
+        field = fields[name]
+
+        if only_tree is not None and name not in only_tree:
+            fields.pop(name)
+            continue
+
+        nested = _nested(field)
+        if nested is None or field.source == '*':
+            continue
+
+        if expand_tree is not None and name not in expand_tree:
+            fields[name] = _collapsed(name, field)
+            continue
+
+        nested_only = only_tree.get(name) if only_tree is not None else None
+        nested_expand = None
+        if expand_tree is not None:
+            nested_expand = expand_tree.get(name) or frozenset()
+
+        if nested_only is not None or nested_expand is not None:
+            prune_fields(nested.fields, nested_only, nested_expand)
+
+
+class SparseFieldsetMixin:
+    '''
+        Mixin for Serializers to display a sparse fieldset asked by the
+        request with `?fields=`, `?expand=` and `?include=`
+
+        - fields: comma separated (dotted) fields to display,
+          e.g. `?fields=id,name,college.name`
+        - expand: comma separated (dotted) nested objects to display,
+          the rest is displayed as primary keys. e.g. `?expand=college`
+        - include: comma separated names of optional_fields to display
+
+        Without any of them all fields but optional ones are displayed.
+
+        attributes:
+            - optional_fields: dict of include name to list of heavy
+              fields displayed only when included
+
+        Note: applies only to the root serializer, which needs the
+        request (or a `sparse_fieldset` tuple) in its context. Use
+        QueryPlanMixin on the view to prune the queryset joins and
+        prefetches to the same fieldset.
+    '''
+    optional_fields = {}
+
+    def is_sparse_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if not self.is_sparse_root():
+            return fields
+
+        fieldset = self.get_sparse_fieldset()
+        if fieldset is None:
+            return fields
+
+        only, expand, include = fieldset
+
+        for name, optional in self.optional_fields.items():
+            if include is None or name not in include:
+                for field_name in optional:
+                    fields.pop(field_name, None)
+
+        if only is not None or expand is not None:
+            prune_fields(fields, only, expand)
+
+        return fields
+
+    def get_sparse_fieldset(self):
+        if 'sparse_fieldset' in self.context:
+            return self.context['sparse_fieldset']
+
+        #? outside of a request (e.g. schema generation) all fields are kept
+        request = self.context.get('request')
+        if request is None:
+            return None
+
+        return get_sparse_fieldset(request)
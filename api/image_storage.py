@@ -0,0 +1,268 @@
+import datetime
+import logging
+import re
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.queue import schedule
+
+from .cloudinary_client import get_cloudinary_client
+from .images import IMAGE_EXTENSIONS, get_extension
+from .models import ImageDeletionModel
+
+logger = logging.getLogger(__name__)
+
+#? folders and names of word characters and dashes, e.g. profile/ab12
+PUBLIC_ID_RE = re.compile(r'^[\w-]+(/[\w-]+)*$')
+
+
+@lru_cache(maxsize=None)
+def get_image_storage():
+    '''
+        Returns the storage images are uploaded to (settings.IMAGE_STORAGE)
+    '''
+    return import_string(settings.IMAGE_STORAGE)()
+
+
+def is_valid_public_id(public_id):
+    '''
+        Returns whether public_id is one images can be stored under,
+        rules out paths like ../x
+    '''
+    return bool(PUBLIC_ID_RE.match(public_id))
+
+
+def get_thumbnail_id(public_id, name):
+    return f'{public_id}_{name}'
+
+
+class ImageStorage:
+    '''
+        Base class of image storages
+
+        An image is stored with its thumbnails, under a public_id which
+        identifies all of them for deletion.
+    '''
+
+    def upload_many(self, items):
+        '''
+            Stores encoded images of (content, public_id) items
+
+            returns:
+                - urls of stored images, in order of items
+        '''
+        raise NotImplementedError
+
+    def delete(self, public_ids):
+        '''
+            Deletes stored images of given public_ids
+        '''
+        raise NotImplementedError
+
+    def save(self, renditions, folder):
+        '''
+            Stores an image and its thumbnails
+
+            args:
+                - renditions: output of images.process_image
+                - folder: folder to store them in
+
+            returns:
+                - dict of public_id, image_url and thumbnails (name -> url)
+        '''
+        public_id = f'{folder.strip("/")}/{uuid.uuid4().hex}'
+        public_ids = {
+            name: public_id if name == 'image' else get_thumbnail_id(
+                public_id, name)
+            for name in renditions
+        }
+
+        urls = dict(
+            zip(
+                public_ids,
+                self.upload_many([(renditions[name], public_ids[name])
+                                  for name in public_ids]),
+            ))
+
+        return {
+            'public_id': public_id,
+            'image_url': urls.pop('image'),
+            'thumbnails': urls,
+        }
+
+    def get_metrics(self):
+        '''
+            Returns count and timings of storage calls per operation,
+            for the current process
+        '''
+        return {}
+
+    def get_public_ids(self, public_id):
+        '''
+            Returns public_ids of an image and its thumbnails
+        '''
+        return [public_id] + [
+            get_thumbnail_id(public_id, name)
+            for name in settings.IMAGE_THUMBNAIL_SIZES
+        ]
+
+    def destroy(self, public_id):
+        '''
+            Deletes an image and its thumbnails
+        '''
+        self.delete(self.get_public_ids(public_id))
+
+
+class CloudinaryImageStorage(ImageStorage):
+    '''
+        Stores images on cloudinary, see api.cloudinary_client
+    '''
+
+    def __init__(self):
+        self.client = get_cloudinary_client()
+
+    def upload_many(self, items):
+        return self.client.upload_many(items)
+
+    def delete(self, public_ids):
+        logger.info(self.client.delete(public_ids))
+
+    def get_metrics(self):
+        return self.client.metrics.get()
+
+
+class FileSystemImageStorage(ImageStorage):
+    '''
+        Stores images under settings.MEDIA_ROOT, served at settings.MEDIA_URL
+
+        Note: urls are relative to the site, for running offline
+    '''
+
+    def __init__(self):
+        self.storage = FileSystemStorage()
+
+    def upload_many(self, items):
+        return [
+            self.storage.url(
+                self.storage.save(
+                    f'{public_id}.{get_extension()}',
+                    ContentFile(content),
+                )) for content, public_id in items
+        ]
+
+    def delete(self, public_ids):
+        #? formats may have changed since the image was stored
+        for public_id in public_ids:
+            for extension in IMAGE_EXTENSIONS.values():
+                self.storage.delete(f'{public_id}.{extension}')
+
+
+def schedule_destroy(public_id):
+    '''
+        Queues an image and its thumbnails for deletion
+
+        Deletions are batched by an image.delete Job, which runs
+        settings.IMAGE_DELETE_DELAY seconds later to gather more of them.
+
+        raises:
+            - ValueError, if public_id is not valid (see is_valid_public_id)
+    '''
+    if not is_valid_public_id(public_id):
+        raise ValueError(f'Invalid public_id {public_id!r}')
+
+    ImageDeletionModel.objects.create(public_id=public_id)
+    schedule_delete()
+
+
+def schedule_delete():
+    schedule(
+        'image.delete',
+        run_at=timezone.now() +
+        datetime.timedelta(seconds=settings.IMAGE_DELETE_DELAY),
+    )
+
+
+def delete_one(storage, deletion):
+    '''
+        Deletes the image of a single deletion, records the failure if
+        it fails
+
+        returns:
+            - whether the image was deleted
+    '''
+    try:
+        storage.destroy(deletion.public_id)
+        return True
+
+    except Exception as ex:
+        logger.error(f'image {deletion.public_id} not deleted: {ex}')
+
+        deletion.attempts += 1
+        deletion.error = str(ex)
+        if deletion.attempts >= settings.IMAGE_DELETE_MAX_ATTEMPTS:
+            deletion.status = 'failed'
+
+        deletion.save(update_fields=['attempts', 'error', 'status'])
+        return False
+
+
+def delete_scheduled(limit=1000):
+    '''
+        Deletes images queued for deletion, up to limit at a time
+
+        A batch is deleted in one call. When that fails, its images are
+        deleted one by one, so a bad one doesn't hold back the others.
+        An image failing settings.IMAGE_DELETE_MAX_ATTEMPTS times is
+        marked failed and left in place, others are tried again later.
+
+        returns:
+            - count of deleted images
+    '''
+    storage = get_image_storage()
+    deleted = 0
+    retry = False
+    last_id = 0
+
+    while True:
+        deletions = list(
+            ImageDeletionModel.objects.filter(
+                status='queued',
+                id__gt=last_id,
+            ).order_by('id')[:limit])
+        if not deletions:
+            break
+
+        last_id = deletions[-1].id
+
+        try:
+            storage.delete([
+                public_id for deletion in deletions
+                for public_id in storage.get_public_ids(deletion.public_id)
+            ])
+            done = deletions
+
+        except Exception as ex:
+            logger.error(f'images not deleted in a batch: {ex}')
+
+            done = [
+                deletion for deletion in deletions
+                if delete_one(storage, deletion)
+            ]
+            retry = retry or any(deletion.status == 'queued'
+                                 for deletion in deletions
+                                 if deletion not in done)
+
+        ImageDeletionModel.objects.filter(
+            id__in=[deletion.id for deletion in done]).delete()
+        deleted += len(done)
+
+    if retry:
+        schedule_delete()
+
+    return deleted
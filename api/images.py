@@ -0,0 +1,111 @@
+import io
+
+from PIL import Image, ImageOps
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+#? Pillow format -> file extension
+IMAGE_EXTENSIONS = {
+    'WEBP': 'webp',
+    'JPEG': 'jpg',
+}
+
+
+class ImageProcessingError(Exception):
+    pass
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    '''
+        Streams uploaded files to a temporary file on disk, skipping files
+        larger than settings.IMAGE_UPLOAD_MAX_SIZE as they arrive
+    '''
+
+    def new_file(self, *args, **kwargs):
+        self.received = 0
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.file.close()
+            raise SkipFile()
+
+        return super().receive_data_chunk(raw_data, start)
+
+
+def open_image(file):
+    '''
+        Opens an uploaded image with Pillow, rotated as its EXIF says
+
+        Note: decoding images larger than Image.MAX_IMAGE_PIXELS fails
+    '''
+    try:
+        image = Image.open(file)
+        image.load()
+    except (OSError, Image.DecompressionBombError) as ex:
+        raise ImageProcessingError(f'Invalid image: {ex}')
+
+    return ImageOps.exif_transpose(image)
+
+
+def encode_image(image, format=None, quality=None):
+    '''
+        Returns given image encoded in format (settings.IMAGE_FORMAT)
+    '''
+    format = format or settings.IMAGE_FORMAT
+
+    if format == 'JPEG' and image.mode != 'RGB':
+        #? JPEG has no transparency, flatten it on white
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+
+    buffer = io.BytesIO()
+    image.save(
+        buffer,
+        format=format,
+        quality=quality or settings.IMAGE_QUALITY,
+        optimize=format == 'JPEG',
+    )
+
+    return buffer.getvalue()
+
+
+def resize_image(image, size):
+    '''
+        Returns a copy of image fitting in a size x size box, never upscaled
+    '''
+    image = image.copy()
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+    return image
+
+
+def process_image(file):
+    '''
+        Downscales and re-encodes an uploaded image, and generates its
+        thumbnails
+
+        returns:
+            - dict of rendition name ('image' and names of
+              settings.IMAGE_THUMBNAIL_SIZES) to encoded bytes
+    '''
+    image = open_image(file)
+
+    renditions = {
+        'image': encode_image(resize_image(image,
+                                           settings.IMAGE_MAX_DIMENSION)),
+    }
+    for name, size in settings.IMAGE_THUMBNAIL_SIZES.items():
+        renditions[name] = encode_image(resize_image(image, size))
+
+    return renditions
+
+
+def get_extension(format=None):
+    return IMAGE_EXTENSIONS[format or settings.IMAGE_FORMAT]
@@ -1,3 +1,31 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+IMAGE_DELETION_STATUS_CHOICES = [
+    ('queued', 'Queued'),
+    ('failed', 'Failed'),
+]
+
+
+class ImageDeletionModel(models.Model):
+    '''Model definition for ImageDeletionModel, an image waiting to be deleted from the image storage.'''
+
+    public_id = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        choices=IMAGE_DELETION_STATUS_CHOICES,
+        default='queued',
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        '''Meta definition for ImageDeletionModel.'''
+
+        verbose_name = 'Image Deletion'
+        verbose_name_plural = 'Image Deletions'
+
+    def __str__(self):
+        '''Unicode representation of ImageDeletionModel.'''
+        return self.public_id
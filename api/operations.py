@@ -0,0 +1,85 @@
+from django.contrib.postgres import operations as postgres_operations
+from django.db.migrations.operations import AddConstraint, AddIndex
+
+
+class AddIndexConcurrently(postgres_operations.AddIndexConcurrently):
+    '''
+        AddIndexConcurrently that falls back to a plain AddIndex on
+        databases other than PostgreSQL (SQLite in tests)
+
+        Note: migration using it has to set `atomic = False`
+    '''
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return AddIndex.database_forwards(
+                self,
+                app_label,
+                schema_editor,
+                from_state,
+                to_state,
+            )
+
+        return super().database_forwards(
+            app_label,
+            schema_editor,
+            from_state,
+            to_state,
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return AddIndex.database_backwards(
+                self,
+                app_label,
+                schema_editor,
+                from_state,
+                to_state,
+            )
+
+        return super().database_backwards(
+            app_label,
+            schema_editor,
+            from_state,
+            to_state,
+        )
+
+
+class AddUniqueConstraintConcurrently(AddConstraint):
+    '''
+        AddConstraint of a UniqueConstraint that doesn't lock out writes
+        on PostgreSQL: its unique index is built concurrently, then
+        attached with ADD CONSTRAINT ... UNIQUE USING INDEX. Falls back
+        to a plain AddConstraint on other databases (SQLite in tests)
+
+        Note: migration using it has to set `atomic = False`
+    '''
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_forwards(
+                app_label,
+                schema_editor,
+                from_state,
+                to_state,
+            )
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        table = schema_editor.quote_name(model._meta.db_table)
+        name = schema_editor.quote_name(self.constraint.name)
+        columns = ', '.join(
+            schema_editor.quote_name(model._meta.get_field(field).column)
+            for field in self.constraint.fields)
+
+        #? a failed concurrent build leaves an invalid index behind
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY {name} ON {table} ({columns})')
+        schema_editor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} '
+                              f'UNIQUE USING INDEX {name}')
@@ -1,7 +1,103 @@
+import base64
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 
 
+class CountStrategyPaginator(Paginator):
+    '''
+        Django Paginator that avoids exact COUNT(*) on large result sets
+
+        Count strategy:
+            - small result sets (up to PAGINATION_EXACT_COUNT_LIMIT)
+              are counted exactly with a bounded count
+            - larger counts are cached for PAGINATION_COUNT_CACHE_TIMEOUT
+              seconds, keyed on the SQL of the query (filters and search)
+            - unfiltered large tables on PostgreSQL use the planner
+              estimate (pg_class.reltuples) instead of counting
+
+        attributes:
+            - exact: True if count is exact and fresh
+    '''
+    exact = True
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = settings.PAGINATION_EXACT_COUNT_LIMIT
+
+        #? bounded count stops after limit + 1 rows
+        bounded = queryset[:limit + 1].count()
+        if bounded <= limit:
+            return bounded
+
+        cache_key = self.get_cache_key()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            self.exact = False
+            return cached
+
+        count = self.get_estimate()
+        if count is not None and count > bounded:
+            self.exact = False
+        else:
+            count = queryset.count()
+
+        cache.set(
+            cache_key,
+            count,
+            settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+        )
+
+        return count
+
+    def get_cache_key(self):
+        '''
+            Returns cache key for the count of the query
+        '''
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+
+        return f'pagination-count:{self.object_list.db}:{digest}'
+
+    def get_estimate(self):
+        '''
+            Returns the PostgreSQL planner estimate of the row count,
+            None if not applicable (filtered query or other database)
+        '''
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        query = queryset.query
+
+        if connection.vendor != 'postgresql' or (query.where or query.distinct
+                                                 or query.values_select):
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+
+        #? -1 (or 0) until the table is vacuumed or analyzed
+        if not row or row[0] <= 0:
+            return None
+
+        return row[0]
+
+
 class StandardPagination(PageNumberPagination):
     '''
         Custom paginator based on PageNumberPagination
@@ -9,6 +105,16 @@ class StandardPagination(PageNumberPagination):
         parameters: 
             - page: page number
             - size: number of items per page (not used)
+            - cursor: switches to cursor (keyset) pagination,
+              empty for the first page then the next_cursor or
+              previous_cursor returned
+
+        Note: in cursor mode pages are read by seeking on the ordering
+        of the list (plus id as tiebreaker) instead of an OFFSET and no
+        counts are computed, so count, items and current are null
+
+        Note: large counts may be cached or estimated,
+        see CountStrategyPaginator, exact tells if items is exact
 
         returns:
             - paginated data
@@ -20,7 +126,8 @@ class StandardPagination(PageNumberPagination):
                     'items': 0,
                     'next': true,
                     'previous': true,
-                    'current': 0
+                    'current': 0,
+                    'exact': true
                 },
                 'results': [
                     ....
@@ -30,10 +137,173 @@ class StandardPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'size'
     max_page_size = 1000
+    cursor_query_param = 'cursor'
+    django_paginator_class = CountStrategyPaginator
 
     # page_size_query_param = 'size'
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        return self.paginate_queryset_by_cursor(queryset, request)
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        '''
+            Returns a page of the queryset seeking from the cursor passed
+        '''
+        page_size = self.get_page_size(request)
+        ordering = self.get_cursor_ordering(queryset)
+        cursor = self.decode_cursor(request, queryset, ordering)
+
+        reverse = False
+        if cursor:
+            values, reverse = cursor
+            queryset = queryset.filter(
+                self.get_cursor_filter(ordering, values, reverse))
+
+        if reverse:
+            queryset = queryset.order_by(*[
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering
+            ])
+        else:
+            queryset = queryset.order_by(*ordering)
+
+        #? one extra row tells if there are more rows past this page
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if rows and self.has_next:
+            self.next_cursor = self.encode_cursor(rows[-1], ordering, False)
+        if rows and self.has_previous:
+            self.previous_cursor = self.encode_cursor(rows[0], ordering, True)
+
+        return rows
+
+    def get_cursor_ordering(self, queryset):
+        '''
+            Returns ordering of the queryset with id as tiebreaker
+        '''
+        ordering = list(queryset.query.order_by
+                        or queryset.model._meta.ordering)
+
+        if not ordering:
+            ordering = ['-pk']
+
+        #? rows of values() querysets (aggregates) are unique by their ordering
+        if not queryset.query.values_select and not any(
+                field.lstrip('-') in ['pk', 'id'] for field in ordering):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+
+        return ordering
+
+    def get_cursor_filter(self, ordering, values, reverse):
+        '''
+            Returns condition matching rows after (or before) the cursor
+        '''
+        condition = Q()
+
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+
+            clause = Q(
+                **{f'{name}__{"lt" if descending else "gt"}': values[index]})
+            for previous, value in zip(ordering[:index], values[:index]):
+                clause &= Q(**{previous.lstrip('-'): value})
+
+            condition |= clause
+
+        return condition
+
+    def encode_cursor(self, row, ordering, reverse):
+        '''
+            Encodes the position of given row into a cursor
+        '''
+        #? serializable_value gives ids of foreign keys
+        values = [
+            row[field.lstrip('-')] if isinstance(row, dict) else
+            row.serializable_value(field.lstrip('-')) for field in ordering
+        ]
+        #? str keeps full precision of datetimes (microseconds)
+        payload = json.dumps([values, reverse], default=str)
+
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request, queryset, ordering):
+        '''
+            Decodes the cursor passed in request
+
+            returns:
+                - None for the first page, else (values, reverse)
+        '''
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            values, reverse = json.loads(base64.urlsafe_b64decode(encoded))
+            if len(values) != len(ordering):
+                raise ValueError
+
+            for index, field in enumerate(ordering):
+                name = field.lstrip('-')
+
+                try:
+                    model_field = queryset.model._meta.pk if name == 'pk' else (
+                        queryset.model._meta.get_field(name))
+                except FieldDoesNotExist:
+                    continue
+
+                values[index] = model_field.to_python(values[index])
+
+        except (TypeError, ValueError, ValidationError) as ex:
+            raise NotFound('Invalid cursor') from ex
+
+        return values, bool(reverse)
+
     def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return Response({
+                #? pagination object
+                'pagination': {
+                    #? counts are not computed in cursor mode
+                    'count': None,
+                    'items': None,
+                    'exact': None,
+
+                    #? return true if there is a next page
+                    'next': self.has_next,
+
+                    #? returns true if there is a previous page
+                    'previous': self.has_previous,
+
+                    #? no page numbers in cursor mode
+                    'current': None,
+
+                    #? cursors to pass to get next and previous pages
+                    'next_cursor': self.next_cursor,
+                    'previous_cursor': self.previous_cursor,
+                },
+
+                #? data
+                'results': data
+            })
+
         return Response({
             #? pagination object
             'pagination': {
@@ -43,6 +313,9 @@ class StandardPagination(PageNumberPagination):
                 #? return counts of all items
                 'items': self.page.paginator.count,
 
+                #? return true if items is an exact count
+                'exact': self.page.paginator.exact,
+
                 #? return true if there is a next page
                 'next': self.page.has_next(),
 
@@ -75,6 +348,12 @@ class StandardPagination(PageNumberPagination):
                             'type': 'integer',
                             'description': 'Total number of Items',
                         },
+                        'exact': {
+                            'type':
+                            'boolean',
+                            'description':
+                            'True if items is exact, False if cached or estimated'
+                        },
                         'next': {
                             'type': 'boolean',
                             'description': 'True if there is a next page'
@@ -87,8 +366,39 @@ class StandardPagination(PageNumberPagination):
                             'type': 'integer',
                             'description': 'Current page number'
                         },
+                        'next_cursor': {
+                            'type':
+                            'string',
+                            'nullable':
+                            True,
+                            'description':
+                            'Cursor of the next page (cursor mode only)'
+                        },
+                        'previous_cursor': {
+                            'type':
+                            'string',
+                            'nullable':
+                            True,
+                            'description':
+                            'Cursor of the previous page (cursor mode only)'
+                        },
                     },
                 },
                 'results': schema
             }
         }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description':
+            'Cursor for keyset pagination, empty for the first page',
+            'schema': {
+                'type': 'string',
+            },
+        })
+
+        return parameters
@@ -0,0 +1,210 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+from rest_framework import permissions, serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+from api.fieldsets import SparseFieldsetMixin, get_sparse_fieldset
+
+
+def _walk_relations(model, source_attrs):
+    '''
+        Walks the source of a serializer field over the model relations
+
+        returns:
+            - list of (attr, model field) for every relation crossed.
+              Walk stops at the first non relational attribute (property,
+              method etc) or right after a multi valued relation
+    '''
+    relations = []
+
+    for attr in source_attrs:
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+
+        if not model_field.is_relation:
+            break
+
+        relations.append((attr, model_field))
+
+        #? nothing can be joined past a many relation, it has to be prefetched
+        if model_field.many_to_many or model_field.one_to_many:
+            break
+
+        model = model_field.related_model
+
+    return relations
+
+
+def _prefixed(prefix, lookup):
+    '''
+        Prefixes a select_related path or a Prefetch object with given prefix
+    '''
+    if not prefix:
+        return lookup
+
+    if isinstance(lookup, Prefetch):
+        return Prefetch(
+            f'{prefix}__{lookup.prefetch_through}',
+            queryset=lookup.queryset,
+            to_attr=lookup.to_attr,
+        )
+
+    return f'{prefix}__{lookup}'
+
+
+def _build_plan(serializer, model):
+    '''
+        Derives the select_related paths and prefetch_related lookups needed
+        to serialize instances of given model with given serializer
+
+        returns:
+            - (select_related paths, prefetch_related lookups)
+    '''
+    select = []
+    prefetch = []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        relations = _walk_relations(model, field.source_attrs)
+        if not relations:
+            continue
+
+        #? nested serializer (if any) used to display the related objects
+        nested = None
+        if isinstance(field, serializers.ListSerializer):
+            nested = field.child
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = field
+
+        #? forward pk fields are read from `<field>_id`, no join needed
+        if isinstance(field, RelatedField) and len(relations) == 1 and (
+                relations[0][1].concrete):
+            continue
+
+        attrs = [attr for attr, _ in relations]
+        last_field = relations[-1][1]
+        related_model = last_field.related_model
+
+        nested_select, nested_prefetch = [], []
+        if isinstance(nested, serializers.ModelSerializer):
+            nested_select, nested_prefetch = _build_plan(nested, related_model)
+
+        if last_field.many_to_many or last_field.one_to_many:
+            #? join up to the many relation, prefetch the relation itself
+            if len(attrs) > 1:
+                select.append('__'.join(attrs[:-1]))
+
+            if isinstance(nested, serializers.ModelSerializer) or isinstance(
+                    field, ManyRelatedField):
+                queryset = related_model._default_manager.all()
+                if nested_select:
+                    queryset = queryset.select_related(*nested_select)
+                if nested_prefetch:
+                    queryset = queryset.prefetch_related(*nested_prefetch)
+
+                prefetch.append(Prefetch('__'.join(attrs), queryset=queryset))
+
+            continue
+
+        path = '__'.join(attrs)
+        select.append(path)
+        select.extend(_prefixed(path, lookup) for lookup in nested_select)
+        prefetch.extend(_prefixed(path, lookup) for lookup in nested_prefetch)
+
+    return select, prefetch
+
+
+@lru_cache(maxsize=256)
+def get_query_plan(serializer_class, only=None, expand=None, include=None):
+    '''
+        Returns the query plan for given ModelSerializer class,
+        pruned to given sparse fieldset (see api.fieldsets)
+
+        returns:
+            - (select_related paths, prefetch_related lookups)
+    '''
+    context = {}
+    if issubclass(serializer_class, SparseFieldsetMixin):
+        context['sparse_fieldset'] = (only, expand, include)
+
+    serializer = serializer_class(context=context)
+
+    select, prefetch = _build_plan(serializer, serializer.Meta.model)
+
+    #? drop paths already covered by a longer path
+    select = [
+        path for path in dict.fromkeys(select)
+        if not any(other.startswith(f'{path}__') for other in select)
+    ]
+
+    #? keep only first Prefetch for a lookup
+    unique_prefetch = {}
+    for lookup in prefetch:
+        unique_prefetch.setdefault(lookup.prefetch_to, lookup)
+
+    return tuple(select), tuple(unique_prefetch.values())
+
+
+def plan_queryset(queryset,
+                  serializer_class,
+                  only=None,
+                  expand=None,
+                  include=None):
+    '''
+        Applies the query plan of given serializer class on the queryset
+
+        Ensures serializing the queryset runs a constant number of queries
+        regardless of the number of objects
+    '''
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return queryset
+
+    select, prefetch = get_query_plan(serializer_class, only, expand, include)
+
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    return queryset
+
+
+class QueryPlanMixin:
+    '''
+        Mixin for Generic Views to plan the queryset joins and prefetches
+        from the serializer used to display data.
+
+        attributes:
+            - plan_serializer_class: serializer used to display data
+              (defaults to serializer_class)
+
+        Queryset is pruned to the sparse fieldset asked by the request
+        when the serializer uses SparseFieldsetMixin
+
+        Note: queryset is planned only for read (safe) requests
+    '''
+    plan_serializer_class = None
+
+    def get_plan_serializer_class(self):
+        return self.plan_serializer_class or self.get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+
+        serializer_class = self.get_plan_serializer_class()
+
+        fieldset = None, None, None
+        if issubclass(serializer_class, SparseFieldsetMixin):
+            fieldset = get_sparse_fieldset(self.request)
+
+        return plan_queryset(queryset, serializer_class, *fieldset)
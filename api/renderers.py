@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from rest_framework import renderers
+
+
+class Echo:
+    '''
+        File like object handing back what is written to it,
+        lets csv.writer produce lines for a streamed response
+    '''
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows):
+    '''
+        Yields CSV lines of given header and rows
+    '''
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(header, rows):
+    '''
+        Yields one JSON object per row, keyed by given header
+    '''
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    '''
+        Renders a CSV export
+
+        Note: exports are streamed by the view, renderer is used for
+        content negotiation (`?format=csv`) and error responses
+    '''
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if not isinstance(data, dict):
+            data = {'detail': data}
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    '''
+        Renders a newline delimited JSON export
+
+        Note: exports are streamed by the view, renderer is used for
+        content negotiation (`?format=ndjson`) and error responses
+    '''
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return (json.dumps(data, cls=DjangoJSONEncoder) + '\n').encode(
+            self.charset)
@@ -0,0 +1,202 @@
+import hashlib
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from rest_framework.response import Response
+
+from user.roles import get_role_scope
+
+#? models whose changes invalidate cached responses of a scope,
+#? i.e. every model displayed by the scope's serializer
+RESPONSE_CACHE_SCOPES = {
+    'university': [
+        'university.UniversityModel',
+        'college.CollegeModel',
+        'user.User',
+    ],
+    'course': [
+        'course.CourseModel',
+        'university.UniversityModel',
+    ],
+    'department-type': [
+        'department.DepartmentTypeModel',
+    ],
+    'college': [
+        'college.CollegeModel',
+        'university.UniversityModel',
+        'user.User',
+    ],
+}
+
+#? saves touching only these fields never invalidate (e.g. login)
+RESPONSE_CACHE_IGNORED_FIELDS = {'last_login', 'password'}
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _incr(cache, key):
+    '''
+        Increments counter at given key, creating it if missing
+    '''
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_scope_version(scope):
+    '''
+        Returns current version of given scope, part of every cache key
+
+        Note: version is random so that an evicted version never
+        brings back responses cached before an invalidation
+    '''
+    cache = get_response_cache()
+    key = f'response-cache:{scope}:version'
+
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+
+    return version
+
+
+def invalidate_scope(scope):
+    '''
+        Invalidates all cached responses of given scope
+    '''
+    get_response_cache().set(
+        f'response-cache:{scope}:version',
+        uuid.uuid4().hex,
+        None,
+    )
+
+
+def get_cache_stats(scope):
+    '''
+        Returns hit and miss counters of given scope
+    '''
+    cache = get_response_cache()
+
+    return {
+        'hit': cache.get(f'response-cache:{scope}:hit', 0),
+        'miss': cache.get(f'response-cache:{scope}:miss', 0),
+    }
+
+
+def get_cache_key(scope, request):
+    '''
+        Returns cache key of given request
+
+        Key is made of scope version, user role, path and query string
+    '''
+    path = hashlib.md5(
+        request.get_full_path().encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+    return ':'.join([
+        'response-cache',
+        scope,
+        get_scope_version(scope),
+        get_role_scope(request).role,
+        path,
+    ])
+
+
+def _get_receiver(scopes):
+    '''
+        Returns signal receiver invalidating given scopes
+    '''
+
+    def receiver(update_fields=None, action=None, **kwargs):
+        if update_fields and set(update_fields) <= (
+                RESPONSE_CACHE_IGNORED_FIELDS):
+            return
+
+        #? m2m_changed is sent before and after the change
+        if action and not action.startswith('post_'):
+            return
+
+        #? again on commit, a response cached meanwhile may hold old data
+        for scope in scopes:
+            invalidate_scope(scope)
+            transaction.on_commit(lambda scope=scope: invalidate_scope(scope))
+
+    return receiver
+
+
+def connect_signals():
+    '''
+        Connects invalidation of scopes to changes of their models,
+        including their many to many relations
+
+        Called once from ApiConfig.ready
+    '''
+    model_scopes = {}
+    for scope, labels in RESPONSE_CACHE_SCOPES.items():
+        for label in labels:
+            model_scopes.setdefault(apps.get_model(label), []).append(scope)
+
+    for model, scopes in model_scopes.items():
+        receiver = _get_receiver(scopes)
+        uid = f'response-cache:{model._meta.label}'
+
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver,
+                            sender=model,
+                            weak=False,
+                            dispatch_uid=uid)
+
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(
+                receiver,
+                sender=field.remote_field.through,
+                weak=False,
+                dispatch_uid=f'{uid}.{field.name}',
+            )
+
+
+class ResponseCacheMixin:
+    '''
+        Mixin for List Views to cache the GET responses
+
+        attributes:
+            - cache_scope: scope of RESPONSE_CACHE_SCOPES the view displays
+
+        Responses are cached per path, query string and user role for
+        RESPONSE_CACHE_TIMEOUT seconds and are invalidated on any change
+        to the models of the scope. Hits and misses are counted per scope
+        and reported in `X-Cache` header.
+
+        Note: permissions are checked before the cache is looked up
+    '''
+    cache_scope = None
+
+    def get(self, request, *args, **kwargs):
+        cache = get_response_cache()
+        key = get_cache_key(self.cache_scope, request)
+
+        data = cache.get(key)
+        if data is not None:
+            _incr(cache, f'response-cache:{self.cache_scope}:hit')
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        _incr(cache, f'response-cache:{self.cache_scope}:miss')
+        response = super().get(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+
+        response['X-Cache'] = 'MISS'
+
+        return response
@@ -4,3 +4,9 @@ from rest_framework import serializers
 class ImageUploadResposeSerializer(serializers.Serializer):
     image_url = serializers.URLField()
     public_id = serializers.CharField()
+    thumbnails = serializers.DictField(child=serializers.URLField())
+
+
+class ImageStorageMetricsResponseSerializer(serializers.Serializer):
+    storage = serializers.CharField()
+    operations = serializers.DictField(child=serializers.DictField())
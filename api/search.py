@@ -0,0 +1,162 @@
+import operator
+from functools import reduce
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.migrations.operations.base import Operation
+from django.db.models import CharField, Q, TextField
+from django.db.models.functions import Greatest
+from django.db.models.lookups import PatternLookup
+
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+
+class TrigramContains(PatternLookup):
+    '''
+        Case insensitive containment as a plain `ILIKE '%term%'`
+
+        Unlike icontains (`UPPER(col::text) LIKE UPPER(...)`) this is
+        served by a `gin_trgm_ops` index on the bare column
+
+        Note: PostgreSQL only
+    '''
+    lookup_name = 'trigram_contains'
+
+    def get_rhs_op(self, connection, rhs):
+        return f'ILIKE {rhs}'
+
+
+CharField.register_lookup(TrigramContains)
+TextField.register_lookup(TrigramContains)
+
+
+class TrigramSearchFilter(SearchFilter):
+    '''
+        Search backend using pg_trgm indexed containment on PostgreSQL
+
+        Keeps `search=` semantics of SearchFilter: every term has to be
+        contained (case insensitive) in any of the view's search_fields.
+
+        On PostgreSQL matches are ranked by trigram word similarity
+        unless client asked for an explicit ordering.
+        On other databases (SQLite in tests) falls back to icontains
+        without ranking.
+
+        search_fields: plain field paths, no SearchFilter prefixes
+    '''
+    rank_field = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        trigram = connections[queryset.db].vendor == 'postgresql'
+        lookup = 'trigram_contains' if trigram else 'icontains'
+
+        conditions = [
+            reduce(
+                operator.or_,
+                [Q(**{f'{field}__{lookup}': term}) for field in search_fields])
+            for term in search_terms
+        ]
+        queryset = queryset.filter(reduce(operator.and_, conditions))
+
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = queryset.distinct()
+
+        if not trigram or request.query_params.get(
+                api_settings.ORDERING_PARAM):
+            return queryset
+
+        return self.rank_queryset(queryset, search_fields, search_terms)
+
+    def rank_queryset(self, queryset, search_fields, search_terms):
+        '''
+            Orders matches by best trigram word similarity, existing
+            ordering is kept as tie break
+        '''
+        search = ' '.join(search_terms)
+        ranks = [
+            TrigramWordSimilarity(search, field) for field in search_fields
+        ]
+        rank = Greatest(*ranks) if len(ranks) > 1 else ranks[0]
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+
+        return queryset.annotate(**{
+            self.rank_field: rank
+        }).order_by(f'-{self.rank_field}', *ordering)
+
+
+class AddTrigramIndex(Operation):
+    '''
+        Migration operation creating a `gin_trgm_ops` GIN index on a column
+
+        Index lives only in the database, not in model state, so that
+        other databases (SQLite in tests) never try to build it.
+        Creates pg_trgm extension if missing, no-op on other databases.
+    '''
+    reversible = True
+
+    def __init__(self, model_name, field, name):
+        self.model_name = model_name
+        self.field = field
+        self.name = name
+
+    def deconstruct(self):
+        return (
+            self.__class__.__name__,
+            [],
+            {
+                'model_name': self.model_name,
+                'field': self.field,
+                'name': self.name,
+            },
+        )
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def get_index(self):
+        return GinIndex(
+            fields=[self.field],
+            name=self.name,
+            opclasses=['gin_trgm_ops'],
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(self.get_index().create_sql(
+            model, schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        schema_editor.execute(self.get_index().remove_sql(
+            model, schema_editor))
+
+    def describe(self):
+        return f'Create trigram index {self.name} on {self.model_name}.{self.field}'
+
+    @property
+    def migration_name_fragment(self):
+        return self.name.lower()
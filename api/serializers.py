@@ -1,7 +1,8 @@
 from rest_framework import serializers
 
-#? max size 3 mb
-MAX_UPLOAD_SIZE = 3145728
+from django.conf import settings
+
+from .image_storage import is_valid_public_id
 
 
 class ImageUploadSerializer(serializers.Serializer):
@@ -27,15 +28,17 @@ class ImageUploadSerializer(serializers.Serializer):
         if value.content_type not in [
                 'image/jpeg',
                 'image/png',
+                'image/webp',
                 'image/x-icon',
         ]:
             raise serializers.ValidationError(
-                'Image must be a JPEG or PNG or ICO.')
+                'Image must be a JPEG or PNG or WEBP or ICO.')
 
         #? check image size
-        if value.size > MAX_UPLOAD_SIZE:
+        if value.size > settings.IMAGE_UPLOAD_MAX_SIZE:
             raise serializers.ValidationError(
-                'Image size must be less than 3 MB.')
+                'Image size must be less than '
+                f'{settings.IMAGE_UPLOAD_MAX_SIZE // 1048576} MB.')
 
         return value
 
@@ -44,10 +47,15 @@ class ImageUploadSerializer(serializers.Serializer):
             Validations for folder
             
             Validates if folder is empty
+            Validates if folder is a valid path (no ../ and such)
         '''
         if not value:
             raise serializers.ValidationError('No folder provided.')
 
+        if not is_valid_public_id(value.strip('/')):
+            raise serializers.ValidationError(
+                'folder may only hold letters, digits, _, - and /.')
+
         return value
 
     def validate_public_id(self, value):
@@ -55,8 +63,13 @@ class ImageUploadSerializer(serializers.Serializer):
             Validations for public_id
             
             Validates if public_id is string if not blank
+            Validates if public_id is a valid path (no ../ and such)
         '''
         if value and not isinstance(value, str):
             raise serializers.ValidationError('public_id must be a string.')
 
+        if value and not is_valid_public_id(value):
+            raise serializers.ValidationError(
+                'public_id may only hold letters, digits, _, - and /.')
+
         return value
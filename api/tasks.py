@@ -0,0 +1,11 @@
+from jobs.queue import task
+
+from .image_storage import delete_scheduled
+
+
+@task('image.delete', max_attempts=5)
+def delete_images():
+    '''
+        Deletes images queued for deletion, see image_storage.schedule_destroy
+    '''
+    return {'deleted': delete_scheduled()}
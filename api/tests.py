@@ -1,3 +1,950 @@
-from django.test import TestCase
+import io
+import json
+import re
+import shutil
+import tempfile
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from PIL import Image
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.cloudinary_client import get_cloudinary_client
+from api.image_storage import delete_scheduled, get_image_storage
+from api.images import encode_image
+from api.models import ImageDeletionModel
+from api.query_planner import get_query_plan
+from api.response_cache import get_cache_stats, get_response_cache
+from attendance.models import AttendanceModel
+from attendance.serializers import AttendanceFullSerializer
+from classes.models import ClassModel
+from college.models import CollegeModel
+from student.models import StudentModel
+from jobs.models import JobModel
+from jobs.queue import run_pending
+from university.models import UniversityModel
+
+User = get_user_model()
+
+
+class TestQueryPlanner(APITestCase):
+    '''
+        Test Case to test planning of querysets from Serializers
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.university = UniversityModel.objects.create(
+            name='Test University',
+            alias='TU',
+        )
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            university=self.university,
+            principal=self.admin,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            college=self.college,
+            teacher=self.admin,
+        )
+
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def add_attendance(self, count):
+        '''
+            Adds given number of Students to the Class with an Attendance each
+        '''
+        offset = StudentModel.objects.count()
+
+        for iter in range(offset, offset + count):
+            student = StudentModel.objects.create(
+                first_name=f'Test{iter}',
+                last_name='Student',
+                college=self.college,
+            )
+            self.for_class.student.add(student)
+            AttendanceModel.objects.create(
+                student=student,
+                for_class=self.for_class,
+                is_present=True,
+                is_absent=False,
+            )
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(
+                reverse('attendance-list-create'),
+                {'size': 1000},
+            )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return len(queries)
+
+    def test_AttendanceFullSerializer_plan(self):
+        '''
+            Test plan derived from nested Attendance Serializer
+        '''
+        select, prefetch = get_query_plan(AttendanceFullSerializer)
+
+        self.assertIn('student__college__university', select)
+        self.assertIn('for_class__college__principal', select)
+        self.assertIn('for_class__department__name', select)
+        self.assertIn(
+            'for_class__student',
+            [lookup.prefetch_to for lookup in prefetch],
+        )
+
+    def test_AttendanceListing_constant_queries(self):
+        '''
+            Test listing Attendances runs same queries regardless of size
+        '''
+        self.add_attendance(2)
+        small_page = self.count_list_queries()
+
+        self.add_attendance(8)
+        large_page = self.count_list_queries()
+
+        self.assertEqual(small_page, large_page)
+
+
+class TestCursorPagination(APITestCase):
+    '''
+        Test Case to test cursor mode of StandardPagination
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        for iter in range(6):
+            User.objects.create(
+                email=f'user{iter}@mail.com',
+                first_name=f'Test{iter}',
+                last_name='User',
+                gender='Male',
+            )
+
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def get_page(self, cursor=''):
+        resp = self.client.get(
+            reverse('user-list-create'),
+            {
+                'cursor': cursor,
+                'size': 3
+            },
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return resp.data
+
+    def test_cursor_pages(self):
+        '''
+            Test walking forward and back through cursor pages
+        '''
+        first = self.get_page()
+        second = self.get_page(first['pagination']['next_cursor'])
+        third = self.get_page(second['pagination']['next_cursor'])
+
+        ids = [
+            item['id'] for page in [first, second, third]
+            for item in page['results']
+        ]
+        expected = list(
+            User.objects.order_by('-date_added', '-pk').values_list(
+                'id',
+                flat=True,
+            ))
+
+        self.assertEqual(ids, expected)
+        self.assertIsNone(first['pagination']['items'])
+        self.assertFalse(first['pagination']['previous'])
+        self.assertFalse(third['pagination']['next'])
+
+        back = self.get_page(third['pagination']['previous_cursor'])
+
+        self.assertEqual(back['results'], second['results'])
+
+    def test_invalid_cursor(self):
+        '''
+            Test passing an invalid cursor
+        '''
+        resp = self.client.get(reverse('user-list-create'), {'cursor': 'x'})
+
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestPaginationCount(APITestCase):
+    '''
+        Test Case to test count strategy of StandardPagination
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        for iter in range(4):
+            User.objects.create(
+                email=f'user{iter}@mail.com',
+                first_name=f'Test{iter}',
+                last_name='User',
+                gender='Male',
+            )
+
+        cache.clear()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        cache.clear()
+        self.client.force_authenticate(user=None)
+
+    def get_pagination(self):
+        resp = self.client.get(reverse('user-list-create'))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return resp.data['pagination']
+
+    def test_small_count_exact(self):
+        '''
+            Test small result sets are counted exactly
+        '''
+        pagination = self.get_pagination()
+
+        self.assertEqual(pagination['items'], User.objects.count())
+        self.assertTrue(pagination['exact'])
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=2)
+    def test_large_count_cached(self):
+        '''
+            Test large counts are cached and flagged as not exact
+        '''
+        first = self.get_pagination()
+
+        User.objects.create(
+            email='late@mail.com',
+            first_name='Late',
+            last_name='User',
+            gender='Male',
+        )
+        second = self.get_pagination()
+
+        self.assertTrue(first['exact'])
+        self.assertFalse(second['exact'])
+        self.assertEqual(second['items'], first['items'])
+
+
+class TestTrigramSearch(APITestCase):
+    '''
+        Test Case to test search backend
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        for name in [
+                'Jammu University',
+                'Kashmir University',
+                'Central University of Jammu',
+        ]:
+            UniversityModel.objects.create(name=name, alias='U')
+
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def search(self, term):
+        resp = self.client.get(
+            reverse('university-list-create'),
+            {'search': term},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return sorted(item['name'] for item in resp.data['results'])
+
+    def test_search_terms(self):
+        '''
+            Test every term has to be contained, case insensitive
+        '''
+        self.assertEqual(
+            self.search('jammu'),
+            ['Central University of Jammu', 'Jammu University'],
+        )
+        self.assertEqual(
+            self.search('JAMMU central'),
+            ['Central University of Jammu'],
+        )
+        self.assertEqual(self.search('delhi'), [])
+
+
+class TestSparseFieldsets(APITestCase):
+    '''
+        Test Case to test sparse fieldsets of list endpoints
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.university = UniversityModel.objects.create(
+            name='Test University',
+            alias='TU',
+        )
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            university=self.university,
+            principal=self.admin,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            college=self.college,
+            teacher=self.admin,
+        )
+        self.student = StudentModel.objects.create(
+            first_name='Test',
+            last_name='Student',
+            college=self.college,
+        )
+        self.for_class.student.add(self.student)
+
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def get_class_list(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse('Class-list-create'), params)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return resp.data['results'][0], len(queries)
+
+    def test_fields(self):
+        '''
+            Test only asked fields are displayed and joined
+        '''
+        full, full_queries = self.get_class_list({})
+        item, queries = self.get_class_list({'fields': 'id,name,code'})
+
+        self.assertEqual(set(item), {'id', 'name', 'code'})
+        self.assertEqual(item['code'], full['code'])
+        self.assertLess(queries, full_queries)
+
+    def test_nested_fields(self):
+        '''
+            Test dotted fields prune nested objects
+        '''
+        item, _ = self.get_class_list({'fields': 'id,college.name'})
+
+        self.assertEqual(item['college'], {'name': 'Test College'})
+
+    def test_expand(self):
+        '''
+            Test nested objects not expanded are displayed as primary keys
+        '''
+        item, _ = self.get_class_list({
+            'fields': 'id,student,teacher,college',
+            'expand': 'college',
+        })
+
+        self.assertEqual(item['student'], [self.student.id])
+        self.assertEqual(item['teacher'], self.admin.id)
+        self.assertEqual(item['college']['name'], 'Test College')
+        self.assertEqual(item['college']['principal'], self.admin.id)
+
+
+class TestResponseCache(APITestCase):
+    '''
+        Test Case to test response cache of read heavy views
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.university = UniversityModel.objects.create(
+            name='Test University',
+            alias='TU',
+        )
+
+        get_response_cache().clear()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        get_response_cache().clear()
+        self.client.force_authenticate(user=None)
+
+    def get_list(self):
+        resp = self.client.get(reverse('university-list-create'))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return resp
+
+    def test_hit(self):
+        '''
+            Test repeated request is served from cache
+        '''
+        first = self.get_list()
+        second = self.get_list()
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(get_cache_stats('university'), {'hit': 1, 'miss': 1})
+
+    def test_invalidation(self):
+        '''
+            Test changes to displayed models invalidate cached responses
+        '''
+        self.get_list()
+        CollegeModel.objects.create(
+            name='Test College',
+            university=self.university,
+            principal=self.admin,
+        )
+        resp = self.get_list()
+
+        self.assertEqual(resp['X-Cache'], 'MISS')
+        self.assertEqual(
+            resp.data['results'][0]['college_affiliated_count'],
+            1,
+        )
+
+    def test_ignored_fields(self):
+        '''
+            Test saving only ignored fields keeps cached responses
+        '''
+        self.get_list()
+        self.admin.save(update_fields=['last_login'])
+
+        self.assertEqual(self.get_list()['X-Cache'], 'HIT')
+
+
+@override_settings(
+    IMAGE_STORAGE='api.image_storage.FileSystemImageStorage',
+    IMAGE_FORMAT='WEBP',
+    IMAGE_DELETE_DELAY=0,
+)
+class TestImageUpload(APITestCase):
+    '''
+        Test Case to test image upload pipeline
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.user = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.media_root = tempfile.mkdtemp()
+        self.media = self.settings(MEDIA_ROOT=self.media_root)
+        self.media.enable()
+
+        get_image_storage.cache_clear()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+        get_image_storage.cache_clear()
+
+        self.media.disable()
+        shutil.rmtree(self.media_root)
+
+    def get_image(self, size=(2000, 1000), mode='RGBA'):
+        buffer = io.BytesIO()
+        Image.new(mode, size, (255, 0, 0, 128)[:len(mode)]).save(buffer,
+                                                                 format='PNG')
+
+        return SimpleUploadedFile(
+            'image.png',
+            buffer.getvalue(),
+            content_type='image/png',
+        )
+
+    def upload(self, image, public_id=''):
+        return self.client.post(
+            reverse('image-upload'),
+            {
+                'image': image,
+                'folder': 'profile',
+                'public_id': public_id,
+            },
+            format='multipart',
+        )
+
+    def open_stored(self, url):
+        path = url.split('/media/', 1)[1]
+        return Image.open(Path(self.media_root) / path)
+
+    def test_ImageUpload(self):
+        '''
+            Test images are downscaled, re-encoded and thumbnailed
+        '''
+        resp = self.upload(self.get_image())
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(resp.data['public_id'].startswith('profile/'))
+
+        image = self.open_stored(resp.data['image_url'])
+        self.assertEqual(image.format, 'WEBP')
+        self.assertEqual(image.size, (1600, 800))
+
+        self.assertEqual(set(resp.data['thumbnails']), {'thumbnail', 'small'})
+        thumbnail = self.open_stored(resp.data['thumbnails']['thumbnail'])
+        self.assertEqual(thumbnail.size, (150, 75))
+
+    def test_ImageUpload_timing(self):
+        '''
+            Test timings of processing and storing are returned
+        '''
+        resp = self.upload(self.get_image())
+
+        self.assertRegex(
+            resp['Server-Timing'],
+            r'^process;dur=[\d.]+, storage;dur=[\d.]+$',
+        )
+
+    def test_ImageUpload_replace(self):
+        '''
+            Test replaced image and its thumbnails are deleted by a Job
+        '''
+        old = self.upload(self.get_image()).data
+        resp = self.upload(self.get_image(), public_id=old['public_id'])
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.open_stored(old['image_url'])
+
+        run_pending()
+
+        for url in [old['image_url'], *old['thumbnails'].values()]:
+            with self.assertRaises(FileNotFoundError):
+                self.open_stored(url)
+
+        self.open_stored(resp.data['image_url'])
+
+    def test_ImageUpload_invalid_public_id(self):
+        '''
+            Test public_ids and folders escaping the storage are rejected
+        '''
+        resp = self.upload(self.get_image(), public_id='../x')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('public_id', resp.data)
+
+        resp = self.client.post(
+            reverse('image-upload'),
+            {
+                'image': self.get_image(),
+                'folder': '../profile',
+                'public_id': '',
+            },
+            format='multipart',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('folder', resp.data)
+
+        self.assertFalse(ImageDeletionModel.objects.exists())
+
+    def test_ImageDelete_failing(self):
+        '''
+            Test an image failing to delete doesn't hold back the others
+        '''
+        old = self.upload(self.get_image()).data
+        #? stored by an earlier release, raises SuspiciousFileOperation
+        bad = ImageDeletionModel.objects.create(public_id='../x')
+        ImageDeletionModel.objects.create(public_id=old['public_id'])
+
+        with self.settings(IMAGE_DELETE_MAX_ATTEMPTS=2):
+            self.assertEqual(delete_scheduled(), 1)
+
+            with self.assertRaises(FileNotFoundError):
+                self.open_stored(old['image_url'])
+
+            bad.refresh_from_db()
+            self.assertEqual(bad.status, 'queued')
+            self.assertEqual(bad.attempts, 1)
+            self.assertTrue(
+                JobModel.objects.filter(name='image.delete').exists())
+
+            self.assertEqual(delete_scheduled(), 0)
+
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, 'failed')
+        self.assertEqual(bad.attempts, 2)
+        self.assertEqual(delete_scheduled(), 0)
+
+    def test_ImageUpload_invalid(self):
+        '''
+            Test oversized and corrupt uploads are rejected
+        '''
+        with self.settings(IMAGE_UPLOAD_MAX_SIZE=1024):
+            resp = self.upload(self.get_image())
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        resp = self.upload(
+            SimpleUploadedFile(
+                'image.png',
+                b'not an image',
+                content_type='image/png',
+            ))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_encode_image_jpeg(self):
+        '''
+            Test transparent images are flattened when encoded to JPEG
+        '''
+        image = Image.new('RGBA', (10, 10), (0, 0, 0, 0))
+        encoded = Image.open(io.BytesIO(encode_image(image, format='JPEG')))
+
+        self.assertEqual(encoded.format, 'JPEG')
+        self.assertEqual(encoded.getpixel((0, 0)), (255, 255, 255))
+
+
+#? /v1_1/<cloud name>/image/upload, /v1_1/<cloud name>/resources/image/upload
+UPLOAD_RE = re.compile(r'^/v1_1/(?P<cloud>[^/]+)/image/upload$')
+RESOURCES_RE = re.compile(r'^/v1_1/(?P<cloud>[^/]+)/resources/image/upload$')
+
+
+def parse_form(content_type, body):
+    '''
+        Returns fields of a multipart/form-data body, files as bytes
+    '''
+    message = BytesParser().parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode() + body)
+
+    return {
+        part.get_param('name', header='content-disposition'):
+        part.get_payload(decode=True)
+        for part in message.get_payload()
+    }
+
+
+class FakeCloudinaryHandler(BaseHTTPRequestHandler):
+    #? keep connections alive, like cloudinary does
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, data):
+        body = json.dumps(data).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def record(self):
+        self.server.fake.record(self.command, self.path, self.client_address)
+
+    def do_POST(self):
+        self.record()
+        match = UPLOAD_RE.match(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        if not match:
+            return self.respond(404, {'error': {'message': 'Not found'}})
+
+        form = parse_form(self.headers['Content-Type'], body)
+        public_id = form.get('public_id', b'').decode()
+        self.server.fake.resources[public_id] = form.get('file')
+
+        url = f'{self.server.fake.url}/{match["cloud"]}/image/upload/{public_id}'
+        self.respond(
+            200, {
+                'public_id': public_id,
+                'secure_url': url,
+                'url': url,
+                'api_key': 'fake',
+            })
+
+    def do_DELETE(self):
+        self.record()
+        url = urlparse(self.path)
+
+        if not RESOURCES_RE.match(url.path):
+            return self.respond(404, {'error': {'message': 'Not found'}})
+
+        #? public ids are sent as public_ids[]=...&public_ids[]=...
+        public_ids = parse_qs(url.query).get('public_ids[]', [])
+
+        deleted = {}
+        for public_id in public_ids:
+            found = self.server.fake.resources.pop(public_id, None)
+            deleted[public_id] = 'not_found' if found is None else 'deleted'
+
+        self.respond(200, {'deleted': deleted})
+
+
+class FakeCloudinaryServer:
+    '''
+        Local HTTP server answering the cloudinary upload and delete
+        calls, stands in for cloudinary in tests
+
+        usage:
+            with FakeCloudinaryServer() as fake:
+                settings.CLOUDINARY_UPLOAD_PREFIX = fake.url
+                ...
+                fake.resources  #? public_id -> uploaded bytes
+                fake.requests  #? (method, path) of requests received
+                fake.connections  #? client addresses connected from
+    '''
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.server = ThreadingHTTPServer((host, port), FakeCloudinaryHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.url = f'http://{host}:{self.server.server_port}'
+
+        self.lock = threading.Lock()
+        self.resources = {}
+        self.requests = []
+        self.connections = set()
+
+    def record(self, method, path, client_address):
+        with self.lock:
+            self.requests.append((method, urlparse(path).path))
+            self.connections.add(client_address)
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True,
+        )
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+@override_settings(
+    IMAGE_STORAGE='api.image_storage.CloudinaryImageStorage',
+    IMAGE_DELETE_DELAY=0,
+    CLOUDINARY_POOL_SIZE=3,
+)
+class TestCloudinaryImageStorage(APITestCase):
+    '''
+        Test Case to test cloudinary image storage against a fake server
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.user = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.fake = FakeCloudinaryServer().start()
+        self.prefix = self.settings(CLOUDINARY_UPLOAD_PREFIX=self.fake.url)
+        self.prefix.enable()
+
+        get_cloudinary_client.cache_clear()
+        get_image_storage.cache_clear()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+        get_cloudinary_client.cache_clear()
+        get_image_storage.cache_clear()
+
+        self.prefix.disable()
+        self.fake.stop()
+
+    def upload(self, public_id=''):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 200)).save(buffer, format='PNG')
+
+        return self.client.post(
+            reverse('image-upload'),
+            {
+                'image':
+                SimpleUploadedFile(
+                    'image.png',
+                    buffer.getvalue(),
+                    content_type='image/png',
+                ),
+                'folder':
+                'profile',
+                'public_id':
+                public_id,
+            },
+            format='multipart',
+        )
+
+    def test_Cloudinary_upload(self):
+        '''
+            Test image and thumbnails are uploaded over pooled connections
+        '''
+        for _ in range(3):
+            resp = self.upload()
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        public_id = resp.data['public_id']
+        self.assertIn(public_id, set(self.fake.resources))
+        self.assertIn(f'{public_id}_thumbnail', set(self.fake.resources))
+        self.assertTrue(resp.data['image_url'].startswith(self.fake.url))
+
+        self.assertEqual(len(self.fake.requests), 9)
+        self.assertLessEqual(len(self.fake.connections), 3)
+
+        metrics = get_cloudinary_client().metrics.get()
+        self.assertEqual(metrics['upload']['count'], 9)
+        self.assertEqual(metrics['upload']['failed'], 0)
+
+    def test_Cloudinary_delete_batched(self):
+        '''
+            Test replaced images are deleted together in one call
+        '''
+        old = [self.upload().data['public_id'] for _ in range(3)]
+        for public_id in old:
+            self.upload(public_id)
+
+        self.assertEqual(
+            JobModel.objects.filter(name='image.delete').count(), 1)
+
+        run_pending()
+
+        deletes = [req for req in self.fake.requests if req[0] == 'DELETE']
+        self.assertEqual(len(deletes), 1)
+        stored = set(self.fake.resources)
+        for public_id in old:
+            self.assertNotIn(public_id, stored)
+            self.assertNotIn(f'{public_id}_small', stored)
+        self.assertEqual(len(stored), 9)
+
+    def test_Cloudinary_metrics(self):
+        '''
+            Test metrics of cloudinary calls are returned to Admins only
+        '''
+        self.upload()
+
+        resp = self.client.get(reverse('image-storage-metrics'))
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.client.force_authenticate(user=admin)
+
+        resp = self.client.get(reverse('image-storage-metrics'))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['storage'],
+                         'api.image_storage.CloudinaryImageStorage')
+        self.assertEqual(resp.data['operations']['upload']['count'], 3)
+        self.assertEqual(resp.data['operations']['upload']['failed'], 0)
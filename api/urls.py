@@ -34,11 +34,14 @@ from department import views as DeptViews
 from student import views as StudViews
 
 #? image upload
-from .views import ImageUploadAPIView
+from .views import ImageStorageMetricsAPIView, ImageUploadAPIView
 
 #? University
 from university import views as UniViews
 
+#? Jobs
+from jobs import views as JobViews
+
 #? Contact
 from contact import views as ContactViews
 
@@ -86,6 +89,16 @@ urlpatterns = [
 
     #? Auth
     path('auth/me/', AuthViews.AuthMeApiView.as_view(), name='auth-me'),
+    path('auth/logout/', AuthViews.LogoutAPIView.as_view(), name='logout'),
+    path('auth/password/set/',
+         AuthViews.PasswordSetAPIView.as_view(),
+         name='password-set'),
+    path('auth/api-keys/',
+         AuthViews.ApiKeyListCreateAPIView.as_view(),
+         name='api-key-list-create'),
+    path('auth/api-keys/<int:pk>/',
+         AuthViews.ApiKeyRetrieveRevokeAPIView.as_view(),
+         name='api-key-retrieve-revoke'),
 
     #? Attendance
     path('attendance/',
@@ -94,6 +107,18 @@ urlpatterns = [
     path('attendance/bulk/',
          AttenViews.AttendanceBulkCreateAPIView.as_view(),
          name='attendance-bulk-create'),
+    path('attendance/roll-call/',
+         AttenViews.AttendanceRollCallAPIView.as_view(),
+         name='attendance-roll-call'),
+    path('attendance/stats/',
+         AttenViews.AttendanceStatListAPIView.as_view(),
+         name='attendance-stats'),
+    path('attendance/export/',
+         AttenViews.AttendanceExportAPIView.as_view(),
+         name='attendance-export'),
+    path('attendance/sheet/',
+         AttenViews.AttendanceSheetListCreateAPIView.as_view(),
+         name='attendance-sheet-list-create'),
     path('attendance/<int:pk>/',
          AttenViews.AttendanceRetrieveUpdateDestroyAPIView.as_view(),
          name='attendance-retrieve-update-destroy'),
@@ -105,6 +130,9 @@ urlpatterns = [
     path('class/<int:pk>/',
          ClassViews.ClassRetrieveUpdateDestroyAPIView.as_view(),
          name='class-retrieve-update-destroy'),
+    path('class/<int:pk>/register/',
+         ClassViews.ClassRegisterAPIView.as_view(),
+         name='class-register'),
 
     #? College
     path('college/',
@@ -149,6 +177,9 @@ urlpatterns = [
 
     #? Image Upload
     path('image-upload/', ImageUploadAPIView.as_view(), name='image-upload'),
+    path('image-upload/metrics/',
+         ImageStorageMetricsAPIView.as_view(),
+         name='image-storage-metrics'),
 
     #? University
     path('university/',
@@ -168,4 +199,9 @@ urlpatterns = [
     path('contact/<int:pk>/',
          ContactViews.ContactRetrieveUpdateDestroyAPIView.as_view(),
          name='contact-retrieve-update-destroy'),
+
+    #? Jobs
+    path('jobs/<int:pk>/',
+         JobViews.JobRetrieveAPIView.as_view(),
+         name='job-retrieve'),
 ]
@@ -1,7 +1,6 @@
 from collections import OrderedDict
 import logging
-
-import cloudinary.uploader
+import time
 
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
 from drf_spectacular.types import OpenApiTypes
@@ -9,7 +8,13 @@ from drf_spectacular.types import OpenApiTypes
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 
+from django.conf import settings
+
 from . import serializers, response_serializers
+from .images import LimitedTemporaryFileUploadHandler, process_image
+from .image_storage import get_image_storage, schedule_destroy
+
+from user.permissions import UserIsAdmin
 
 #? set logger
 logger = logging.getLogger(__name__)
@@ -29,13 +34,18 @@ logger = logging.getLogger(__name__)
             OpenApiResponse(response=OpenApiTypes.OBJECT)
         },
         description=
-        'Uploads an image to cloudinary and returns the url.\n\noptional: Deletes an image if public_id is passed\n\nAccessible by: Authenticated',
+        'Uploads an image, downscaled and re-encoded with its thumbnails, to the image storage and returns the urls.\n\noptional: Deletes an image (and its thumbnails) if public_id is passed\n\nAccessible by: Authenticated',
     ), )
 class ImageUploadAPIView(generics.CreateAPIView):
     '''
         Allowed methods: POST
 
-        Uploads an image to cloudinary and returns the url.
+        Uploads an image to the image storage (settings.IMAGE_STORAGE)
+        and returns the url.
+
+        The upload is streamed to a temporary file, then downscaled and
+        re-encoded (settings.IMAGE_FORMAT) with thumbnails generated
+        (settings.IMAGE_THUMBNAIL_SIZES) before it is stored.
 
         optional: Deletes an image if public_id is passed.
             
@@ -45,7 +55,13 @@ class ImageUploadAPIView(generics.CreateAPIView):
     serializer_class = serializers.ImageUploadSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    #? upload Image to Cloudinary and return its url
+    #? stream uploads to disk instead of memory
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [LimitedTemporaryFileUploadHandler(request)]
+
+        return super().initialize_request(request, *args, **kwargs)
+
+    #? upload Image to the image storage and return its url
     def post(self, request, *args, **kwargs):
         request_data = OrderedDict()
         request_data.update(request.data)
@@ -58,22 +74,21 @@ class ImageUploadAPIView(generics.CreateAPIView):
         instance.is_valid(raise_exception=True)
 
         try:
-            #? upload image to cloudinary
-            uploaded_image = cloudinary.uploader.upload(
-                instance.validated_data['image'],
+            #? downscale, re-encode and generate thumbnails, then upload
+            start = time.perf_counter()
+            renditions = process_image(instance.validated_data['image'])
+            processed = time.perf_counter()
+
+            uploaded_image = get_image_storage().save(
+                renditions,
                 folder=instance.validated_data['folder'],
             )
+            stored = time.perf_counter()
 
-            #? remove api_key
-            uploaded_image.pop('api_key')
-            logger.info(uploaded_image)
-
-            #? if public_id is provided delete the image from cloudinary
+            #? if public_id is provided delete the image from storage,
+            #? batched by a background Job as the client doesn't wait on it
             if instance.validated_data['public_id']:
-                delete_image = cloudinary.uploader.destroy(
-                    public_id=instance.validated_data['public_id'], )
-
-                logger.info(delete_image)
+                schedule_destroy(instance.validated_data['public_id'])
 
         except Exception as ex:
             logger.error(str(ex))
@@ -82,9 +97,58 @@ class ImageUploadAPIView(generics.CreateAPIView):
                             status=status.HTTP_400_BAD_REQUEST)
 
         response = {
-            'image_url': uploaded_image['secure_url'],
+            'image_url':
+            request.build_absolute_uri(uploaded_image['image_url']),
             'public_id': uploaded_image['public_id'],
+            'thumbnails': {
+                name: request.build_absolute_uri(url)
+                for name, url in uploaded_image['thumbnails'].items()
+            },
         }
         logger.info(response)
 
-        return Response(response, status=status.HTTP_201_CREATED)
+        #? timings (ms) of processing and storing, for monitoring
+        timing = f'process;dur={(processed - start) * 1000:.1f}, storage;dur={(stored - processed) * 1000:.1f}'
+
+        return Response(
+            response,
+            status=status.HTTP_201_CREATED,
+            headers={'Server-Timing': timing},
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(description='Image Storage Metrics',
+                            response=response_serializers.
+                            ImageStorageMetricsResponseSerializer),
+        },
+        description=
+        'Returns count, failures and timings (seconds: total, average, max) of the image storage calls per operation (upload, delete), as seen by the process answering.\n\nAccessible by: Admin',
+    ), )
+class ImageStorageMetricsAPIView(generics.GenericAPIView):
+    '''
+        Allowed methods: GET
+
+        GET: Returns metrics of the image storage calls
+
+        Note: metrics are kept per process, since it started
+
+        Accessible by: Admin
+    '''
+    serializer_class = response_serializers.ImageStorageMetricsResponseSerializer
+    permission_classes = [permissions.IsAuthenticated & UserIsAdmin]
+
+    #? get metrics of the image storage
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer({
+            'storage':
+            settings.IMAGE_STORAGE,
+            'operations':
+            get_image_storage().get_metrics(),
+        })
+
+        return Response(serializer.data)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import AttendanceModel
+from .models import AttendanceModel, AttendanceSheetModel
 
 
 @admin.register(AttendanceModel)
@@ -18,3 +18,18 @@ class AttendanceModelAdmin(admin.ModelAdmin):
     ordering = [
         'date',
     ]
+
+
+@admin.register(AttendanceSheetModel)
+class AttendanceSheetModelAdmin(admin.ModelAdmin):
+    '''Admin View for AttendanceSheetModel'''
+
+    list_display = [
+        'for_class',
+        'date',
+        'created_on',
+    ]
+
+    ordering = [
+        'date',
+    ]
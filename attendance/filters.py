@@ -1,6 +1,6 @@
 from django_filters import rest_framework as filters
 
-from .models import AttendanceModel
+from .models import AttendanceModel, AttendanceSheetModel, AttendanceStatModel
 
 
 class AttendanceFilter(filters.FilterSet):
@@ -15,3 +15,37 @@ class AttendanceFilter(filters.FilterSet):
             'is_absent',
             'for_class',
         ]
+
+
+class AttendanceSheetFilter(filters.FilterSet):
+    date = filters.DateFromToRangeFilter()
+
+    class Meta:
+        model = AttendanceSheetModel
+        fields = [
+            'date',
+            'for_class',
+        ]
+
+
+class AttendanceStatFilter(filters.FilterSet):
+    #? stats are monthly, dates are matched by their month
+    date = filters.DateFromToRangeFilter(method='filter_date')
+
+    class Meta:
+        model = AttendanceStatModel
+        fields = [
+            'date',
+            'for_class',
+            'college',
+            'department',
+        ]
+
+    def filter_date(self, queryset, name, value):
+        if value.start:
+            queryset = queryset.filter(month__gte=value.start.replace(day=1))
+
+        if value.stop:
+            queryset = queryset.filter(month__lte=value.stop)
+
+        return queryset
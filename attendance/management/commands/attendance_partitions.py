@@ -0,0 +1,82 @@
+import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attendance import partitions
+from attendance.stats import get_month
+
+
+class Command(BaseCommand):
+    help = 'Manages monthly range partitions of the Attendance table (PostgreSQL only). convert: partitions the table, create: creates partitions ahead of time, detach: detaches (and archives or drops) old partitions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action',
+            choices=['convert', 'create', 'detach'],
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Months ahead of the current one to create partitions for',
+        )
+        parser.add_argument(
+            '--before',
+            type=datetime.date.fromisoformat,
+            help='Detach partitions of months before this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--archive-schema',
+            default='archive',
+            help='Schema detached partitions are moved to',
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop detached partitions instead of archiving them',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            getattr(self, f'handle_{options["action"]}')(options)
+        except partitions.PartitioningError as ex:
+            raise CommandError(str(ex))
+
+    def handle_convert(self, options):
+        months = partitions.convert(options['months_ahead'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Attendance table partitioned into {len(months)} months'))
+
+    def handle_create(self, options):
+        today = get_month(timezone.localdate())
+        months = list(
+            partitions.iter_months(
+                today,
+                today + relativedelta(months=options['months_ahead']),
+            ))
+        partitions.create_partitions(months)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Partitions up to {months[-1]:%Y-%m} are present'))
+
+    def handle_detach(self, options):
+        if not options['before']:
+            raise CommandError('--before is required to detach partitions')
+
+        detached = partitions.detach_partitions(
+            options['before'],
+            archive_schema=options['archive_schema'],
+            drop=options['drop'],
+        )
+
+        for name in detached:
+            self.stdout.write(f'Detached {name}')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{len(detached)} partitions detached'))
@@ -0,0 +1,90 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+
+from attendance.filters import AttendanceFilter
+from attendance.models import AttendanceModel
+
+#? standard filter combinations of the Attendance list (AttendanceFilter)
+QUERIES = {
+    'list': {},
+    'class, date range': {
+        'for_class': '{class}',
+        'date_after': '{start}',
+        'date_before': '{end}',
+    },
+    'class, late, date range': {
+        'for_class': '{class}',
+        'is_late': 'true',
+        'date_after': '{start}',
+        'date_before': '{end}',
+    },
+    'class, absent': {
+        'for_class': '{class}',
+        'is_absent': 'true',
+    },
+    'date range': {
+        'date_after': '{start}',
+        'date_before': '{end}',
+    },
+    'student, date range': {
+        'student': '{student}',
+        'date_after': '{start}',
+        'date_before': '{end}',
+    },
+}
+
+
+class Command(BaseCommand):
+    help = 'Prints query plans of the standard Attendance list filters. Run before and after migrating to compare plans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run the queries to get actual timings (PostgreSQL only)',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Length of the date range filtered on',
+        )
+
+    def handle(self, *args, **options):
+        sample = AttendanceModel.objects.aggregate(
+            for_class=Min('for_class'),
+            student=Min('student'),
+        )
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=options['days'])
+
+        values = {
+            'class': sample['for_class'] or 1,
+            'student': sample['student'] or 1,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+        }
+
+        explain_options = {'analyze': True} if options['analyze'] else {}
+
+        for name, params in QUERIES.items():
+            data = {
+                key: value.format(**values)
+                for key, value in params.items()
+            }
+            #? filter only exposed on the Student endpoints
+            student = data.pop('student', None)
+
+            queryset = AttendanceFilter(
+                data,
+                queryset=AttendanceModel.objects.all(),
+            ).qs.order_by('-created_on')
+
+            if student is not None:
+                queryset = queryset.filter(student=student)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(queryset[:10].explain(**explain_options))
+            self.stdout.write('')
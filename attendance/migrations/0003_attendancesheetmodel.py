@@ -0,0 +1,36 @@
+# Generated by Django 4.1.3 on 2026-10-18 15:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0006_remove_classmodel_student_classmodel_student'),
+        ('attendance', '0002_alter_attendancemodel_student'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSheetModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('roster', models.BinaryField(default=bytes)),
+                ('present', models.BinaryField(default=bytes)),
+                ('late', models.BinaryField(default=bytes)),
+                ('created_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('for_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_sheet', to='classes.classmodel')),
+            ],
+            options={
+                'verbose_name': 'Attendance Sheet',
+                'verbose_name_plural': 'Attendance Sheets',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='attendancesheetmodel',
+            constraint=models.UniqueConstraint(fields=('for_class', 'date'), name='unique_attendance_sheet_class_date'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.3 on 2026-10-18 15:23
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+from api.operations import AddUniqueConstraintConcurrently
+
+
+def remove_duplicate_attendance(apps, schema_editor):
+    '''
+        Keeps only the latest Attendance of a Student for a Class on a date
+    '''
+    AttendanceModel = apps.get_model('attendance', 'AttendanceModel')
+
+    duplicates = AttendanceModel.objects.filter(
+        student__isnull=False,
+        for_class__isnull=False,
+    ).values('student', 'for_class', 'date').annotate(
+        latest=Max('id'),
+        total=Count('id'),
+    ).filter(total__gt=1)
+
+    for duplicate in duplicates.iterator():
+        AttendanceModel.objects.filter(
+            student=duplicate['student'],
+            for_class=duplicate['for_class'],
+            date=duplicate['date'],
+        ).exclude(id=duplicate['latest']).delete()
+
+
+class Migration(migrations.Migration):
+    #? the unique index is built concurrently, which can't run in a
+    #? transaction
+    atomic = False
+
+    dependencies = [
+        ('attendance', '0003_attendancesheetmodel'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_attendance,
+            migrations.RunPython.noop,
+            atomic=True,
+        ),
+        AddUniqueConstraintConcurrently(
+            model_name='attendancemodel',
+            constraint=models.UniqueConstraint(fields=('student', 'for_class', 'date'), name='unique_attendance_student_class_date'),
+        ),
+    ]
@@ -0,0 +1,173 @@
+# Generated by Django 4.1.3 on 2026-10-18 15:24
+
+from array import array
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+
+
+def unpack_ids(data):
+    '''
+        Unpacks ids of an Attendance Sheet roster, copy of
+        attendance.models.unpack_ids as of this migration
+    '''
+    ids = array('q')
+    ids.frombytes(bytes(data))
+    return ids.tolist()
+
+
+def unpack_flags(data, length):
+    '''
+        Unpacks a bitmap of an Attendance Sheet, copy of
+        attendance.models.unpack_flags as of this migration
+    '''
+    data = bytes(data)
+    return [
+        bool(data[index >> 3] & (1 << (index & 7))) for index in range(length)
+    ]
+
+
+def build_attendance_stats(apps, schema_editor):
+    '''
+        Builds monthly Attendance Stats from the existing Attendances and
+        Attendance Sheets
+    '''
+    AttendanceModel = apps.get_model('attendance', 'AttendanceModel')
+    AttendanceSheetModel = apps.get_model('attendance', 'AttendanceSheetModel')
+    AttendanceStatModel = apps.get_model('attendance', 'AttendanceStatModel')
+    StudentModel = apps.get_model('student', 'StudentModel')
+
+    #? (student, for_class, month) -> [sessions, present, late, absent]
+    counts = {}
+    #? for_class -> (college, department)
+    classes = {}
+
+    rows = AttendanceModel.objects.filter(
+        student__isnull=False,
+        for_class__isnull=False,
+    ).annotate(month=TruncMonth('date')).values(
+        'student',
+        'for_class',
+        'for_class__college',
+        'for_class__department',
+        'month',
+    ).annotate(
+        sessions=Count('id'),
+        present=Count('id', filter=Q(is_present=True)),
+        late=Count('id', filter=Q(is_late=True)),
+        absent=Count('id', filter=Q(is_absent=True)),
+    ).order_by()
+
+    for row in rows.iterator():
+        classes[row['for_class']] = (row['for_class__college'],
+                                     row['for_class__department'])
+        counts[(row['student'], row['for_class'], row['month'])] = [
+            row['sessions'],
+            row['present'],
+            row['late'],
+            row['absent'],
+        ]
+
+    #? rosters may hold Students deleted since
+    students = set(StudentModel.objects.values_list('id', flat=True))
+
+    sheets = AttendanceSheetModel.objects.values(
+        'for_class',
+        'for_class__college',
+        'for_class__department',
+        'date',
+        'roster',
+        'present',
+        'late',
+    )
+
+    for sheet in sheets.iterator():
+        classes[sheet['for_class']] = (sheet['for_class__college'],
+                                       sheet['for_class__department'])
+        month = sheet['date'].replace(day=1)
+
+        roster = unpack_ids(sheet['roster'])
+        present = unpack_flags(sheet['present'], len(roster))
+        late = unpack_flags(sheet['late'], len(roster))
+
+        for student, is_present, is_late in zip(roster, present, late):
+            if student not in students:
+                continue
+
+            count = counts.setdefault((student, sheet['for_class'], month),
+                                      [0, 0, 0, 0])
+            count[0] += 1
+            count[1] += is_present
+            count[2] += is_late
+            count[3] += not is_present
+
+    AttendanceStatModel.objects.bulk_create(
+        (AttendanceStatModel(
+            student_id=student,
+            for_class_id=for_class,
+            college_id=classes[for_class][0],
+            department_id=classes[for_class][1],
+            month=month,
+            sessions=sessions,
+            present=present,
+            late=late,
+            absent=absent,
+        ) for (student, for_class, month), (sessions, present, late,
+                                            absent) in counts.items()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college', '0014_collegemodel_teacher'),
+        ('classes', '0006_remove_classmodel_student_classmodel_student'),
+        ('department', '0010_alter_departmentmodel_college'),
+        ('student', '0019_remove_universityrollno_student_and_more'),
+        ('attendance', '0004_attendancemodel_unique_student_class_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceStatModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('college', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_stat', to='college.collegemodel')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_stat', to='department.departmentmodel')),
+                ('for_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_stat', to='classes.classmodel')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_stat', to='student.studentmodel')),
+            ],
+            options={
+                'verbose_name': 'Attendance Stat',
+                'verbose_name_plural': 'Attendance Stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='attendancestatmodel',
+            index=models.Index(fields=['college', 'month'], name='attendance_stat_college_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancestatmodel',
+            index=models.Index(fields=['department', 'month'], name='attendance_stat_dept_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancestatmodel',
+            index=models.Index(fields=['for_class', 'month'], name='attendance_stat_class_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendancestatmodel',
+            constraint=models.UniqueConstraint(fields=('student', 'for_class', 'month'), name='unique_attendance_stat_student_class_month'),
+        ),
+        migrations.RunPython(
+            build_attendance_stats,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.3 on 2026-10-18 15:36
+
+from django.db import migrations, models
+
+from api.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    #? indexes are built concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('attendance', '0005_attendancestatmodel'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='attendancemodel',
+            index=models.Index(fields=['for_class', 'date'], name='attendance_class_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='attendancemodel',
+            index=models.Index(fields=['student', 'date'], name='attendance_student_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='attendancemodel',
+            index=models.Index(condition=models.Q(('is_late', True)), fields=['for_class', 'date'], name='attendance_late_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='attendancemodel',
+            index=models.Index(fields=['-created_on'], name='attendance_created_on_idx'),
+        ),
+    ]
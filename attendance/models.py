@@ -1,8 +1,12 @@
+from array import array
+
 from django.db import models
 from django.utils import timezone
 
 from student.models import StudentModel
 from classes.models import ClassModel
+from college.models import CollegeModel
+from department.models import DepartmentModel
 
 
 class AttendanceModel(models.Model):
@@ -33,7 +37,223 @@ class AttendanceModel(models.Model):
 
         verbose_name = 'Attendance'
         verbose_name_plural = 'Attendances'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'for_class', 'date'],
+                name='unique_attendance_student_class_date',
+            ),
+        ]
+        indexes = [
+            #? Attendance of a Class over a date range
+            models.Index(
+                fields=['for_class', 'date'],
+                name='attendance_class_date_idx',
+            ),
+            #? Attendance of a Student over a date range
+            models.Index(
+                fields=['student', 'date'],
+                name='attendance_student_date_idx',
+            ),
+            #? late comers are few, index only them
+            models.Index(
+                fields=['for_class', 'date'],
+                condition=models.Q(is_late=True),
+                name='attendance_late_idx',
+            ),
+            #? default ordering of Attendance list
+            models.Index(
+                fields=['-created_on'],
+                name='attendance_created_on_idx',
+            ),
+        ]
 
     def __str__(self):
         '''Unicode representation of AttendanceModel.'''
         return self.student.first_name
+
+
+def pack_ids(ids):
+    '''
+        Packs a list of ids into bytes (signed 64 bit integers)
+    '''
+    return array('q', ids).tobytes()
+
+
+def unpack_ids(data):
+    '''
+        Unpacks bytes packed by pack_ids into a list of ids
+    '''
+    ids = array('q')
+    ids.frombytes(bytes(data))
+    return ids.tolist()
+
+
+def pack_flags(flags):
+    '''
+        Packs a list of booleans into a bitmap, bit i is flags[i]
+    '''
+    bitmap = bytearray((len(flags) + 7) // 8)
+
+    for index, flag in enumerate(flags):
+        if flag:
+            bitmap[index >> 3] |= 1 << (index & 7)
+
+    return bytes(bitmap)
+
+
+def unpack_flags(data, length):
+    '''
+        Unpacks a bitmap packed by pack_flags into a list of booleans
+    '''
+    data = bytes(data)
+    return [
+        bool(data[index >> 3] & (1 << (index & 7))) for index in range(length)
+    ]
+
+
+class AttendanceSheetModel(models.Model):
+    '''
+        Model definition for AttendanceSheetModel.
+
+        - compact storage of the Attendance of a Class for a single day
+        - one row per (for_class, date) instead of one row per Student
+        - roster holds the packed ids of the Students marked on the sheet,
+          present and late hold one bit per Student in roster order
+    '''
+
+    for_class = models.ForeignKey(
+        ClassModel,
+        on_delete=models.CASCADE,
+        related_name='attendance_sheet',
+    )
+    date = models.DateField(default=timezone.now)
+    roster = models.BinaryField(default=bytes)
+    present = models.BinaryField(default=bytes)
+    late = models.BinaryField(default=bytes)
+    created_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        '''Meta definition for AttendanceSheetModel.'''
+
+        verbose_name = 'Attendance Sheet'
+        verbose_name_plural = 'Attendance Sheets'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['for_class', 'date'],
+                name='unique_attendance_sheet_class_date',
+            ),
+        ]
+
+    def __str__(self):
+        '''Unicode representation of AttendanceSheetModel.'''
+        return f'{self.for_class_id} {self.date}'
+
+    def get_students(self):
+        '''
+            Returns ids of the Students marked on the sheet, in roster order
+        '''
+        return unpack_ids(self.roster)
+
+    def set_records(self, records):
+        '''
+            Packs records into the sheet
+
+            records: iterable of (student id, is_present, is_late)
+        '''
+        records = sorted(records)
+
+        self.roster = pack_ids([student for student, _, _ in records])
+        self.present = pack_flags([is_present for _, is_present, _ in records])
+        self.late = pack_flags([is_late for _, _, is_late in records])
+
+    def get_records(self):
+        '''
+            Expands the sheet into the per Student Attendance shape
+
+            returns:
+                - list of dicts, same fields as AttendanceSerializer
+        '''
+        students = self.get_students()
+        present = unpack_flags(self.present, len(students))
+        late = unpack_flags(self.late, len(students))
+
+        return [{
+            'student': student,
+            'for_class': self.for_class_id,
+            'date': self.date,
+            'is_present': is_present,
+            'is_absent': not is_present,
+            'is_late': is_late,
+        } for student, is_present, is_late in zip(students, present, late)]
+
+
+class AttendanceStatModel(models.Model):
+    '''
+        Model definition for AttendanceStatModel.
+
+        - monthly aggregate of the Attendances of a Student in a Class
+        - college and department are copied from the Class so stats
+          can be read without joins
+        - maintained on every Attendance and Attendance Sheet write,
+          see attendance.stats
+    '''
+
+    student = models.ForeignKey(
+        StudentModel,
+        on_delete=models.CASCADE,
+        related_name='attendance_stat',
+    )
+    for_class = models.ForeignKey(
+        ClassModel,
+        on_delete=models.CASCADE,
+        related_name='attendance_stat',
+    )
+    college = models.ForeignKey(
+        CollegeModel,
+        on_delete=models.CASCADE,
+        related_name='attendance_stat',
+        blank=True,
+        null=True,
+    )
+    department = models.ForeignKey(
+        DepartmentModel,
+        on_delete=models.CASCADE,
+        related_name='attendance_stat',
+        blank=True,
+        null=True,
+    )
+    month = models.DateField()
+    sessions = models.PositiveIntegerField(default=0)
+    present = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        '''Meta definition for AttendanceStatModel.'''
+
+        verbose_name = 'Attendance Stat'
+        verbose_name_plural = 'Attendance Stats'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'for_class', 'month'],
+                name='unique_attendance_stat_student_class_month',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['college', 'month'],
+                name='attendance_stat_college_idx',
+            ),
+            models.Index(
+                fields=['department', 'month'],
+                name='attendance_stat_dept_idx',
+            ),
+            models.Index(
+                fields=['for_class', 'month'],
+                name='attendance_stat_class_idx',
+            ),
+        ]
+
+    def __str__(self):
+        '''Unicode representation of AttendanceStatModel.'''
+        return f'{self.student_id} {self.for_class_id} {self.month}'
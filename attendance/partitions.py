@@ -0,0 +1,294 @@
+import datetime
+import re
+
+from dateutil.relativedelta import relativedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AttendanceModel
+from .stats import get_month
+
+#? partitions are named <attendance table>_y<year>m<month>
+PARTITION_NAME_RE = re.compile(r'_y(?P<year>\d{4})m(?P<month>\d{2})$')
+
+
+class PartitioningError(Exception):
+    pass
+
+
+def get_table():
+    return AttendanceModel._meta.db_table
+
+
+def iter_months(start, end):
+    '''
+        Yields the first day of every month from start to end (inclusive)
+    '''
+    month = get_month(start)
+    while month <= end:
+        yield month
+        month += relativedelta(months=1)
+
+
+def get_partition_name(month):
+    return f'{get_table()}_y{month.year:04d}m{month.month:02d}'
+
+
+def get_default_partition_name():
+    return f'{get_table()}_default'
+
+
+def get_partition_month(name):
+    '''
+        Returns the month of a partition from its name,
+        None for partitions not created here (e.g. default partition)
+    '''
+    match = PARTITION_NAME_RE.search(name)
+    if not match:
+        return None
+
+    return datetime.date(int(match['year']), int(match['month']), 1)
+
+
+def _check_vendor():
+    if connection.vendor != 'postgresql':
+        raise PartitioningError(
+            'Attendance partitioning is only supported on PostgreSQL')
+
+
+def is_partitioned():
+    '''
+        Returns whether the Attendance table is a partitioned table
+    '''
+    _check_vendor()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT relkind FROM pg_class WHERE oid = %s::regclass',
+            [get_table()],
+        )
+        return cursor.fetchone()[0] == 'p'
+
+
+def get_partitions():
+    '''
+        Returns names of the partitions of the Attendance table
+    '''
+    _check_vendor()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            ORDER BY child.relname
+            ''',
+            [get_table()],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _create_partitions(cursor, table, months):
+    quote = connection.ops.quote_name
+
+    for month in months:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {quote(get_partition_name(month))} '
+            f'PARTITION OF {quote(table)} '
+            'FOR VALUES FROM (%s) TO (%s)',
+            [
+                month.isoformat(),
+                (month + relativedelta(months=1)).isoformat(),
+            ],
+        )
+
+
+def create_partitions(months):
+    '''
+        Creates monthly partitions for given months, existing are skipped
+
+        PostgreSQL refuses to create a partition while the default
+        partition holds rows of its range, so the default partition is
+        detached meanwhile and such rows are moved to the new partitions
+        before attaching it back.
+
+        Note: detaching and attaching the default partition locks the
+        Attendance table, attaching scans the default partition
+    '''
+    if not is_partitioned():
+        raise PartitioningError('Attendance table is not partitioned')
+
+    quote = connection.ops.quote_name
+    table = get_table()
+    default = get_default_partition_name()
+
+    existing = get_partitions()
+    months = [
+        month for month in months if get_partition_name(month) not in existing
+    ]
+    if not months:
+        return
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if default in existing:
+            cursor.execute(f'ALTER TABLE {quote(table)} '
+                           f'DETACH PARTITION {quote(default)}')
+
+        _create_partitions(cursor, table, months)
+
+        if default in existing:
+            #? rows are routed to the new partitions through the table
+            for month in months:
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM {quote(default)} '
+                    'WHERE date >= %s AND date < %s RETURNING *) '
+                    f'INSERT INTO {quote(table)} SELECT * FROM moved',
+                    [
+                        month.isoformat(),
+                        (month + relativedelta(months=1)).isoformat(),
+                    ],
+                )
+
+            cursor.execute(f'ALTER TABLE {quote(table)} '
+                           f'ATTACH PARTITION {quote(default)} DEFAULT')
+
+
+def detach_partitions(before, archive_schema=None, drop=False):
+    '''
+        Detaches monthly partitions of months before given date
+
+        Detached partitions are moved to archive_schema (still readable
+        as plain tables) or dropped.
+
+        Note: monthly Attendance Stats are kept
+
+        returns:
+            - names of detached partitions
+    '''
+    if not is_partitioned():
+        raise PartitioningError('Attendance table is not partitioned')
+
+    quote = connection.ops.quote_name
+    before = get_month(before)
+    detached = []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name in get_partitions():
+            month = get_partition_month(name)
+            if month is None or month >= before:
+                continue
+
+            cursor.execute(f'ALTER TABLE {quote(get_table())} '
+                           f'DETACH PARTITION {quote(name)}')
+
+            if drop:
+                cursor.execute(f'DROP TABLE {quote(name)}')
+            elif archive_schema:
+                cursor.execute(
+                    f'CREATE SCHEMA IF NOT EXISTS {quote(archive_schema)}')
+                cursor.execute(f'ALTER TABLE {quote(name)} '
+                               f'SET SCHEMA {quote(archive_schema)}')
+
+            detached.append(name)
+
+    return detached
+
+
+def convert(months_ahead):
+    '''
+        Converts the Attendance table into a table range partitioned by
+        month of date, with a default partition for anything else
+
+        Existing rows are copied over, then constraints and indexes of the
+        old table are recreated as they were. Primary key becomes
+        (id, date) as PostgreSQL requires the partition key in it.
+
+        Runs in a single transaction, the table is locked meanwhile.
+
+        Note: indexes can't be created concurrently on a partitioned
+        table, later migrations adding indexes lock it while building
+    '''
+    if is_partitioned():
+        raise PartitioningError('Attendance table is already partitioned')
+
+    table = get_table()
+    staging = f'{table}_partitioned'
+    sequence = f'{staging}_id_seq'
+    quote = connection.ops.quote_name
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'SELECT MIN(date), MAX(date) FROM {quote(table)}')
+        first, last = cursor.fetchone()
+
+        #? constraints (but primary key and not null, which LIKE copies)
+        #? and indexes go away with the old table, their definitions are
+        #? kept to recreate them
+        cursor.execute(
+            '''
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('c', 'f', 'u', 'x')
+            ORDER BY conname
+            ''',
+            [table],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            '''
+            SELECT pg_get_indexdef(indexrelid) FROM pg_index
+            WHERE indrelid = %s::regclass AND indexrelid NOT IN (
+                SELECT conindid FROM pg_constraint
+                WHERE conrelid = %s::regclass
+            )
+            ''',
+            [table, table],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+
+        #? partitions for every month with data and the months ahead
+        today = get_month(timezone.localdate())
+        end = today + relativedelta(months=months_ahead)
+        months = list(
+            iter_months(min(first or today, today), max(last or end, end)))
+
+        cursor.execute(f'CREATE TABLE {quote(staging)} '
+                       f'(LIKE {quote(table)} INCLUDING DEFAULTS) '
+                       'PARTITION BY RANGE (date)')
+        _create_partitions(cursor, staging, months)
+        cursor.execute(f'CREATE TABLE {quote(get_default_partition_name())} '
+                       f'PARTITION OF {quote(staging)} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {quote(staging)} '
+                       f'SELECT * FROM {quote(table)}')
+
+        #? id sequence of old table goes away with it
+        cursor.execute(f'CREATE SEQUENCE {quote(sequence)} '
+                       f'OWNED BY {quote(staging)}.id')
+        cursor.execute(
+            'SELECT setval(%s, COALESCE((SELECT MAX(id) FROM '
+            f'{quote(staging)}), 0) + 1, false)',
+            [sequence],
+        )
+        cursor.execute(
+            f'ALTER TABLE {quote(staging)} ALTER COLUMN id '
+            'SET DEFAULT nextval(%s)', [sequence])
+
+        cursor.execute(f'DROP TABLE {quote(table)}')
+        cursor.execute(f'ALTER TABLE {quote(staging)} '
+                       f'RENAME TO {quote(table)}')
+
+        cursor.execute(f'ALTER TABLE {quote(table)} '
+                       f'ADD CONSTRAINT {quote(table + "_pkey")} '
+                       'PRIMARY KEY (id, date)')
+
+        #? definitions name the table, which is the partitioned one now
+        for name, definition in constraints:
+            cursor.execute(f'ALTER TABLE {quote(table)} '
+                           f'ADD CONSTRAINT {quote(name)} {definition}')
+
+        for definition in indexes:
+            cursor.execute(definition)
+
+    return months
@@ -0,0 +1,95 @@
+from classes.models import ClassModel
+
+from .models import (
+    AttendanceModel,
+    AttendanceSheetModel,
+    unpack_flags,
+    unpack_ids,
+)
+
+#? status codes of the register, code is the index
+REGISTER_CODES = ['unmarked', 'present', 'late', 'absent']
+UNMARKED, PRESENT, LATE, ABSENT = range(len(REGISTER_CODES))
+
+
+def get_status_code(is_present, is_late):
+    if is_late:
+        return LATE
+
+    return PRESENT if is_present else ABSENT
+
+
+def build_register(for_class, date_from=None, date_to=None):
+    '''
+        Builds the register of a Class, Students by dates matrix of
+        status codes (see REGISTER_CODES)
+
+        Students are the Class roster plus any Student with an Attendance
+        in range, dates are the dates with any Attendance in range.
+        Attendance Sheets are decoded into the same records
+
+        Runs three queries (roster, Attendances, Sheets) whatever the range
+
+        returns:
+            - (students, dates, status) where status has a row of codes
+              per Student, a code per date
+    '''
+    roster = ClassModel.student.through.objects.filter(
+        classmodel_id=for_class).values_list('studentmodel_id', flat=True)
+
+    dated = {}
+    if date_from:
+        dated['date__gte'] = date_from
+    if date_to:
+        dated['date__lte'] = date_to
+
+    rows = list(
+        AttendanceModel.objects.filter(
+            for_class_id=for_class,
+            **dated,
+        ).values_list(
+            'student_id',
+            'date',
+            'is_present',
+            'is_late',
+        ).order_by())
+
+    sheets = AttendanceSheetModel.objects.filter(
+        for_class_id=for_class,
+        **dated,
+    ).values_list('date', 'roster', 'present', 'late')
+
+    for date, sheet_roster, present, late in sheets:
+        marked = unpack_ids(sheet_roster)
+        rows.extend(
+            zip(
+                marked,
+                [date] * len(marked),
+                unpack_flags(present, len(marked)),
+                unpack_flags(late, len(marked)),
+            ))
+
+    students = sorted(
+        set(roster) | {row[0]
+                       for row in rows if row[0] is not None})
+    dates = sorted({row[1] for row in rows})
+
+    student_index = {student: index for index, student in enumerate(students)}
+    date_index = {date: index for index, date in enumerate(dates)}
+    width = len(dates)
+
+    #? one byte per cell, unmarked unless an Attendance says otherwise
+    cells = bytearray(len(students) * width)
+    for student, date, is_present, is_late in rows:
+        if student is None:
+            continue
+
+        cells[student_index[student] * width +
+              date_index[date]] = get_status_code(is_present, is_late)
+
+    status = [
+        list(cells[index * width:(index + 1) * width])
+        for index in range(len(students))
+    ]
+
+    return students, dates, status
@@ -1,11 +1,15 @@
 from rest_framework import serializers
 
 from . import models
+from .stats import get_month, get_stat_key, refresh_class_stats, refresh_stats
 from student.serializers import StudentFullSerializer
+from classes.models import ClassModel
 from classes.serializers import ClassFullSerializer
+from api.fieldsets import SparseFieldsetMixin
 
 
-class AttendanceFullSerializer(serializers.ModelSerializer):
+class AttendanceFullSerializer(SparseFieldsetMixin,
+                               serializers.ModelSerializer):
     '''
         Serializer to display Attendance Data   
     '''
@@ -29,6 +33,20 @@ class AttendanceSerializer(serializers.ModelSerializer):
             'created_on',
         ]
 
+    def create(self, validated_data):
+        attendance = super().create(validated_data)
+        refresh_stats([get_stat_key(attendance)])
+
+        return attendance
+
+    def update(self, instance, validated_data):
+        #? stats of both old and new Student, Class and month need a refresh
+        old_key = get_stat_key(instance)
+        attendance = super().update(instance, validated_data)
+        refresh_stats([old_key, get_stat_key(attendance)])
+
+        return attendance
+
 
 class AttendanceListSerializer(serializers.ListSerializer):
     '''
@@ -40,7 +58,12 @@ class AttendanceListSerializer(serializers.ListSerializer):
         attendance_list = [
             models.AttendanceModel(**item) for item in validated_data
         ]
-        return models.AttendanceModel.objects.bulk_create(attendance_list)
+        attendance_list = models.AttendanceModel.objects.bulk_create(
+            attendance_list)
+        refresh_stats(
+            get_stat_key(attendance) for attendance in attendance_list)
+
+        return attendance_list
 
 
 class AttendanceBulkSerializer(serializers.ModelSerializer):
@@ -55,3 +78,225 @@ class AttendanceBulkSerializer(serializers.ModelSerializer):
         exclude = [
             'created_on',
         ]
+
+
+class AttendanceSheetListSerializer(serializers.ListSerializer):
+    '''
+        Child List Serializer to record Attendances in compact Sheets.
+        Records are grouped into one Sheet per (for_class, date).
+    '''
+
+    def validate(self, attrs):
+        #? check all Students are enrolled in their Class with a single query
+        class_ids = {item['for_class'] for item in attrs}
+        enrolled = set(
+            ClassModel.student.through.objects.filter(
+                classmodel_id__in=class_ids).values_list(
+                    'classmodel_id',
+                    'studentmodel_id',
+                ))
+
+        errors = [
+            f'Student {item["student"]} is not enrolled in Class {item["for_class"]}.'
+            for item in attrs
+            if (item['for_class'], item['student']) not in enrolled
+        ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return attrs
+
+    def create(self, validated_data):
+        #? group records by sheet, last record of a Student wins
+        grouped = {}
+        for item in validated_data:
+            records = grouped.setdefault((item['for_class'], item['date']), {})
+            records[item['student']] = (
+                item['student'],
+                item['is_present'],
+                item['is_late'],
+            )
+
+        sheets = []
+        for (for_class, date), records in grouped.items():
+            sheet = models.AttendanceSheetModel(
+                for_class_id=for_class,
+                date=date,
+            )
+            sheet.set_records(records.values())
+            sheets.append(sheet)
+
+        #? single upsert for all the sheets
+        #! Note: unique_fields are passed as columns, hence for_class_id
+        sheets = models.AttendanceSheetModel.objects.bulk_create(
+            sheets,
+            update_conflicts=True,
+            unique_fields=['for_class_id', 'date'],
+            update_fields=['roster', 'present', 'late'],
+        )
+        refresh_class_stats(
+            (for_class, get_month(date)) for for_class, date in grouped)
+
+        return sheets
+
+    def to_representation(self, data):
+        return [record for sheet in data for record in sheet.get_records()]
+
+
+class AttendanceSheetSerializer(serializers.Serializer):
+    '''
+        Serializer to record Attendances in compact Sheets.
+        Accepts and returns the per Student Attendance shape.
+
+        Note: is_absent is derived from is_present
+    '''
+
+    student = serializers.IntegerField()
+    for_class = serializers.IntegerField()
+    date = serializers.DateField()
+    is_present = serializers.BooleanField(default=False)
+    is_absent = serializers.BooleanField(required=False)
+    is_late = serializers.BooleanField(default=False)
+
+    class Meta:
+        list_serializer_class = AttendanceSheetListSerializer
+
+
+class AttendanceRollCallSerializer(serializers.Serializer):
+    '''
+        Serializer to take the Roll Call of a Class for a date.
+
+        Every Student on the Class roster gets an Attendance,
+        Students not in present or late are marked absent.
+
+        Note: late Students are also marked present
+    '''
+
+    for_class = serializers.IntegerField()
+    date = serializers.DateField()
+    present = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=True,
+        default=list,
+    )
+    late = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=True,
+        default=list,
+    )
+
+    def validate(self, attrs):
+        #? fetch the Class roster with a single query
+        roster = set(
+            ClassModel.student.through.objects.filter(
+                classmodel_id=attrs['for_class']).values_list(
+                    'studentmodel_id',
+                    flat=True,
+                ))
+
+        if not roster and not ClassModel.objects.filter(
+                id=attrs['for_class']).exists():
+            raise serializers.ValidationError(
+                {'for_class': ['Class does not exist.']})
+
+        unknown = (set(attrs['present']) | set(attrs['late'])) - roster
+        if unknown:
+            raise serializers.ValidationError({
+                'students': [
+                    f'Student {student} is not enrolled in the Class.'
+                    for student in sorted(unknown)
+                ]
+            })
+
+        attrs['roster'] = roster
+        return attrs
+
+    def create(self, validated_data):
+        present = set(validated_data['present']) | set(validated_data['late'])
+        late = set(validated_data['late'])
+
+        attendance_list = [
+            models.AttendanceModel(
+                student_id=student,
+                for_class_id=validated_data['for_class'],
+                date=validated_data['date'],
+                is_present=student in present,
+                is_absent=student not in present,
+                is_late=student in late,
+            ) for student in sorted(validated_data['roster'])
+        ]
+
+        #? single upsert, taking the same Roll Call again updates it
+        #! Note: unique_fields are passed as columns, hence *_id
+        models.AttendanceModel.objects.bulk_create(
+            attendance_list,
+            update_conflicts=True,
+            unique_fields=['student_id', 'for_class_id', 'date'],
+            update_fields=['is_present', 'is_absent', 'is_late'],
+        )
+        refresh_stats(
+            get_stat_key(attendance) for attendance in attendance_list)
+
+        return {
+            'for_class': validated_data['for_class'],
+            'date': validated_data['date'],
+            'present': sorted(present),
+            'late': sorted(late),
+        }
+
+
+class AttendanceStatSerializer(serializers.Serializer):
+    '''
+        Serializer to display Attendance Stats of a Student in a Class
+    '''
+
+    student = serializers.IntegerField()
+    for_class = serializers.IntegerField()
+    sessions = serializers.IntegerField()
+    present = serializers.IntegerField()
+    late = serializers.IntegerField()
+    absent = serializers.IntegerField()
+    percentage = serializers.SerializerMethodField()
+
+    def get_percentage(self, obj) -> float:
+        '''
+            Returns percentage of sessions the Student was present in
+        '''
+        if not obj['sessions']:
+            return 0.0
+
+        return round(obj['present'] * 100 / obj['sessions'], 2)
+
+
+class AttendanceRegisterSerializer(serializers.Serializer):
+    '''
+        Serializer to display the register of a Class,
+        a Students by dates matrix of status codes
+
+        status: a row per Student, a code per date, code is the index
+        in codes
+    '''
+
+    for_class = serializers.IntegerField(read_only=True)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    codes = serializers.ListField(child=serializers.CharField(),
+                                  read_only=True)
+    students = serializers.ListField(child=serializers.IntegerField(),
+                                     read_only=True)
+    dates = serializers.ListField(child=serializers.DateField(),
+                                  read_only=True)
+    status = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField()),
+        read_only=True,
+    )
+
+    def validate(self, attrs):
+        date_from = attrs.get('date_from')
+        date_to = attrs.get('date_to')
+
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError(
+                {'date_from': ['date_from has to be before date_to.']})
+
+        return attrs
@@ -0,0 +1,229 @@
+import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from student.models import StudentModel
+
+from .models import AttendanceModel, AttendanceSheetModel, AttendanceStatModel
+
+
+def get_month(date):
+    '''
+        Returns the first day of the month of given date
+    '''
+    #? DateField default (timezone.now) gives a datetime until reloaded
+    if isinstance(date, datetime.datetime):
+        date = timezone.localdate(date)
+
+    return date.replace(day=1)
+
+
+def get_stat_key(attendance):
+    '''
+        Returns the (student, for_class, month) stat bucket of an Attendance
+    '''
+    return (
+        attendance.student_id,
+        attendance.for_class_id,
+        get_month(attendance.date),
+    )
+
+
+def _bucket_condition(buckets, date_field, month_lookup):
+    '''
+        Builds a single condition matching given buckets,
+        one clause per (for_class, month) group
+    '''
+    groups = {}
+    for student, for_class, month in buckets:
+        groups.setdefault((for_class, month), set()).add(student)
+
+    condition = Q()
+    for (for_class, month), students in groups.items():
+        condition |= Q(
+            for_class_id=for_class,
+            student_id__in=students,
+            **month_lookup(date_field, month),
+        )
+
+    return condition
+
+
+def _date_in_month(field, month):
+    return {
+        f'{field}__gte': month,
+        f'{field}__lt': month + relativedelta(months=1),
+    }
+
+
+def _month_is(field, month):
+    return {field: month}
+
+
+def _class_month_condition(class_months, date_field):
+    '''
+        Builds a single condition matching given (for_class, month) pairs
+    '''
+    condition = Q()
+    for for_class, month in class_months:
+        condition |= Q(for_class_id=for_class,
+                       **_date_in_month(date_field, month))
+
+    return condition
+
+
+def refresh_stats(keys):
+    '''
+        Recomputes the monthly stats of given stat buckets, from the
+        Attendances and the Attendance Sheets
+
+        keys: iterable of (student id, for_class id, month) as returned
+        by get_stat_key
+
+        Runs a constant number of queries regardless of the number of keys
+
+        Note: a day recorded both as an Attendance and on a Sheet counts
+        twice, a Class records its Attendance one way or the other
+    '''
+    buckets = {
+        key
+        for key in keys if key[0] is not None and key[1] is not None
+    }
+    if not buckets:
+        return
+
+    #? bucket -> [sessions, present, late, absent]
+    counts = {}
+
+    condition = _bucket_condition(buckets, 'date', _date_in_month)
+    rows = AttendanceModel.objects.filter(condition).annotate(
+        month=TruncMonth('date')).values(
+            'student',
+            'for_class',
+            'for_class__college',
+            'for_class__department',
+            'month',
+        ).annotate(
+            sessions=Count('id'),
+            present=Count('id', filter=Q(is_present=True)),
+            late=Count('id', filter=Q(is_late=True)),
+            absent=Count('id', filter=Q(is_absent=True)),
+        ).order_by()
+
+    #? for_class id -> (college id, department id)
+    classes = {}
+
+    for row in rows:
+        classes[row['for_class']] = (row['for_class__college'],
+                                     row['for_class__department'])
+        counts[(row['student'], row['for_class'], row['month'])] = [
+            row['sessions'],
+            row['present'],
+            row['late'],
+            row['absent'],
+        ]
+
+    #? Sheets hold a whole Class for a day, records are decoded here
+    class_months = {(for_class, month) for _, for_class, month in buckets}
+    sheets = AttendanceSheetModel.objects.filter(
+        _class_month_condition(class_months, 'date')).annotate(
+            college=F('for_class__college'),
+            department=F('for_class__department'))
+
+    for sheet in sheets:
+        classes[sheet.for_class_id] = (sheet.college, sheet.department)
+        for record in sheet.get_records():
+            key = (record['student'], sheet.for_class_id,
+                   get_month(sheet.date))
+            if key not in buckets:
+                continue
+
+            count = counts.setdefault(key, [0, 0, 0, 0])
+            count[0] += 1
+            count[1] += record['is_present']
+            count[2] += record['is_late']
+            count[3] += record['is_absent']
+
+    stats = [
+        AttendanceStatModel(
+            student_id=student,
+            for_class_id=for_class,
+            college_id=classes[for_class][0],
+            department_id=classes[for_class][1],
+            month=month,
+            sessions=sessions,
+            present=present,
+            late=late,
+            absent=absent,
+        ) for (student, for_class, month), (sessions, present, late,
+                                            absent) in counts.items()
+    ]
+
+    #! Note: unique_fields and update_fields are passed as columns, hence *_id
+    AttendanceStatModel.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=['student_id', 'for_class_id', 'month'],
+        update_fields=[
+            'college_id',
+            'department_id',
+            'sessions',
+            'present',
+            'late',
+            'absent',
+        ],
+    )
+
+    #? buckets left without any Attendance are removed
+    emptied = buckets - set(counts)
+    if emptied:
+        AttendanceStatModel.objects.filter(
+            _bucket_condition(emptied, 'month', _month_is)).delete()
+
+
+def refresh_class_stats(class_months):
+    '''
+        Recomputes the monthly stats of every Student of given
+        (for_class id, month) pairs, e.g. after Sheets are recorded
+
+        Students dropped from a Sheet recorded again are refreshed too,
+        from their existing stats.
+    '''
+    class_months = set(class_months)
+    if not class_months:
+        return
+
+    keys = set()
+
+    for sheet in AttendanceSheetModel.objects.filter(
+            _class_month_condition(class_months,
+                                   'date')).only('for_class', 'date',
+                                                 'roster'):
+        month = get_month(sheet.date)
+        keys.update((student, sheet.for_class_id, month)
+                    for student in sheet.get_students())
+
+    for student, for_class, date in AttendanceModel.objects.filter(
+            _class_month_condition(class_months, 'date')).values_list(
+                'student', 'for_class', 'date').distinct():
+        keys.add((student, for_class, get_month(date)))
+
+    condition = Q()
+    for for_class, month in class_months:
+        condition |= Q(for_class_id=for_class, month=month)
+
+    keys.update(
+        AttendanceStatModel.objects.filter(condition).values_list(
+            'student', 'for_class', 'month'))
+
+    #? rosters may still hold Students deleted since
+    students = set(
+        StudentModel.objects.filter(
+            id__in={student
+                    for student, _, _ in keys}).values_list('id', flat=True))
+
+    refresh_stats(key for key in keys if key[0] in students)
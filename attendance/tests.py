@@ -1,3 +1,645 @@
-from django.test import TestCase
+import datetime
+import json
+from importlib import import_module
+from unittest import skipUnless
 
-# Create your tests here.
+from dateutil.relativedelta import relativedelta
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from classes.models import ClassModel
+from student.models import StudentModel
+
+from . import models, partitions
+from .stats import get_month
+
+User = get_user_model()
+
+
+class TestModels(APITestCase):
+    '''
+        Test Case to test Attendance models
+    '''
+
+    def test_flags_roundtrip(self):
+        flags = [True, False, False, True, True, False, True, False, True]
+        packed = models.pack_flags(flags)
+
+        self.assertEqual(len(packed), 2)
+        self.assertEqual(models.unpack_flags(packed, len(flags)), flags)
+
+    def test_ids_roundtrip(self):
+        ids = [1, 42, 2**40]
+
+        self.assertEqual(models.unpack_ids(models.pack_ids(ids)), ids)
+
+
+class TestAttendanceSheetViews(APITestCase):
+    '''
+        Test Case to test Attendance Sheet views
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            teacher=self.teacher,
+        )
+        self.students = [
+            StudentModel.objects.create(
+                first_name=f'Test{iter}',
+                last_name='Student',
+            ) for iter in range(3)
+        ]
+        self.for_class.student.add(*self.students)
+
+        self.client.force_authenticate(user=self.teacher)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def record(self, present, late=()):
+        data = [{
+            'student': student.id,
+            'for_class': self.for_class.id,
+            'date': '2022-10-03',
+            'is_present': student in present,
+            'is_late': student in late,
+        } for student in self.students]
+
+        return self.client.post(
+            reverse('attendance-sheet-list-create'),
+            data,
+            format='json',
+        )
+
+    def test_AttendanceSheetCreate(self):
+        '''
+            Test recording Attendances in a single Sheet
+        '''
+        resp = self.record(
+            present=self.students[:2],
+            late=self.students[1:2],
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(models.AttendanceSheetModel.objects.count(), 1)
+        self.assertEqual(
+            [(item['is_present'], item['is_absent'], item['is_late'])
+             for item in resp.data],
+            [(True, False, False), (True, False, True), (False, True, False)],
+        )
+
+    def test_AttendanceSheetCreate_replaces(self):
+        '''
+            Test recording the same Sheet again replaces it
+        '''
+        self.record(present=self.students)
+        self.record(present=[])
+
+        resp = self.client.get(reverse('attendance-sheet-list-create'))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(models.AttendanceSheetModel.objects.count(), 1)
+        self.assertEqual(len(resp.data['results']), len(self.students))
+        self.assertFalse(
+            any(item['is_present'] for item in resp.data['results']))
+
+    def test_AttendanceSheetCreate_not_enrolled(self):
+        '''
+            Test recording Attendance of a Student not in the Class
+        '''
+        outsider = StudentModel.objects.create(
+            first_name='Out',
+            last_name='Sider',
+        )
+        resp = self.client.post(
+            reverse('attendance-sheet-list-create'),
+            [{
+                'student': outsider.id,
+                'for_class': self.for_class.id,
+                'date': '2022-10-03',
+                'is_present': True,
+            }],
+            format='json',
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(models.AttendanceSheetModel.objects.count(), 0)
+
+
+class TestAttendanceRollCallViews(APITestCase):
+    '''
+        Test Case to test Attendance Roll Call views
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            teacher=self.teacher,
+        )
+        self.students = [
+            StudentModel.objects.create(
+                first_name=f'Test{iter}',
+                last_name='Student',
+            ) for iter in range(4)
+        ]
+        self.for_class.student.add(*self.students)
+
+        self.client.force_authenticate(user=self.teacher)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def roll_call(self, present, late=()):
+        return self.client.post(
+            reverse('attendance-roll-call'),
+            {
+                'for_class': self.for_class.id,
+                'date': '2022-10-03',
+                'present': [student.id for student in present],
+                'late': [student.id for student in late],
+            },
+            format='json',
+        )
+
+    def test_AttendanceRollCall(self):
+        '''
+            Test Roll Call marks every Student on the roster
+        '''
+        resp = self.roll_call(
+            present=self.students[:2],
+            late=self.students[2:3],
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            models.AttendanceModel.objects.count(),
+            len(self.students),
+        )
+        self.assertEqual(
+            models.AttendanceModel.objects.filter(is_present=True).count(),
+            3,
+        )
+        self.assertTrue(
+            models.AttendanceModel.objects.get(
+                student=self.students[3]).is_absent)
+
+    def test_AttendanceRollCall_idempotent(self):
+        '''
+            Test taking the same Roll Call again updates the Attendances
+        '''
+        self.roll_call(present=self.students)
+        resp = self.roll_call(present=self.students[:1])
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            models.AttendanceModel.objects.count(),
+            len(self.students),
+        )
+        self.assertEqual(
+            models.AttendanceModel.objects.filter(is_present=True).count(),
+            1,
+        )
+
+    def test_AttendanceRollCall_constant_queries(self):
+        '''
+            Test Roll Call runs same queries regardless of roster size
+        '''
+        self.roll_call(present=self.students)
+
+        more_students = [
+            StudentModel.objects.create(
+                first_name=f'More{iter}',
+                last_name='Student',
+            ) for iter in range(10)
+        ]
+        self.for_class.student.add(*more_students)
+
+        #? roster, upsert, stats aggregate, sheets and stats upsert
+        with self.assertNumQueries(5):
+            self.client.force_authenticate(user=self.teacher)
+            self.roll_call(present=self.students + more_students)
+
+    def test_AttendanceRollCall_not_enrolled(self):
+        '''
+            Test Roll Call with a Student not in the Class
+        '''
+        outsider = StudentModel.objects.create(
+            first_name='Out',
+            last_name='Sider',
+        )
+        resp = self.roll_call(present=[outsider])
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(models.AttendanceModel.objects.count(), 0)
+
+
+class TestAttendanceStatViews(APITestCase):
+    '''
+        Test Case to test Attendance Stats views
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            teacher=self.teacher,
+        )
+        self.student = StudentModel.objects.create(
+            first_name='Test',
+            last_name='Student',
+        )
+        self.for_class.student.add(self.student)
+
+        self.client.force_authenticate(user=self.teacher)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def add_attendance(self, date, is_present):
+        return self.client.post(
+            reverse('attendance-list-create'),
+            {
+                'student': self.student.id,
+                'for_class': self.for_class.id,
+                'date': date,
+                'is_present': is_present,
+                'is_absent': not is_present,
+            },
+            format='json',
+        )
+
+    def get_stats(self, **params):
+        resp = self.client.get(reverse('attendance-stats'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return resp.data['results']
+
+    def test_AttendanceStats(self):
+        '''
+            Test Stats follow Attendance writes
+        '''
+        self.add_attendance('2022-10-03', True)
+        self.add_attendance('2022-10-04', False)
+        self.add_attendance('2022-11-01', True)
+
+        stats = self.get_stats(for_class=self.for_class.id)
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['sessions'], 3)
+        self.assertEqual(stats[0]['present'], 2)
+        self.assertEqual(stats[0]['absent'], 1)
+        self.assertEqual(stats[0]['percentage'], 66.67)
+
+        stats = self.get_stats(date_after='2022-11-01')
+
+        self.assertEqual(stats[0]['sessions'], 1)
+
+    def test_AttendanceStats_delete(self):
+        '''
+            Test Stats are removed with the last Attendance of a month
+        '''
+        attendance = self.add_attendance('2022-10-03', True).data
+
+        resp = self.client.delete(
+            reverse(
+                'attendance-retrieve-update-destroy',
+                kwargs={'pk': attendance['id']},
+            ))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(models.AttendanceStatModel.objects.count(), 0)
+
+    def test_AttendanceStats_roll_call(self):
+        '''
+            Test Stats follow Roll Calls taken again
+        '''
+        for present in [[self.student.id], []]:
+            self.client.post(
+                reverse('attendance-roll-call'),
+                {
+                    'for_class': self.for_class.id,
+                    'date': '2022-10-03',
+                    'present': present,
+                },
+                format='json',
+            )
+
+        stats = self.get_stats()
+
+        self.assertEqual(stats[0]['sessions'], 1)
+        self.assertEqual(stats[0]['present'], 0)
+
+    def test_AttendanceStats_sheets(self):
+        '''
+            Test Stats follow Attendance Sheets, recorded again too
+        '''
+        other = StudentModel.objects.create(
+            first_name='Other',
+            last_name='Student',
+        )
+        self.for_class.student.add(other)
+
+        for records in [[(self.student, True), (other, False)],
+                        [(self.student, False)]]:
+            resp = self.client.post(
+                reverse('attendance-sheet-list-create'),
+                [{
+                    'student': student.id,
+                    'for_class': self.for_class.id,
+                    'date': '2022-10-03',
+                    'is_present': is_present,
+                    'is_late': False,
+                } for student, is_present in records],
+                format='json',
+            )
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        self.add_attendance('2022-10-04', True)
+
+        stats = self.get_stats(for_class=self.for_class.id)
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['student'], self.student.id)
+        self.assertEqual(stats[0]['sessions'], 2)
+        self.assertEqual(stats[0]['present'], 1)
+        self.assertEqual(stats[0]['absent'], 1)
+
+    def test_AttendanceStats_backfill(self):
+        '''
+            Test the Stats backfill counts Attendances and Attendance Sheets
+        '''
+        backfill = import_module(
+            'attendance.migrations.0005_attendancestatmodel')
+
+        resp = self.client.post(
+            reverse('attendance-sheet-list-create'),
+            [{
+                'student': self.student.id,
+                'for_class': self.for_class.id,
+                'date': '2022-10-03',
+                'is_present': False,
+                'is_late': False,
+            }],
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        self.add_attendance('2022-10-04', True)
+
+        models.AttendanceStatModel.objects.all().delete()
+        backfill.build_attendance_stats(apps, None)
+
+        stats = self.get_stats(for_class=self.for_class.id)
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['sessions'], 2)
+        self.assertEqual(stats[0]['present'], 1)
+        self.assertEqual(stats[0]['absent'], 1)
+
+
+class TestAttendanceExportViews(APITestCase):
+    '''
+        Test Case to test Attendance export view
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            teacher=self.teacher,
+        )
+        self.students = [
+            StudentModel.objects.create(
+                first_name=f'Test{iter}',
+                last_name='Student',
+            ) for iter in range(3)
+        ]
+        for student in self.students:
+            models.AttendanceModel.objects.create(
+                student=student,
+                for_class=self.for_class,
+                date='2022-10-03',
+                is_present=True,
+                is_absent=False,
+                is_late=student == self.students[0],
+            )
+
+        self.client.force_authenticate(user=self.teacher)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def export(self, params):
+        resp = self.client.get(reverse('attendance-export'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return b''.join(resp.streaming_content).decode()
+
+    def test_AttendanceExport_csv(self):
+        '''
+            Test exporting Attendances as CSV
+        '''
+        lines = self.export({}).splitlines()
+
+        self.assertEqual(lines[0].split(',')[:4],
+                         ['id', 'date', 'student', 'first_name'])
+        self.assertEqual(len(lines), 4)
+
+    def test_AttendanceExport_ndjson(self):
+        '''
+            Test exporting Attendances as NDJSON with filters
+        '''
+        lines = self.export({
+            'format': 'ndjson',
+            'is_late': True,
+        }).splitlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['first_name'], 'Test0')
+
+    def test_AttendanceExport_search(self):
+        '''
+            Test exporting Attendances matching search
+        '''
+        lines = self.export({'format': 'ndjson', 'search': 'test2'})
+
+        self.assertEqual(
+            [json.loads(line)['student'] for line in lines.splitlines()],
+            [self.students[2].id],
+        )
+
+    def test_AttendanceExport_sheets(self):
+        '''
+            Test exporting Attendances recorded on Attendance Sheets
+        '''
+        sheet = models.AttendanceSheetModel(
+            for_class=self.for_class,
+            date='2022-10-04',
+        )
+        sheet.set_records([
+            (self.students[0].id, True, False),
+            (self.students[1].id, True, True),
+            (self.students[2].id, False, False),
+        ])
+        sheet.save()
+
+        lines = self.export({'format': 'ndjson'}).splitlines()
+        self.assertEqual(len(lines), 6)
+
+        rows = [
+            json.loads(line) for line in self.export({
+                'format': 'ndjson',
+                'date_after': '2022-10-04',
+                'is_late': True,
+                'search': 'test1',
+            }).splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertIsNone(rows[0]['id'])
+        self.assertEqual(rows[0]['student'], self.students[1].id)
+        self.assertEqual(rows[0]['first_name'], 'Test1')
+        self.assertEqual(rows[0]['class_code'], 'TC-1')
+        self.assertTrue(rows[0]['is_present'])
+
+    def test_AttendanceExport_principal(self):
+        '''
+            Test exporting Attendances is not allowed to a Principal
+        '''
+        principal = User.objects.create(
+            email='principal@mail.com',
+            first_name='Test',
+            last_name='Principal',
+            gender='Female',
+            is_principal=True,
+        )
+        self.client.force_authenticate(user=principal)
+
+        resp = self.client.get(reverse('attendance-export'))
+
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestPartitions(APITestCase):
+    '''
+        Test Case to test Attendance partitioning helpers
+    '''
+
+    def test_partition_months(self):
+        months = list(
+            partitions.iter_months(
+                datetime.date(2022, 11, 15),
+                datetime.date(2023, 2, 1),
+            ))
+
+        self.assertEqual(months, [
+            datetime.date(2022, 11, 1),
+            datetime.date(2022, 12, 1),
+            datetime.date(2023, 1, 1),
+            datetime.date(2023, 2, 1),
+        ])
+
+    def test_partition_names(self):
+        name = partitions.get_partition_name(datetime.date(2023, 2, 1))
+
+        self.assertEqual(name, 'attendance_attendancemodel_y2023m02')
+        self.assertEqual(
+            partitions.get_partition_month(name),
+            datetime.date(2023, 2, 1),
+        )
+        self.assertIsNone(
+            partitions.get_partition_month(
+                'attendance_attendancemodel_default'))
+
+    def test_command_requires_postgres(self):
+        with self.assertRaises(CommandError):
+            call_command('attendance_partitions', 'create')
+
+    @skipUnless(connection.vendor == 'postgresql',
+                'partitioning is only supported on PostgreSQL')
+    def test_create_moves_default_rows(self):
+        '''
+            Test creating a partition moves its rows out of the default one
+        '''
+        quote = connection.ops.quote_name
+        partitions.convert(0)
+
+        month = get_month(timezone.localdate()) + relativedelta(months=6)
+        models.AttendanceModel.objects.create(date=month)
+
+        partitions.create_partitions([month])
+        name = partitions.get_partition_name(month)
+
+        self.assertIn(name, partitions.get_partitions())
+        self.assertIn(partitions.get_default_partition_name(),
+                      partitions.get_partitions())
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {quote(name)}')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+            cursor.execute('SELECT COUNT(*) FROM '
+                           f'{quote(partitions.get_default_partition_name())}')
+            self.assertEqual(cursor.fetchone()[0], 0)
@@ -1,4 +1,6 @@
+import itertools
 import logging
+from types import SimpleNamespace
 from urllib import response
 
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
@@ -6,18 +8,28 @@ from drf_spectacular.types import OpenApiTypes
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 
 from django_filters.rest_framework import DjangoFilterBackend
 
 from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.db.models import Sum
 
 from . import serializers, models
-from .filters import AttendanceFilter
+from .filters import AttendanceFilter, AttendanceSheetFilter, AttendanceStatFilter
+from .stats import get_stat_key, refresh_stats
 
-from user.permissions import UserIsAdmin, UserIsTeacher
+from student.models import StudentModel
+
+from user.permissions import UserIsAdmin, UserIsPrincipal, UserIsHOD, UserIsTeacher
 
 from api.paginator import StandardPagination
+from api.renderers import CSVRenderer, NDJSONRenderer, stream_csv, stream_ndjson
+from api.query_planner import QueryPlanMixin
+from api.search import TrigramSearchFilter
+
+from authlogic.authentication import AuthenticationPolicyMixin
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +72,8 @@ logger = logging.getLogger(__name__)
         'Returns list of all Attendances.\n\nOrdering:\n\n- default: -created_on\n\n- allowed: created_on, -created_on'
     ),
 )
-class AttendanceListCreateAPIView(generics.ListCreateAPIView):
+class AttendanceListCreateAPIView(AuthenticationPolicyMixin, QueryPlanMixin,
+                                  generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -69,6 +82,7 @@ class AttendanceListCreateAPIView(generics.ListCreateAPIView):
 
         Accessible by: Admin, Teacher
     '''
+    authentication_policy = 'machine'
     queryset = models.AttendanceModel.objects.all()
     serializer_class = serializers.AttendanceFullSerializer
     permission_classes = [
@@ -78,16 +92,16 @@ class AttendanceListCreateAPIView(generics.ListCreateAPIView):
     filter_backends = [
         OrderingFilter,
         DjangoFilterBackend,
-        SearchFilter,
+        TrigramSearchFilter,
     ]
     ordering_fields = ['created_on']
     ordering = '-created_on'
     search_fields = [
-        '$student__first_name',
-        '$student__last_name',
-        '$student__university_roll_no',
-        '$student__class_roll_no',
-    ]  #? fuzzy search using regex
+        'student__first_name',
+        'student__last_name',
+        'student__university_roll_no',
+        'student__class_roll_no',
+    ]  #? trigram indexed search
     filterset_class = AttendanceFilter
 
     #? create a new Attendance Object
@@ -178,7 +192,9 @@ class AttendanceListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class AttendanceRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class AttendanceRetrieveUpdateDestroyAPIView(AuthenticationPolicyMixin,
+                                             QueryPlanMixin,
+                                             generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -192,8 +208,10 @@ class AttendanceRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
         
         Accessible by: Admin, Teacher
     '''
+    authentication_policy = 'machine'
     queryset = models.AttendanceModel.objects.all()
     serializer_class = serializers.AttendanceSerializer
+    plan_serializer_class = serializers.AttendanceFullSerializer
     permission_classes = [
         permissions.IsAuthenticated & (UserIsAdmin | UserIsTeacher)
     ]
@@ -202,7 +220,8 @@ class AttendanceRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single Attendance
     def get(self, request, *args, **kwargs):
         attendance = self.get_object()
-        serializer = serializers.AttendanceFullSerializer(attendance)
+        serializer = serializers.AttendanceFullSerializer(
+            attendance, context={'request': request})
         return Response(serializer.data)
 
     #? Update Attendance of given Id
@@ -224,6 +243,7 @@ class AttendanceRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? Delete Attendance of given Id
     def delete(self, request, *args, **kwargs):
         attendance = self.get_object()
+        stat_key = get_stat_key(attendance)
 
         #? unlink class from attendance
         if attendance.for_class:
@@ -234,6 +254,7 @@ class AttendanceRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
             attendance.student.attendance_student.remove(attendance)
 
         attendance.delete()
+        refresh_stats([stat_key])
 
         response = {'detail': ['Attendance Deleted Successfully']}
         logger.info(response)
@@ -259,7 +280,9 @@ class AttendanceRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
             ),
         },
         description='Creates a new Attendance Object in Bulk.'), )
-class AttendanceBulkCreateAPIView(generics.CreateAPIView):
+class AttendanceBulkCreateAPIView(AuthenticationPolicyMixin,
+                                  generics.CreateAPIView):
+    authentication_policy = 'machine'
     queryset = models.AttendanceModel.objects.all()
     serializer_class = serializers.AttendanceBulkSerializer
     permission_classes = [
@@ -288,3 +311,397 @@ class AttendanceBulkCreateAPIView(generics.CreateAPIView):
         logger.info(response)
 
         return Response(response, status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        request=serializers.AttendanceSheetSerializer(many=True),
+        responses={
+            #? 201
+            status.HTTP_201_CREATED:
+            OpenApiResponse(
+                description='Attendance Recorded Successfully',
+                response=serializers.AttendanceSheetSerializer(many=True),
+            ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Records Attendances in compact Sheets, one per Class per date. Recording a Sheet again replaces it.'
+    ),
+    get=extend_schema(
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(
+                description='Attendance List',
+                response=serializers.AttendanceSheetSerializer(many=True),
+            ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Returns list of Attendances recorded in compact Sheets, expanded per Student. Pagination is per Sheet.\n\nFilters:\n\n- for_class\n\n- date (date_after, date_before)\n\nOrdering:\n\n- default: -date\n\n- allowed: date, -date'
+    ),
+)
+class AttendanceSheetListCreateAPIView(AuthenticationPolicyMixin,
+                                       generics.ListCreateAPIView):
+    '''
+        Allowed methods: GET, POST
+
+        GET: Returns list of Attendances recorded in compact Sheets
+        POST: Records Attendances in compact Sheets
+
+        Note: Attendances are stored as one Sheet per Class per date,
+        but are read and written in the per Student Attendance shape
+
+        Accessible by: Admin, Teacher
+    '''
+    authentication_policy = 'machine'
+    queryset = models.AttendanceSheetModel.objects.all()
+    serializer_class = serializers.AttendanceSheetSerializer
+    permission_classes = [
+        permissions.IsAuthenticated & (UserIsAdmin | UserIsTeacher)
+    ]
+    pagination_class = StandardPagination
+    filter_backends = [
+        OrderingFilter,
+        DjangoFilterBackend,
+    ]
+    ordering_fields = ['date']
+    ordering = '-date'
+    filterset_class = AttendanceSheetFilter
+
+    #? record Attendances in Sheets
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            serializer.save()
+
+        except Exception as ex:
+            logger.error(str(ex))
+
+            return Response({'detail': str(ex)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = serializer.data
+        logger.info('Attendance Recorded Successfully')
+
+        return Response(response, status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        request=serializers.AttendanceRollCallSerializer,
+        responses={
+            #? 201
+            status.HTTP_201_CREATED:
+            OpenApiResponse(
+                description='Roll Call Taken Successfully',
+                response=serializers.AttendanceRollCallSerializer,
+            ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Takes the Roll Call of a Class for a date. Every Student on the Class roster not in present or late is marked absent. Taking the same Roll Call again updates it.\n\nAccessible by: Admin, Teacher'
+    ), )
+class AttendanceRollCallAPIView(AuthenticationPolicyMixin,
+                                generics.CreateAPIView):
+    '''
+        Allowed methods: POST
+
+        POST: Takes the Roll Call of a Class for a date
+
+        Note: Roll Call is idempotent, retrying it updates the same Attendances
+
+        Accessible by: Admin, Teacher
+    '''
+    authentication_policy = 'machine'
+    queryset = models.AttendanceModel.objects.all()
+    serializer_class = serializers.AttendanceRollCallSerializer
+    permission_classes = [
+        permissions.IsAuthenticated & (UserIsAdmin | UserIsTeacher)
+    ]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            serializer.save()
+
+        except Exception as ex:
+            logger.error(str(ex))
+
+            return Response({'detail': str(ex)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = serializer.data
+        logger.info('Roll Call Taken Successfully')
+
+        return Response(response, status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(
+                description='Attendance Stats',
+                response=serializers.AttendanceStatSerializer,
+            ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Returns Attendance Stats of every Student in a Class, summed over the months in range.\n\nFilters:\n\n- for_class\n\n- college\n\n- department\n\n- date (date_after, date_before), matched by month\n\nAccessible by: Admin, Principal, HOD, Teacher'
+    ), )
+class AttendanceStatListAPIView(AuthenticationPolicyMixin,
+                                generics.ListAPIView):
+    '''
+        Allowed methods: GET
+
+        GET: Returns Attendance Stats of every Student in a Class
+
+        Note: Stats are read from monthly aggregates maintained on every
+        Attendance and Attendance Sheet write, so date filters are matched
+        by month
+
+        Accessible by: Admin, Principal, HOD, Teacher
+    '''
+    authentication_policy = 'machine'
+    queryset = models.AttendanceStatModel.objects.all()
+    serializer_class = serializers.AttendanceStatSerializer
+    permission_classes = [
+        permissions.IsAuthenticated &
+        (UserIsAdmin | UserIsPrincipal | UserIsHOD | UserIsTeacher)
+    ]
+    pagination_class = StandardPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = AttendanceStatFilter
+
+    #? sum monthly stats of the filtered months
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        return queryset.values('student', 'for_class').annotate(
+            sessions=Sum('sessions'),
+            present=Sum('present'),
+            late=Sum('late'),
+            absent=Sum('absent'),
+        ).order_by('for_class', 'student')
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={
+            #? 200
+            (status.HTTP_200_OK, 'text/csv'):
+            OpenApiResponse(
+                description='Attendance Export',
+                response=OpenApiTypes.STR,
+            ),
+            (status.HTTP_200_OK, 'application/x-ndjson'):
+            OpenApiResponse(
+                description='Attendance Export',
+                response=OpenApiTypes.STR,
+            ),
+        },
+        description=
+        'Streams all Attendances matching the filters as CSV (default, `?format=csv`) or newline delimited JSON (`?format=ndjson`), Attendances recorded on Attendance Sheets follow, without id.\n\nFilters and search are the same as of Attendance list.\n\nAccessible by: Admin, Teacher'
+    ), )
+class AttendanceExportAPIView(AuthenticationPolicyMixin, generics.ListAPIView):
+    '''
+        Allowed methods: GET
+
+        GET: Streams Attendances matching the filters as CSV or NDJSON,
+        then the records of Attendance Sheets matching them
+
+        Note: rows are read as flat values through a server side cursor,
+        memory use stays constant whatever the number of rows
+
+        Accessible by: Admin, Teacher
+    '''
+    authentication_policy = 'machine'
+    queryset = models.AttendanceModel.objects.all()
+    #? same as Attendance list, the export holds the same data
+    permission_classes = [
+        permissions.IsAuthenticated & (UserIsAdmin | UserIsTeacher)
+    ]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    filter_backends = [
+        OrderingFilter,
+        DjangoFilterBackend,
+        TrigramSearchFilter,
+    ]
+    ordering_fields = ['created_on']
+    ordering = '-created_on'
+    search_fields = AttendanceListCreateAPIView.search_fields
+    filterset_class = AttendanceFilter
+
+    #? exported column name to the field it is read from
+    export_fields = {
+        'id': 'id',
+        'date': 'date',
+        'student': 'student',
+        'first_name': 'student__first_name',
+        'last_name': 'student__last_name',
+        'university_roll_no': 'student__university_roll_no',
+        'class_roll_no': 'student__class_roll_no',
+        'for_class': 'for_class',
+        'class_code': 'for_class__code',
+        'is_present': 'is_present',
+        'is_late': 'is_late',
+        'is_absent': 'is_absent',
+        'created_on': 'created_on',
+    }
+
+    def get_sheet_rows(self):
+        '''
+            Yields export rows of the records of Attendance Sheets
+            matching the filters
+
+            Sheets are read in batches of about
+            settings.ATTENDANCE_EXPORT_CHUNK_SIZE records, Students of a
+            batch are read (and searched) in one query
+        '''
+        filterset = AttendanceFilter(
+            self.request.query_params,
+            queryset=models.AttendanceModel.objects.none(),
+        )
+        filterset.is_valid()
+
+        #? record level filters, e.g. {'is_late': True}
+        flags = {
+            name: value
+            for name, value in filterset.form.cleaned_data.items()
+            if name.startswith('is_') and value is not None
+        }
+
+        sheets = AttendanceSheetFilter(
+            self.request.query_params,
+            queryset=models.AttendanceSheetModel.objects.order_by(
+                '-created_on'),
+        ).qs.values_list(
+            'date',
+            'for_class',
+            'for_class__code',
+            'roster',
+            'present',
+            'late',
+            'created_on',
+        ).iterator(chunk_size=settings.ATTENDANCE_EXPORT_CHUNK_SIZE)
+
+        batch = []
+        size = 0
+        for sheet in sheets:
+            batch.append(sheet)
+            #? roster holds 8 bytes per Student
+            size += len(sheet[3]) // 8
+
+            if size >= settings.ATTENDANCE_EXPORT_CHUNK_SIZE:
+                yield from self.get_sheet_batch_rows(batch, flags)
+                batch = []
+                size = 0
+
+        yield from self.get_sheet_batch_rows(batch, flags)
+
+    def get_sheet_batch_rows(self, sheets, flags):
+        records = []
+        for date, for_class, class_code, roster, present, late, created_on in sheets:
+            students = models.unpack_ids(roster)
+
+            for student, is_present, is_late in zip(
+                    students,
+                    models.unpack_flags(present, len(students)),
+                    models.unpack_flags(late, len(students)),
+            ):
+                record = {
+                    'is_present': is_present,
+                    'is_late': is_late,
+                    'is_absent': not is_present,
+                }
+                if any(record[name] != value for name, value in flags.items()):
+                    continue
+
+                records.append(
+                    (date, student, for_class, class_code, record, created_on))
+
+        if not records:
+            return
+
+        #? search applies to the Students, fields without student__
+        students = TrigramSearchFilter().filter_queryset(
+            self.request,
+            StudentModel.objects.filter(
+                id__in={record[1]
+                        for record in records}),
+            SimpleNamespace(search_fields=[
+                field.removeprefix('student__') for field in self.search_fields
+            ]),
+        ).values_list(
+            'id',
+            'first_name',
+            'last_name',
+            'university_roll_no',
+            'class_roll_no',
+        )
+        details = {student[0]: student[1:] for student in students}
+
+        #? same columns as export_fields, Sheet records have no id
+        for date, student, for_class, class_code, record, created_on in records:
+            if student not in details:
+                continue
+
+            yield (
+                None,
+                date,
+                student,
+                *details[student],
+                for_class,
+                class_code,
+                record['is_present'],
+                record['is_late'],
+                record['is_absent'],
+                created_on,
+            )
+
+    def get(self, request, *args, **kwargs):
+        rows = itertools.chain(
+            self.filter_queryset(self.get_queryset()).values_list(
+                *self.export_fields.values()).iterator(
+                    chunk_size=settings.ATTENDANCE_EXPORT_CHUNK_SIZE),
+            self.get_sheet_rows(),
+        )
+
+        renderer = request.accepted_renderer
+        stream = stream_ndjson if renderer.format == 'ndjson' else stream_csv
+
+        response = StreamingHttpResponse(
+            stream(list(self.export_fields), rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="attendance.{renderer.format}"')
+
+        return response
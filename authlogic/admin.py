@@ -1,3 +1,23 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ApiKeyModel
+
+
+@admin.register(ApiKeyModel)
+class ApiKeyModelAdmin(admin.ModelAdmin):
+    '''Admin View for ApiKeyModel'''
+
+    list_display = [
+        'name',
+        'prefix',
+        'user',
+        'created_on',
+        'last_used_on',
+        'revoked_on',
+    ]
+    list_filter = [
+        'revoked_on',
+    ]
+    ordering = [
+        '-created_on',
+    ]
@@ -0,0 +1,220 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from .models import ApiKeyModel
+
+#? keys look like upk_<prefix>_<secret>, prefix identifies the key
+API_KEY_PREFIX = 'upk'
+
+
+def hash_secret(secret):
+    '''
+        Returns keyed hash (HMAC-SHA256) of the secret part of a key
+
+        Note: keys are random, so unlike passwords they need no slow hash
+    '''
+    return hmac.new(
+        settings.API_KEY_SECRET.encode(),
+        secret.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def generate_api_key():
+    '''
+        returns:
+            - (key, prefix, hashed secret) of a new key
+    '''
+    prefix = secrets.token_hex(6)
+    secret = secrets.token_urlsafe(32)
+
+    return f'{API_KEY_PREFIX}_{prefix}_{secret}', prefix, hash_secret(secret)
+
+
+def parse_api_key(key):
+    '''
+        returns:
+            - (prefix, secret) of given key, None if it is malformed
+    '''
+    parts = key.split('_', 2)
+    if len(parts) != 3 or parts[0] != API_KEY_PREFIX:
+        return None
+
+    return parts[1], parts[2]
+
+
+def create_api_key(name, user, roles=(), colleges=()):
+    '''
+        Creates an API key for given User
+
+        returns:
+            - (ApiKeyModel, key), the key is not stored and can't be
+              shown again
+    '''
+    key, prefix, hashed_key = generate_api_key()
+
+    with transaction.atomic():
+        api_key = ApiKeyModel.objects.create(
+            name=name,
+            prefix=prefix,
+            hashed_key=hashed_key,
+            user=user,
+            roles=list(roles),
+        )
+        api_key.college.set(colleges)
+
+    return api_key, key
+
+
+def get_cache_key(prefix):
+    return f'api-key:{prefix}'
+
+
+def get_api_key(prefix):
+    '''
+        Returns dict of id, hashed_key, user_id, roles and college_ids of
+        the active key of given prefix, None if there is none
+
+        Note: cached for settings.API_KEY_CACHE_TIMEOUT seconds, changes
+        to keys drop them from the cache
+    '''
+    key = get_cache_key(prefix)
+
+    data = cache.get(key)
+    if data is None:
+        api_key = ApiKeyModel.objects.filter(
+            prefix=prefix,
+            revoked_on__isnull=True,
+            user__is_active=True,
+        ).prefetch_related('college').first()
+
+        #? unknown prefixes are cached too, so guessing never reaches the db
+        data = {'id': None}
+        if api_key is not None:
+            data = {
+                'id': api_key.id,
+                'hashed_key': api_key.hashed_key,
+                'user_id': api_key.user_id,
+                'roles': api_key.roles,
+                'college_ids':
+                [college.id for college in api_key.college.all()],
+            }
+
+        cache.set(key, data, settings.API_KEY_CACHE_TIMEOUT)
+
+    return data if data['id'] is not None else None
+
+
+def verify_api_key(key):
+    '''
+        Returns data of given key (see get_api_key), None if it is not
+        a valid active key
+    '''
+    parsed = parse_api_key(key)
+    if parsed is None:
+        return None
+
+    data = get_api_key(parsed[0])
+    if data is None or not hmac.compare_digest(data['hashed_key'],
+                                               hash_secret(parsed[1])):
+        return None
+
+    return data
+
+
+class LastUsedTracker:
+    '''
+        Records when keys were last used in memory, written to the
+        database at most every settings.API_KEY_LAST_USED_INTERVAL
+        seconds in one query
+
+        Note: uses not written yet are lost if the process exits
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.used = {}
+        self.flushed_at = time.monotonic()
+
+    def record(self, key_id):
+        with self.lock:
+            self.used[key_id] = timezone.now()
+            due = (time.monotonic() - self.flushed_at >=
+                   settings.API_KEY_LAST_USED_INTERVAL)
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        '''
+            Writes recorded uses to the database
+
+            returns:
+                - count of keys updated
+        '''
+        with self.lock:
+            used, self.used = self.used, {}
+            self.flushed_at = time.monotonic()
+
+        if not used:
+            return 0
+
+        return ApiKeyModel.objects.bulk_update(
+            [
+                ApiKeyModel(id=key_id, last_used_on=last_used_on)
+                for key_id, last_used_on in used.items()
+            ],
+            ['last_used_on'],
+        )
+
+
+last_used = LastUsedTracker()
+
+
+def drop_cached(prefixes):
+    keys = [get_cache_key(prefix) for prefix in prefixes]
+
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _key_changed(instance, **kwargs):
+    drop_cached([instance.prefix])
+
+
+def _college_changed(instance, action, reverse, pk_set=None, **kwargs):
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        drop_cached([instance.prefix])
+    elif pk_set:
+        drop_cached(
+            ApiKeyModel.objects.filter(id__in=pk_set).values_list('prefix',
+                                                                  flat=True))
+
+
+def connect_signals():
+    '''
+        Drops keys from the cache when they change
+
+        Called once from AuthlogicConfig.ready
+    '''
+    post_save.connect(_key_changed, sender=ApiKeyModel, dispatch_uid='api-key')
+    post_delete.connect(_key_changed,
+                        sender=ApiKeyModel,
+                        dispatch_uid='api-key')
+    m2m_changed.connect(
+        _college_changed,
+        sender=ApiKeyModel.college.through,
+        dispatch_uid='api-key',
+    )
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AuthlogicConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authlogic'
+
+    def ready(self):
+        from . import api_keys, me, revocation
+
+        api_keys.connect_signals()
+        me.connect_signals()
+        revocation.connect_signals()
+
+        #? registers drf-spectacular extensions
+        from . import schema  # noqa: F401
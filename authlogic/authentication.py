@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from rest_framework import authentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from user.roles import ROLES, RoleScope, RolesMixin, get_user_roles
+
+from .api_keys import last_used, verify_api_key
+
+
+class ApiKeyUser(RolesMixin):
+    '''
+        User of a request authenticated with an API key, with the roles
+        of the key its User still holds and the Colleges of the key
+
+        Note: pk is the pk of the User owning the key, load the User by
+        pk where one is needed
+    '''
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, api_key, user_roles):
+        self.api_key = api_key
+        self.pk = self.id = api_key['user_id']
+        #? a key never has roles its User lost since it was created
+        self.roles = frozenset(api_key['roles']) & user_roles
+
+    def __str__(self):
+        return f'API Key {self.api_key["id"]}'
+
+    def get_role_scope(self):
+        return RoleScope(
+            user_id=self.pk,
+            roles=[role for role in ROLES if role in self.roles],
+            ids={
+                'college': self.api_key['college_ids'],
+                'department': [],
+                'class': [],
+            },
+        )
+
+
+class ApiKeyAuthentication(authentication.BaseAuthentication):
+    '''
+        Authenticates machine clients with an API key, sent as
+        "Authorization: Api-Key <key>"
+
+        Keys are checked against a keyed hash in a few microseconds,
+        unlike passwords of BasicAuthentication.
+    '''
+    keyword = 'Api-Key'
+
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].decode().lower() != self.keyword.lower():
+            return None
+
+        if len(header) != 2:
+            raise AuthenticationFailed('Invalid API Key header.')
+
+        api_key = verify_api_key(header[1].decode(errors='replace'))
+        if api_key is None:
+            raise AuthenticationFailed('Invalid API Key.')
+
+        user_roles = get_user_roles(api_key['user_id'])
+        if user_roles is None:
+            raise AuthenticationFailed('Invalid API Key.')
+
+        last_used.record(api_key['id'])
+
+        return ApiKeyUser(api_key, user_roles), api_key
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+def get_authentication_classes(policy):
+    '''
+        Returns authentication classes of given policy
+        (settings.AUTHENTICATION_POLICIES)
+    '''
+    return [
+        import_string(path)
+        for path in settings.AUTHENTICATION_POLICIES[policy]
+    ]
+
+
+class AuthenticationPolicyMixin:
+    '''
+        Mixin for Views to authenticate requests with the classes of an
+        authentication policy, e.g. 'machine' to accept API keys
+
+        usage:
+            class AttendanceListCreateAPIView(AuthenticationPolicyMixin, ...):
+                authentication_policy = 'machine'
+    '''
+    authentication_policy = 'default'
+
+    def get_authenticators(self):
+        return [
+            auth()
+            for auth in get_authentication_classes(self.authentication_policy)
+        ]
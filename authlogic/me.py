@@ -0,0 +1,132 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.signals import post_save, pre_delete
+from django.utils.http import parse_etags, quote_etag
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from college.models import CollegeModel
+from user.roles import get_token_version
+from user.serializers import UserSerializer
+
+User = get_user_model()
+
+
+def get_me_cache_key(user_id):
+    return f'auth-me:{user_id}'
+
+
+def get_etag(data):
+    '''
+        Returns strong ETag of given payload, a hash of its JSON
+    '''
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+
+    return quote_etag(hashlib.sha256(content).hexdigest())
+
+
+def load_me(user_id):
+    '''
+        Returns payload of given User, None if there is no such User
+
+        Colleges of the User and ids of their teachers are fetched in
+        bulk, one query per relation
+    '''
+    teachers = User.objects.only('id')
+
+    user = User.objects.select_related(
+        'administrated_college').prefetch_related(
+            'college',
+            'college_teacher',
+            Prefetch('college__teacher', queryset=teachers),
+            Prefetch('college_teacher__teacher', queryset=teachers),
+            Prefetch('administrated_college__teacher', queryset=teachers),
+        ).filter(pk=user_id).first()
+
+    if user is None:
+        return None
+
+    return UserSerializer(user).data
+
+
+def get_me(user_id):
+    '''
+        Returns dict of payload and ETag of given User, None if there is
+        no such User
+
+        Note: cached for settings.AUTH_ME_CACHE_TIMEOUT seconds under the
+        User's token version, so changes to the User, their roles or
+        their Colleges' members (see user.roles) are never served, other
+        changes to their Colleges drop it (see connect_signals)
+    '''
+    key = get_me_cache_key(user_id)
+    version = get_token_version(user_id)
+
+    if version is None:
+        return None
+
+    me = cache.get(key)
+    if me is not None and me['version'] == version:
+        return me
+
+    data = load_me(user_id)
+    if data is None:
+        return None
+
+    me = {'version': version, 'etag': get_etag(data), 'data': dict(data)}
+    cache.set(key, me, settings.AUTH_ME_CACHE_TIMEOUT)
+
+    return me
+
+
+def is_not_modified(request, etag):
+    '''
+        Returns whether If-None-Match header of given request matches etag
+
+        Note: weak comparison, as required for If-None-Match
+    '''
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+
+    return '*' in etags or etag in [tag.removeprefix('W/') for tag in etags]
+
+
+def drop_cached(user_ids):
+    keys = [get_me_cache_key(user_id) for user_id in user_ids]
+
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_member_ids(college):
+    member_ids = set(college.hod.values_list('id', flat=True))
+    member_ids.update(college.teacher.values_list('id', flat=True))
+
+    if college.principal_id is not None:
+        member_ids.add(college.principal_id)
+
+    return member_ids
+
+
+def _college_changed(instance, raw=False, **kwargs):
+    if not raw:
+        drop_cached(get_member_ids(instance))
+
+
+def connect_signals():
+    '''
+        Drops payloads of members of Colleges when the Colleges change
+
+        Called once from AuthlogicConfig.ready
+    '''
+    post_save.connect(_college_changed,
+                      sender=CollegeModel,
+                      dispatch_uid='auth-me')
+    pre_delete.connect(_college_changed,
+                       sender=CollegeModel,
+                       dispatch_uid='auth-me')
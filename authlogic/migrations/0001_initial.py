@@ -0,0 +1,38 @@
+# Generated by Django 4.1.3 on 2026-10-18 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('college', '0014_collegemodel_teacher'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiKeyModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('prefix', models.CharField(editable=False, max_length=16, unique=True)),
+                ('hashed_key', models.CharField(editable=False, max_length=64)),
+                ('roles', models.JSONField(blank=True, default=list)),
+                ('created_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_on', models.DateTimeField(blank=True, null=True)),
+                ('revoked_on', models.DateTimeField(blank=True, null=True)),
+                ('college', models.ManyToManyField(blank=True, related_name='api_key', to='college.collegemodel')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_key', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'API Key',
+                'verbose_name_plural': 'API Keys',
+            },
+        ),
+    ]
@@ -1,3 +1,68 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from college.models import CollegeModel
+
+
+class ApiKeyModel(models.Model):
+    '''
+        Model definition for ApiKeyModel.
+
+        Credential of machine clients (e.g. attendance kiosks), acting
+        for its User with given roles over given Colleges. Only a keyed
+        hash of the key is stored, see authlogic.api_keys
+    '''
+    name = models.CharField(max_length=100)
+    prefix = models.CharField(max_length=16, unique=True, editable=False)
+    hashed_key = models.CharField(max_length=64, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='api_key',
+    )
+    roles = models.JSONField(default=list, blank=True)
+    college = models.ManyToManyField(
+        CollegeModel,
+        related_name='api_key',
+        blank=True,
+    )
+    created_on = models.DateTimeField(default=timezone.now)
+    last_used_on = models.DateTimeField(blank=True, null=True)
+    revoked_on = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        '''
+            Meta definition for ApiKeyModel.
+        '''
+        verbose_name = 'API Key'
+        verbose_name_plural = 'API Keys'
+
+    def __str__(self):
+        '''Unicode representation of ApiKeyModel.'''
+        return f'{self.name} ({self.prefix})'
+
+
+class RevokedTokenModel(models.Model):
+    '''
+        Model definition for RevokedTokenModel.
+
+        Revokes a token (key jti:<jti>) or every token of a User issued
+        by revoked_on (key user:<id>), see authlogic.revocation
+    '''
+    key = models.CharField(max_length=64)
+    #? revocations since the last read are read on every refresh
+    revoked_on = models.DateTimeField(default=timezone.now, db_index=True)
+    #? when tokens it revokes have expired anyway
+    expires_on = models.DateTimeField(db_index=True)
+
+    class Meta:
+        '''
+            Meta definition for RevokedTokenModel.
+        '''
+        verbose_name = 'Revoked Token'
+        verbose_name_plural = 'Revoked Tokens'
+
+    def __str__(self):
+        '''Unicode representation of RevokedTokenModel.'''
+        return f'{self.key} revoked on {self.revoked_on}'
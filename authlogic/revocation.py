@@ -0,0 +1,330 @@
+import datetime
+import hashlib
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import Signal
+from django.utils import timezone
+
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedTokenModel
+
+#? sent with keys and revoked_on timestamps of new revocations once they
+#? are stored, stands in for a pub/sub channel (e.g. redis) between
+#? processes: this process learns at once, others on their next refresh
+tokens_revoked = Signal()
+
+#? seconds of revocations read again on every refresh
+READ_OVERLAP = 60
+
+#? issue time of tokens with sub-second resolution, iat has whole seconds
+ISSUED_AT_CLAIM = 'issued_at'
+
+
+class BloomFilter:
+    '''
+        Set of strings answering "maybe in" or "surely not in" from a
+        fixed size bit array, with no false negatives
+
+        args:
+            - size: bits of the array
+            - hashes: bits set per item
+    '''
+
+    def __init__(self, size, hashes):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray((size + 7) // 8)
+
+    def get_positions(self, item):
+        #? double hashing, two 64 bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        return [(first + index * second) % self.size
+                for index in range(self.hashes)]
+
+    def add(self, item):
+        for position in self.get_positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self.get_positions(item))
+
+
+def get_token_key(jti):
+    return f'jti:{jti}'
+
+
+def get_user_key(user_id):
+    return f'user:{user_id}'
+
+
+class RevocationList:
+    '''
+        Revocations of the process, mirrored from RevokedTokenModel
+
+        A Bloom filter answers most checks (not revoked) with a few
+        hashes, keys it may hold are confirmed in the exact dict of key
+        to revoked_on timestamp. New revocations are read every
+        settings.TOKEN_REVOCATION_REFRESH_INTERVAL seconds, and all of
+        them every settings.TOKEN_REVOCATION_RELOAD_INTERVAL seconds,
+        dropping expired ones.
+
+        Note: the filter and dict are replaced together as one tuple, so
+        checks never see a half built list
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        #? held by the one thread refreshing, others check meanwhile
+        self.refresh_lock = threading.Lock()
+        self.entries = None
+        #? revocations added while a reload reads, kept by the reload
+        self.added = None
+        self.loaded_at = self.refreshed_at = None
+
+    def add(self, revocations):
+        '''
+            Adds dict of key to revoked_on timestamp
+        '''
+        with self.lock:
+            bloom, revoked = self.entries
+            for key, revoked_on in revocations.items():
+                bloom.add(key)
+                revoked[key] = max(revoked_on, revoked.get(key, 0))
+
+            if self.added is not None:
+                self.added.update(revocations)
+
+    def read(self, queryset):
+        '''
+            Returns dict of key to revoked_on timestamp of given
+            revocations
+        '''
+        revocations = {}
+
+        for key, revoked_on in queryset.values_list('key', 'revoked_on'):
+            revocations[key] = max(revoked_on.timestamp(),
+                                   revocations.get(key, 0))
+
+        return revocations
+
+    def reload(self):
+        '''
+            Rebuilds the list from stored revocations, deleting expired ones
+
+            The new list is built aside and swapped in at once, checks
+            meanwhile use the previous one.
+        '''
+        with self.lock:
+            self.added = {}
+
+        now = timezone.now()
+        RevokedTokenModel.objects.filter(expires_on__lt=now).delete()
+
+        revoked = self.read(
+            RevokedTokenModel.objects.filter(expires_on__gte=now))
+        bloom = BloomFilter(
+            settings.TOKEN_REVOCATION_BLOOM_SIZE,
+            settings.TOKEN_REVOCATION_BLOOM_HASHES,
+        )
+
+        with self.lock:
+            for key, revoked_on in self.added.items():
+                revoked[key] = max(revoked_on, revoked.get(key, 0))
+            self.added = None
+
+            for key in revoked:
+                bloom.add(key)
+
+            self.entries = (bloom, revoked)
+            self.read_at = now
+            self.loaded_at = self.refreshed_at = time.monotonic()
+
+    def refresh(self):
+        '''
+            Reads revocations stored since the last read, reloads all of
+            them when due
+
+            Note: one thread refreshes at a time, others go on with the
+            current list, or wait for the first load
+        '''
+        loaded = self.loaded_at is not None
+
+        if loaded and time.monotonic() - self.refreshed_at < (
+                settings.TOKEN_REVOCATION_REFRESH_INTERVAL):
+            return
+
+        if not self.refresh_lock.acquire(blocking=not loaded):
+            return
+
+        try:
+            now = time.monotonic()
+
+            if (self.loaded_at is None or now - self.loaded_at >=
+                    settings.TOKEN_REVOCATION_RELOAD_INTERVAL):
+                self.reload()
+
+            elif (now - self.refreshed_at >=
+                  settings.TOKEN_REVOCATION_REFRESH_INTERVAL):
+                #? overlap reads, revocations committed late are still read
+                since = self.read_at - datetime.timedelta(seconds=READ_OVERLAP)
+                read_at = timezone.now()
+
+                self.add(
+                    self.read(
+                        RevokedTokenModel.objects.filter(
+                            revoked_on__gte=since)))
+                self.read_at = read_at
+                self.refreshed_at = now
+
+        finally:
+            self.refresh_lock.release()
+
+    def is_revoked(self, token):
+        '''
+            Returns whether given validated token is revoked
+        '''
+        self.refresh()
+
+        bloom, revoked = self.entries
+        keys = [
+            get_token_key(token.get(api_settings.JTI_CLAIM)),
+            get_user_key(token.get(api_settings.USER_ID_CLAIM)),
+        ]
+        issued_at = token.get(ISSUED_AT_CLAIM)
+
+        for key in keys:
+            if key not in bloom:
+                continue
+
+            revoked_on = revoked.get(key)
+            if revoked_on is None:
+                continue
+
+            #? tokens issued from the revocation on are valid, ones with
+            #? no sub-second issue time are revoked its whole second
+            if issued_at is not None:
+                if issued_at < revoked_on:
+                    return True
+
+            elif token.get('iat', 0) <= revoked_on:
+                return True
+
+        return False
+
+
+revocation_list = RevocationList()
+
+
+def _publish(revocations):
+    revocations = {
+        revocation.key: revocation.revoked_on.timestamp()
+        for revocation in revocations
+    }
+    transaction.on_commit(lambda: tokens_revoked.send(sender=RevokedTokenModel,
+                                                      revocations=revocations))
+
+
+def revoke_token(token):
+    '''
+        Revokes given validated token (access or refresh)
+    '''
+    _publish([
+        RevokedTokenModel.objects.create(
+            key=get_token_key(token[api_settings.JTI_CLAIM]),
+            expires_on=datetime.datetime.fromtimestamp(
+                token['exp'], tz=datetime.timezone.utc),
+        )
+    ])
+
+
+def revoke_user_tokens(user_id):
+    '''
+        Revokes all tokens of given User issued until now, e.g. on
+        a password change
+    '''
+    now = timezone.now()
+
+    _publish([
+        RevokedTokenModel.objects.create(
+            key=get_user_key(user_id),
+            revoked_on=now,
+            expires_on=now + api_settings.REFRESH_TOKEN_LIFETIME,
+        )
+    ])
+
+
+def _revoked(revocations, **kwargs):
+    if revocation_list.loaded_at is not None:
+        revocation_list.add(revocations)
+
+
+tokens_revoked.connect(_revoked, dispatch_uid='revocation-list')
+
+
+def _user_saving(sender, instance, raw=False, **kwargs):
+    instance._revoke_tokens = False
+
+    #? only saves of inactive Users may deactivate them
+    if instance.pk and not raw and not instance.is_active:
+        instance._revoke_tokens = sender.objects.filter(
+            pk=instance.pk, is_active=True).exists()
+
+
+def _user_saved(instance, **kwargs):
+    if getattr(instance, '_revoke_tokens', False):
+        revoke_user_tokens(instance.pk)
+
+
+def _user_deleted(instance, **kwargs):
+    revoke_user_tokens(instance.pk)
+
+
+def _teachers_removed(instance, action, reverse, pk_set=None, **kwargs):
+    if action == 'post_remove':
+        user_ids = [instance.pk] if reverse else pk_set
+
+    #? teachers are unknown once cleared
+    elif action == 'pre_clear':
+        user_ids = [instance.pk] if reverse else list(
+            instance.teacher.values_list('id', flat=True))
+
+    else:
+        return
+
+    for user_id in user_ids:
+        revoke_user_tokens(user_id)
+
+
+def connect_signals():
+    '''
+        Revokes tokens of Users who leave: deactivated, deleted or removed
+        as teacher from a College
+
+        Called once from AuthlogicConfig.ready
+    '''
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    College = apps.get_model('college.CollegeModel')
+
+    pre_save.connect(_user_saving, sender=User, dispatch_uid='revocation')
+    post_save.connect(_user_saved, sender=User, dispatch_uid='revocation')
+    post_delete.connect(_user_deleted, sender=User, dispatch_uid='revocation')
+    m2m_changed.connect(
+        _teachers_removed,
+        sender=College.teacher.through,
+        dispatch_uid='revocation',
+    )
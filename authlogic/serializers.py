@@ -0,0 +1,143 @@
+from rest_framework import serializers
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from college.models import CollegeModel
+from user.roles import ROLES, get_role_scope
+from user.serializers import UserPasswordSerializer
+
+from .models import ApiKeyModel
+
+User = get_user_model()
+
+
+class ApiKeySerializer(serializers.ModelSerializer):
+    '''
+        Serializer to Display API Keys, without the key
+    '''
+
+    class Meta:
+        model = ApiKeyModel
+        fields = [
+            'id',
+            'name',
+            'prefix',
+            'user',
+            'roles',
+            'college',
+            'created_on',
+            'last_used_on',
+            'revoked_on',
+        ]
+
+
+class ApiKeyCreateSerializer(serializers.Serializer):
+    '''
+        Serializer to Create API Keys
+    '''
+    name = serializers.CharField(max_length=100)
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(
+        is_active=True))
+    roles = serializers.MultipleChoiceField(choices=ROLES)
+    college = serializers.PrimaryKeyRelatedField(
+        queryset=CollegeModel.objects.all(),
+        many=True,
+        required=False,
+    )
+
+    def validate_roles(self, value):
+        '''
+            Validations for roles
+
+            Validates if the requesting user holds every role
+        '''
+        missing = set(value) - get_role_scope(self.context['request']).roles
+        if missing:
+            raise serializers.ValidationError(
+                f'You can not grant roles you do not hold: '
+                f'{", ".join(sorted(missing))}.')
+
+        return value
+
+    def validate(self, attrs):
+        '''
+            Validates if the User of the key holds every role
+        '''
+        user = attrs['user']
+        missing = {
+            role
+            for role in attrs['roles'] if not getattr(user, f'is_{role}')
+        }
+        if missing:
+            raise serializers.ValidationError({
+                'roles':
+                f'The User does not hold roles: {", ".join(sorted(missing))}.'
+            })
+
+        return attrs
+
+
+class ApiKeyCreatedSerializer(ApiKeySerializer):
+    '''
+        Serializer to Display a created API Key, with the key
+    '''
+    key = serializers.CharField()
+
+    class Meta(ApiKeySerializer.Meta):
+        fields = ApiKeySerializer.Meta.fields + ['key']
+
+
+class PasswordSetSerializer(UserPasswordSerializer):
+    '''
+        Serializer to Set Password of a User from an emailed link, see
+        User.get_password_set_url
+    '''
+    uid = serializers.CharField()
+    token = serializers.CharField()
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+
+        try:
+            user = User.objects.get(
+                pk=force_str(urlsafe_base64_decode(attrs['uid'])),
+                is_active=True,
+            )
+        except (ValueError, OverflowError, User.DoesNotExist):
+            user = None
+
+        if user is None or not default_token_generator.check_token(
+                user, attrs['token']):
+            raise serializers.ValidationError(
+                {'token': 'Link is invalid or has expired'})
+
+        attrs['user'] = user
+
+        return attrs
+
+
+class LogoutSerializer(serializers.Serializer):
+    '''
+        Serializer to Log out, revoking the given refresh token
+    '''
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, value):
+        try:
+            token = RefreshToken(value)
+        except TokenError as ex:
+            raise serializers.ValidationError(str(ex))
+
+        #? users may only revoke their own tokens
+        if str(token.get(api_settings.USER_ID_CLAIM)) != str(
+                self.context['request'].user.pk):
+            raise serializers.ValidationError('Token is not of this User')
+
+        return token
@@ -1,3 +1,714 @@
-from django.test import TestCase
+import base64
+import datetime
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from college.models import CollegeModel
+from user.authentication import ClaimsTokenObtainPairSerializer
+
+from .api_keys import create_api_key, last_used
+from .me import load_me
+from .models import ApiKeyModel, RevokedTokenModel
+from .revocation import (
+    BloomFilter,
+    get_user_key,
+    revocation_list,
+    revoke_token,
+    revoke_user_tokens,
+)
+
+User = get_user_model()
+
+
+class TestApiKeys(APITestCase):
+    '''
+        Test Case to test API Keys
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        cache.clear()
+        last_used.flush()
+
+        #? keys get roles the issuing Admin holds too
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+            is_teacher=True,
+        )
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Male',
+            is_teacher=True,
+        )
+        self.teacher.set_password('Test@123')
+        self.teacher.save()
+
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            address='Jammu',
+            alias_name='TC',
+            logo='https://i.pravatar.cc/300',
+            website='https://college.com',
+            mobile='9876543210',
+        )
+
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.post(
+            reverse('api-key-list-create'),
+            {
+                'name': 'Kiosk',
+                'user': self.teacher.id,
+                'roles': ['teacher'],
+                'college': [self.college.id],
+            },
+            format='json',
+        )
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.api_key = resp.data
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.credentials()
+        cache.clear()
+
+    def use_key(self, key, url_name='attendance-list-create'):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Api-Key {key}')
+
+        return self.client.get(reverse(url_name))
+
+    def test_ApiKey_created(self):
+        '''
+            Test only a keyed hash of created keys is stored
+        '''
+        api_key = ApiKeyModel.objects.get(pk=self.api_key['id'])
+
+        self.assertTrue(
+            self.api_key['key'].startswith(f'upk_{api_key.prefix}_'))
+        self.assertNotIn(api_key.hashed_key, self.api_key['key'])
+        self.assertEqual(self.api_key['roles'], ['teacher'])
+        self.assertEqual(self.api_key['college'], [self.college.id])
+
+    def test_ApiKey_authenticates(self):
+        '''
+            Test keys authenticate on Views of the machine policy, without
+            hashing passwords
+        '''
+        with mock.patch('django.contrib.auth.base_user.check_password',
+                        wraps=check_password) as hashed:
+            resp = self.use_key(self.api_key['key'])
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        hashed.assert_not_called()
+
+    def test_ApiKey_roles(self):
+        '''
+            Test keys only have the roles given to them
+        '''
+        _, key = create_api_key('Script', self.teacher, roles=['hod'])
+
+        resp = self.use_key(key)
+
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ApiKey_create_roles(self):
+        '''
+            Test keys can't have roles the Admin or the User don't hold
+        '''
+        admin = User.objects.create(
+            email='other.admin@mail.com',
+            first_name='Other',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+
+        for user, roles in [(self.admin, ['admin']), (admin, ['teacher'])]:
+            self.client.force_authenticate(user=user)
+            resp = self.client.post(
+                reverse('api-key-list-create'),
+                {
+                    'name': 'Escalated',
+                    'user': self.teacher.id,
+                    'roles': roles,
+                },
+                format='json',
+            )
+
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('roles', resp.data)
+
+        self.assertEqual(ApiKeyModel.objects.count(), 1)
+
+    def test_ApiKey_user_demoted(self):
+        '''
+            Test keys lose roles their User loses, at once
+        '''
+        self.assertEqual(
+            self.use_key(self.api_key['key']).status_code,
+            status.HTTP_200_OK,
+        )
+
+        self.teacher.is_teacher = False
+        self.teacher.save()
+
+        self.assertEqual(
+            self.use_key(self.api_key['key']).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_ApiKey_default_policy(self):
+        '''
+            Test keys are rejected by Views of the default policy
+        '''
+        resp = self.use_key(self.api_key['key'], 'user-admin-list')
+
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ApiKey_invalid(self):
+        '''
+            Test keys with a wrong secret are rejected
+        '''
+        prefix = self.api_key['prefix']
+
+        resp = self.use_key(f'upk_{prefix}_wrong')
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        resp = self.use_key('upk_unknown_wrong')
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ApiKey_revoked(self):
+        '''
+            Test revoked keys are rejected at once
+        '''
+        self.assertEqual(
+            self.use_key(self.api_key['key']).status_code,
+            status.HTTP_200_OK,
+        )
+
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.delete(
+            reverse('api-key-retrieve-revoke',
+                    kwargs={'pk': self.api_key['id']}))
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(resp.data,
+                         {'detail': ['API Key Revoked Successfully']})
+        self.assertEqual(
+            self.use_key(self.api_key['key']).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_ApiKey_last_used(self):
+        '''
+            Test uses of keys are written in batches
+        '''
+        with self.settings(API_KEY_LAST_USED_INTERVAL=3600):
+            self.use_key(self.api_key['key'])
+            self.use_key(self.api_key['key'])
+
+        api_key = ApiKeyModel.objects.get(pk=self.api_key['id'])
+        self.assertIsNone(api_key.last_used_on)
+
+        self.assertEqual(last_used.flush(), 1)
+        api_key.refresh_from_db()
+        self.assertIsNotNone(api_key.last_used_on)
+
+    def test_BasicAuthentication_removed(self):
+        '''
+            Test passwords are not accepted per request
+        '''
+        credentials = base64.b64encode(b'teacher@mail.com:Test@123').decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+
+        resp = self.client.get(reverse('attendance-list-create'))
+
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(
+    ARGON2_TIME_COST=1,
+    ARGON2_MEMORY_COST=1024,
+    ARGON2_PARALLELISM=1,
+    PASSWORD_HASHING_WORKERS=0,
+)
+class TestTokenRevocation(APITestCase):
+    '''
+        Test Case to test revocation of tokens
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        cache.clear()
+        revocation_list.loaded_at = None
+
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.user = User.objects.create(
+            email='user@mail.com',
+            first_name='Test',
+            last_name='User',
+            gender='Male',
+        )
+        self.user.set_password('Test@123')
+        self.user.save()
+
+        resp = self.client.post(
+            reverse('obtain_token_pair'),
+            {
+                'email': 'user@mail.com',
+                'password': 'Test@123'
+            },
+            format='json',
+        )
+        self.tokens = resp.data
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.credentials()
+        revocation_list.loaded_at = None
+        cache.clear()
+
+    def get_me(self, access=None):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {access or self.tokens["access"]}')
+
+        return self.client.get(reverse('auth-me'))
+
+    def refresh(self):
+        return self.client.post(
+            reverse('token_refresh'),
+            {'refresh': self.tokens['refresh']},
+            format='json',
+        )
+
+    def test_Revoke_password_update(self):
+        '''
+            Test tokens issued before a password update are rejected
+        '''
+        self.assertEqual(self.get_me().status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                reverse('user-password-update', kwargs={'pk': self.user.id}),
+                {
+                    'password': 'Test@1234',
+                    'confirm_password': 'Test@1234'
+                },
+                format='json',
+            )
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_me().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_Revoke_token(self):
+        '''
+            Test only the revoked token is rejected
+        '''
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_token(AccessToken(self.tokens['access']))
+
+        self.assertEqual(self.get_me().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+        resp = self.refresh()
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_me(resp.data['access']).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_Revoke_refresh(self):
+        '''
+            Test revocations stored by other processes are read on refresh,
+            tokens issued after them are accepted
+        '''
+        self.assertEqual(self.get_me().status_code, status.HTTP_200_OK)
+
+        now = timezone.now()
+        RevokedTokenModel.objects.create(
+            key=get_user_key(self.user.id),
+            revoked_on=now - datetime.timedelta(minutes=5),
+            expires_on=now + datetime.timedelta(days=1),
+        )
+        RevokedTokenModel.objects.create(
+            key=get_user_key(self.admin.id),
+            revoked_on=now,
+            expires_on=now + datetime.timedelta(days=1),
+        )
+
+        with self.settings(TOKEN_REVOCATION_REFRESH_INTERVAL=0):
+            self.assertEqual(self.get_me().status_code, status.HTTP_200_OK)
+
+            RevokedTokenModel.objects.create(
+                key=get_user_key(self.user.id),
+                expires_on=now + datetime.timedelta(days=1),
+            )
+            self.assertEqual(self.get_me().status_code,
+                             status.HTTP_401_UNAUTHORIZED)
+
+    def test_Revoke_issued_after(self):
+        '''
+            Test tokens issued right after a revocation, the same second,
+            are accepted
+        '''
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_user_tokens(self.user.id)
+
+        self.assertEqual(self.get_me().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+        resp = self.client.post(
+            reverse('obtain_token_pair'),
+            {
+                'email': 'user@mail.com',
+                'password': 'Test@123'
+            },
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.get_me(resp.data['access']).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_Revoke_reload(self):
+        '''
+            Test revoked tokens stay rejected while the list reloads
+        '''
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_token(AccessToken(self.tokens['access']))
+
+        self.assertEqual(self.get_me().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+        checks = []
+        read = revocation_list.read
+
+        def check_while_reading(queryset):
+            checks.append(self.get_me().status_code)
+            return read(queryset)
+
+        #? reload due
+        revocation_list.loaded_at -= 10**6
+        revocation_list.refreshed_at -= 10**6
+        with mock.patch.object(revocation_list, 'read', check_while_reading):
+            self.assertEqual(self.get_me().status_code,
+                             status.HTTP_401_UNAUTHORIZED)
+
+        self.assertEqual(checks, [status.HTTP_401_UNAUTHORIZED])
+
+    def test_Logout(self):
+        '''
+            Test logging out revokes the refresh and access token
+        '''
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                reverse('logout'),
+                {'refresh': self.tokens['refresh']},
+                format='json',
+            )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_me().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_Logout_other_user(self):
+        '''
+            Test Users can't revoke tokens of others
+        '''
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.post(
+            reverse('logout'),
+            {'refresh': self.tokens['refresh']},
+            format='json',
+        )
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+
+    def test_Revoke_deactivated(self):
+        '''
+            Test tokens of deactivated Users are revoked
+        '''
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.assertEqual(self.refresh().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_Revoke_teacher_removed(self):
+        '''
+            Test tokens of teachers removed from a College are revoked
+        '''
+        college = CollegeModel.objects.create(
+            name='Test College',
+            address='Jammu',
+            alias_name='TC',
+            logo='https://i.pravatar.cc/300',
+            website='https://college.com',
+            mobile='9876543210',
+        )
+        college.teacher.add(self.user)
+        self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            college.teacher.remove(self.user)
+
+        self.assertEqual(self.refresh().status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_BloomFilter(self):
+        '''
+            Test the Bloom filter has no false negatives
+        '''
+        bloom = BloomFilter(1024, 7)
+        keys = [get_user_key(id) for id in range(50)]
+
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+        self.assertLess(
+            sum(get_user_key(id) in bloom for id in range(50, 1050)), 100)
+
+
+@override_settings(TOKEN_REVOCATION_REFRESH_INTERVAL=3600)
+class TestAuthMe(APITestCase):
+    '''
+        Test Case to test cached and conditional /api/auth/me/ responses
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        cache.clear()
+
+        self.user = User.objects.create(
+            email='hod@mail.com',
+            first_name='Test',
+            last_name='HOD',
+            gender='Male',
+            is_hod=True,
+        )
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            address='Jammu',
+            alias_name='TC',
+            logo='https://i.pravatar.cc/300',
+            website='https://college.com',
+            mobile='9876543210',
+        )
+        self.college.hod.add(self.user)
+        self.user.refresh_from_db()
+
+        access = ClaimsTokenObtainPairSerializer.get_token(
+            self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.credentials()
+        cache.clear()
+
+    def get_me(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+
+        return self.client.get(reverse('auth-me'), **headers)
+
+    #? as with a cache shared between processes
+    @override_settings(TOKEN_VERSION_CACHE_TIMEOUT=30)
+    def test_Me_not_modified(self):
+        '''
+            Test revalidations with a matching ETag get 304 from cache
+        '''
+        resp = self.get_me()
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['email'], 'hod@mail.com')
+        self.assertEqual(resp['Cache-Control'], 'private, no-cache')
+
+        etag = resp['ETag']
+        with self.assertNumQueries(0):
+            resp = self.get_me(etag)
+
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp['ETag'], etag)
+        self.assertEqual(resp.content, b'')
+
+        self.assertEqual(
+            self.get_me(f'W/{etag}').status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        self.assertEqual(
+            self.get_me('"other"').status_code, status.HTTP_200_OK)
+
+    def test_Me_user_changed(self):
+        '''
+            Test changes to the User are served at once
+        '''
+        etag = self.get_me()['ETag']
+
+        self.user.first_name = 'Changed'
+        self.user.save()
+
+        resp = self.get_me(etag)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['first_name'], 'Changed')
+        self.assertNotEqual(resp['ETag'], etag)
+
+    def test_Me_college_changed(self):
+        '''
+            Test changes to Colleges of the User and their members are
+            served at once
+        '''
+        resp = self.get_me()
+        self.assertEqual(resp.data['college'][0]['name'], 'Test College')
+
+        self.college.name = 'Changed College'
+        self.college.save()
+
+        resp = self.get_me(resp['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['college'][0]['name'], 'Changed College')
+
+        self.college.hod.remove(self.user)
+
+        resp = self.get_me(resp['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['college'], [])
+
+    def test_Me_prefetch(self):
+        '''
+            Test Colleges of the User and their teachers are fetched in
+            bulk
+        '''
+        self.college.teacher.add(self.user)
+
+        with self.assertNumQueries(5):
+            data = load_me(self.user.id)
+
+        self.assertEqual(len(data['college']), 1)
+        self.assertEqual(len(data['college_teacher']), 1)
+        self.assertIsNone(data['administrated_college'])
+
+
+@override_settings(
+    ARGON2_TIME_COST=1,
+    ARGON2_MEMORY_COST=1024,
+    ARGON2_PARALLELISM=1,
+    PASSWORD_SET_URL='https://app.com/set-password/{uid}/{token}/',
+)
+class TestPasswordSet(APITestCase):
+    '''
+        Test Case to test setting Passwords from emailed links
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.user = User.objects.create(
+            email='user@mail.com',
+            first_name='Test',
+            last_name='User',
+            gender='Male',
+        )
+        self.user.set_password('Test@123')
+        self.user.save()
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        revocation_list.loaded_at = None
+
+    def set_password(self, uid, token):
+        return self.client.post(
+            reverse('password-set'),
+            {
+                'uid': uid,
+                'token': token,
+                'password': 'Test@1234',
+                'confirm_password': 'Test@1234',
+            },
+            format='json',
+        )
+
+    def test_PasswordSet(self):
+        '''
+            Test links set the Password once
+        '''
+        uid, token = self.user.get_password_set_url().split('/')[-3:-1]
+
+        resp = self.set_password(uid, token)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('Test@1234'))
+
+        resp = self.set_password(uid, token)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_PasswordSet_invalid(self):
+        '''
+            Test links with a wrong uid or token are rejected
+        '''
+        uid, _ = self.user.get_password_set_url().split('/')[-3:-1]
+
+        self.assertEqual(
+            self.set_password(uid, 'wrong').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.set_password('wrong', 'wrong').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
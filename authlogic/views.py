@@ -1,13 +1,31 @@
 import logging
 
-from drf_spectacular.utils import OpenApiResponse, extend_schema
+from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
 
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework_simplejwt.tokens import AccessToken
 
+from user.permissions import UserIsAdmin
 from user.serializers import UserSerializer
+from api.paginator import StandardPagination
+
+from .api_keys import create_api_key
+from .me import get_me, is_not_modified
+from .revocation import revoke_token, revoke_user_tokens
+from .models import ApiKeyModel
+from .serializers import (
+    ApiKeyCreateSerializer,
+    ApiKeyCreatedSerializer,
+    ApiKeySerializer,
+    LogoutSerializer,
+    PasswordSetSerializer,
+)
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -19,6 +37,9 @@ class AuthMeApiView(generics.GenericAPIView):
 
         GET: Returns data of Currently Logged in User
 
+        Note: served from cache with a strong ETag, requests with
+        a matching If-None-Match header get 304 Not Modified
+
         Accessible by: Any Authenticated User
     '''
     queryset = User.objects.all()
@@ -29,6 +50,8 @@ class AuthMeApiView(generics.GenericAPIView):
         responses={
             200:
             UserSerializer,
+            304:
+            OpenApiResponse(description='Not Modified'),
             401:
             OpenApiResponse(
                 description='Authentication credentials were not provided.')
@@ -36,7 +59,263 @@ class AuthMeApiView(generics.GenericAPIView):
         operation_id='user_me',
     )
     def get(self, request, *args, **kwargs):
-        user = request.user
-        serializer = UserSerializer(user)
+        me = get_me(request.user.pk)
+        if me is None:
+            raise NotFound()
+
+        #? clients may keep it, but must revalidate before every use
+        headers = {'ETag': me['etag'], 'Cache-Control': 'private, no-cache'}
+
+        if is_not_modified(request, me['etag']):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+
+        return Response(me['data'], status=status.HTTP_200_OK, headers=headers)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(
+                description='API Key List',
+                response=ApiKeySerializer,
+            ),
+        },
+        description='Returns list of all API Keys, without the keys.'),
+    post=extend_schema(
+        request=ApiKeyCreateSerializer,
+        responses={
+            #? 201
+            status.HTTP_201_CREATED:
+            OpenApiResponse(
+                description='API Key Created Successfully',
+                response=ApiKeyCreatedSerializer,
+            ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Creates an API Key for machine clients, acting for the given User with the given roles over the given Colleges. The key is returned only once.\n\nRoles have to be held by both the requesting Admin and the User. A key loses roles its User loses.'
+    ),
+)
+class ApiKeyListCreateAPIView(generics.ListCreateAPIView):
+    '''
+        Allowed methods: GET, POST
+
+        GET: Return list of all API Keys
+        POST: Create an API Key, the key is only in the response
+
+        Accessible by: Admin
+    '''
+    queryset = ApiKeyModel.objects.prefetch_related('college').order_by(
+        '-created_on')
+    serializer_class = ApiKeySerializer
+    permission_classes = [permissions.IsAuthenticated & (UserIsAdmin)]
+    pagination_class = StandardPagination
+
+    def post(self, request, *args, **kwargs):
+        serializer = ApiKeyCreateSerializer(
+            data=request.data,
+            context={'request': request},
+        )
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            api_key, key = create_api_key(
+                name=serializer.validated_data['name'],
+                user=serializer.validated_data['user'],
+                roles=sorted(serializer.validated_data['roles']),
+                colleges=serializer.validated_data.get('college', []),
+            )
+
+        except Exception as ex:
+            logger.error(str(ex))
+
+            return Response({'detail': str(ex)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        api_key.key = key
+        logger.info(f'API Key {api_key} Created Successfully')
+
+        return Response(
+            ApiKeyCreatedSerializer(api_key).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        description='Returns Single API Key of given Id.\n\nargs: pk',
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(
+                description='API Key Detail',
+                response=ApiKeySerializer,
+            ),
+            #? 404
+            status.HTTP_404_NOT_FOUND:
+            OpenApiResponse(
+                description='Not found',
+                response=OpenApiTypes.OBJECT,
+            ),
+        }),
+    delete=extend_schema(
+        description='Revokes the API Key of given Id.\n\nargs: pk',
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(description='API Key Revoked Successfully', ),
+            #? 404
+            status.HTTP_404_NOT_FOUND:
+            OpenApiResponse(
+                description='Not found',
+                response=OpenApiTypes.OBJECT,
+            ),
+        }),
+)
+class ApiKeyRetrieveRevokeAPIView(generics.RetrieveAPIView):
+    '''
+        Allowed methods: GET, DELETE
+
+        GET: Return API Key of given Id
+        DELETE: Revoke API Key of given Id, kept for its history
+
+        args: pk
+
+        Accessible by: Admin
+    '''
+    queryset = ApiKeyModel.objects.all()
+    serializer_class = ApiKeySerializer
+    permission_classes = [permissions.IsAuthenticated & (UserIsAdmin)]
+    lookup_field = 'pk'
+
+    def delete(self, request, *args, **kwargs):
+        api_key = self.get_object()
+
+        try:
+            if api_key.revoked_on is None:
+                api_key.revoked_on = timezone.now()
+                api_key.save(update_fields=['revoked_on'])
+
+        except Exception as ex:
+            logger.error(str(ex))
+
+            return Response({'detail': str(ex)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = {'detail': ['API Key Revoked Successfully']}
+        logger.info(response)
+
+        return Response(response, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(description='Password Set Successfully', ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Sets the Password of the User of an emailed link (uid and token), e.g. of a new User.'
+    ), )
+class PasswordSetAPIView(generics.GenericAPIView):
+    '''
+        Allowed methods: POST
+
+        POST: Sets the Password of the User of given uid and token
+
+        Note: links stop working once the Password is set, tokens of the
+        User issued before are revoked
+
+        Accessible by: Anyone
+    '''
+    serializer_class = PasswordSetSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = serializer.validated_data['user']
+
+        try:
+            user.set_password(serializer.validated_data['password'])
+            user.save()
+
+            revoke_user_tokens(user.id)
+
+        except Exception as ex:
+            logger.error(str(ex))
+
+            return Response({'detail': str(ex)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = {'detail': ['Password Set Successfully']}
+        logger.info(response)
+
+        return Response(response, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(description='Logged out Successfully', ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Logs out the Currently Logged in User, revoking the given refresh token and the access token of the request.'
+    ), )
+class LogoutAPIView(generics.GenericAPIView):
+    '''
+        Allowed methods: POST
+
+        POST: Revokes given refresh token and the access token of the
+        request
+
+        Accessible by: Any Authenticated User
+    '''
+    serializer_class = LogoutSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            revoke_token(serializer.validated_data['refresh'])
+
+            if isinstance(request.auth, AccessToken):
+                revoke_token(request.auth)
+
+        except Exception as ex:
+            logger.error(str(ex))
+
+            return Response({'detail': str(ex)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = {'detail': ['Logged out Successfully']}
+        logger.info(response)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(response, status=status.HTTP_200_OK)
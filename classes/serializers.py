@@ -8,6 +8,7 @@ from college import serializers as college_serializers
 from department.models import DepartmentModel
 from course.models import CourseModel
 from student.serializers import StudentFullSerializer
+from api.fieldsets import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -95,7 +96,7 @@ class NestedTeacherSerializer(serializers.ModelSerializer):
 ##############################################################################################
 
 
-class ClassFullSerializer(serializers.ModelSerializer):
+class ClassFullSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer to Display class data
     '''
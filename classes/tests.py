@@ -1,3 +1,136 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from attendance.models import AttendanceModel, AttendanceSheetModel
+from student.models import StudentModel
+
+from . import models
+
+User = get_user_model()
+
+
+class TestClassRegisterViews(APITestCase):
+    '''
+        Test Case to test Class register view
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.for_class = models.ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            teacher=self.teacher,
+        )
+        self.students = [
+            StudentModel.objects.create(
+                first_name=f'Test{iter}',
+                last_name='Student',
+            ) for iter in range(3)
+        ]
+        self.for_class.student.add(*self.students)
+
+        self.client.force_authenticate(user=self.teacher)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def add_attendance(self, student, date, is_present, is_late=False):
+        AttendanceModel.objects.create(
+            student=student,
+            for_class=self.for_class,
+            date=date,
+            is_present=is_present,
+            is_absent=not is_present,
+            is_late=is_late,
+        )
+
+    def get_register(self, params=None):
+        return self.client.get(
+            reverse('class-register', kwargs={'pk': self.for_class.id}),
+            params or {},
+        )
+
+    def test_ClassRegister(self):
+        '''
+            Test register matrix of a Class
+        '''
+        self.add_attendance(self.students[0], '2022-10-03', True)
+        self.add_attendance(self.students[1], '2022-10-03', True, True)
+        self.add_attendance(self.students[0], '2022-10-04', False)
+
+        resp = self.get_register()
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['codes'],
+                         ['unmarked', 'present', 'late', 'absent'])
+        self.assertEqual(resp.data['students'],
+                         [student.id for student in self.students])
+        self.assertEqual(resp.data['dates'], ['2022-10-03', '2022-10-04'])
+        self.assertEqual(resp.data['status'], [[1, 3], [2, 0], [0, 0]])
+
+    def test_ClassRegister_range(self):
+        '''
+            Test register of a Class over a date range
+        '''
+        self.add_attendance(self.students[0], '2022-10-03', True)
+        self.add_attendance(self.students[0], '2022-10-04', False)
+
+        resp = self.get_register({'from': '2022-10-04', 'to': '2022-10-31'})
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['dates'], ['2022-10-04'])
+        self.assertEqual(resp.data['status'], [[3], [0], [0]])
+
+    def test_ClassRegister_invalid_range(self):
+        '''
+            Test register with from after to
+        '''
+        resp = self.get_register({'from': '2022-10-04', 'to': '2022-10-01'})
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('date_from', resp.data)
+
+    def test_ClassRegister_sheets(self):
+        '''
+            Test register of a Class recorded on Attendance Sheets
+        '''
+        resp = self.client.post(
+            reverse('attendance-sheet-list-create'),
+            [{
+                'student': student.id,
+                'for_class': self.for_class.id,
+                'date': '2022-10-05',
+                'is_present': is_present,
+                'is_late': is_late,
+            } for student, is_present, is_late in [
+                (self.students[0], True, False),
+                (self.students[1], True, True),
+                (self.students[2], False, False),
+            ]],
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(AttendanceSheetModel.objects.count(), 1)
+
+        self.add_attendance(self.students[0], '2022-10-03', False)
+
+        resp = self.get_register()
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['dates'], ['2022-10-03', '2022-10-05'])
+        self.assertEqual(resp.data['status'], [[3, 1], [0, 2], [0, 3]])
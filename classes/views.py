@@ -3,7 +3,7 @@ import logging
 import string
 from datetime import date, datetime
 
-from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, extend_schema_view
 from drf_spectacular.types import OpenApiTypes
 
 from rest_framework import generics, permissions, status
@@ -20,8 +20,11 @@ from django.conf import settings
 from . import serializers, models
 from .filters import ClassFilter
 
-from user.permissions import UserIsAdmin, UserIsHOD, UserIsTeacher
+from attendance.register import REGISTER_CODES, build_register
+from attendance.serializers import AttendanceRegisterSerializer
+from user.permissions import UserIsAdmin, UserIsPrincipal, UserIsHOD, UserIsTeacher
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +67,7 @@ logger = logging.getLogger(__name__)
         'Returns list of all Classes.\n\nOrdering:\n\n- default: -created_on\n\n- allowed: created_on, -created_on'
     ),
 )
-class ClassListCreateAPIView(generics.ListCreateAPIView):
+class ClassListCreateAPIView(QueryPlanMixin, generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -203,7 +206,8 @@ class ClassListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class ClassRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class ClassRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                        generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -219,6 +223,7 @@ class ClassRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     '''
     queryset = models.ClassModel.objects.all()
     serializer_class = serializers.ClassSerializer
+    plan_serializer_class = serializers.ClassFullSerializer
     permission_classes = [
         permissions.IsAuthenticated & (UserIsAdmin | UserIsHOD | UserIsTeacher)
     ]
@@ -227,7 +232,8 @@ class ClassRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single Class
     def get(self, request, *args, **kwargs):
         single_class = self.get_object()
-        serializer = serializers.ClassFullSerializer(single_class)
+        serializer = serializers.ClassFullSerializer(
+            single_class, context={'request': request})
         return Response(serializer.data)
 
     #? Update Class of given Id
@@ -299,3 +305,79 @@ class ClassRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
         logger.info(response)
 
         return Response(response, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        parameters=[
+            OpenApiParameter('from', OpenApiTypes.DATE),
+            OpenApiParameter('to', OpenApiTypes.DATE),
+        ],
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(
+                description='Class Register',
+                response=AttendanceRegisterSerializer,
+            ),
+            #? 404
+            status.HTTP_404_NOT_FOUND:
+            OpenApiResponse(
+                description='Not found',
+                response=OpenApiTypes.OBJECT,
+            ),
+            #? 400
+            status.HTTP_400_BAD_REQUEST:
+            OpenApiResponse(
+                description='Bad Request',
+                response=OpenApiTypes.OBJECT,
+            ),
+        },
+        description=
+        'Returns the register of the Class of given Id: Students by dates matrix of status codes.\n\nstatus has a row per Student (students) and a code per date (dates), code is the index in codes (unmarked, present, late, absent).\n\nargs: pk\n\nFilters:\n\n- from, to (dates, inclusive)\n\nAccessible by: Admin, Principal, HOD, Teacher'
+    ), )
+class ClassRegisterAPIView(generics.GenericAPIView):
+    '''
+        Allowed methods: GET
+
+        GET: Return register of Class of given Id
+
+        args: pk
+
+        Accessible by: Admin, Principal, HOD, Teacher
+    '''
+    queryset = models.ClassModel.objects.all()
+    serializer_class = AttendanceRegisterSerializer
+    permission_classes = [
+        permissions.IsAuthenticated &
+        (UserIsAdmin | UserIsPrincipal | UserIsHOD | UserIsTeacher)
+    ]
+    lookup_field = 'pk'
+
+    #? get register of a Class
+    def get(self, request, *args, **kwargs):
+        single_class = self.get_object()
+
+        query = self.get_serializer(
+            data={
+                field: request.query_params[param]
+                for field, param in [('date_from', 'from'), ('date_to', 'to')]
+                if request.query_params.get(param)
+            })
+        query.is_valid(raise_exception=True)
+
+        students, dates, register = build_register(
+            single_class.id,
+            **query.validated_data,
+        )
+
+        serializer = self.get_serializer({
+            'for_class': single_class.id,
+            **query.validated_data,
+            'codes': REGISTER_CODES,
+            'students': students,
+            'dates': dates,
+            'status': register,
+        })
+
+        return Response(serializer.data)
@@ -4,6 +4,7 @@ from rest_framework import serializers
 
 from . import models
 from university import models as uni_models
+from api.fieldsets import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -107,7 +108,7 @@ class CollegeUniSerializer(serializers.ModelSerializer):
 ##############################################################################################
 
 
-class CollegeSerializer(serializers.ModelSerializer):
+class CollegeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer to Display College Data
     '''
@@ -16,6 +16,8 @@ from . import response_serializers as rs
 from user.permissions import UserIsAdmin
 
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
+from api.response_cache import ResponseCacheMixin
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +60,8 @@ logger = logging.getLogger(__name__)
         'Returns list of all Colleges.\n\nFilters:\n\n- district\n\n- university(id)\n\nOrdering:\n\n- default: -created_on\n\n- allowed: created_on, -created_on'
     ),
 )
-class CollegeListCreateAPIView(generics.ListCreateAPIView):
+class CollegeListCreateAPIView(ResponseCacheMixin, QueryPlanMixin,
+                               generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -77,6 +80,7 @@ class CollegeListCreateAPIView(generics.ListCreateAPIView):
     '''
     queryset = models.CollegeModel.objects.all()
     serializer_class = serializers.CollegeSerializer
+    cache_scope = 'college'
     permission_classes = [permissions.IsAuthenticated & (UserIsAdmin)]
     pagination_class = StandardPagination
     filter_backends = [OrderingFilter, DjangoFilterBackend]
@@ -173,7 +177,8 @@ class CollegeListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class CollegeRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class CollegeRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                          generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -189,13 +194,15 @@ class CollegeRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     '''
     queryset = models.CollegeModel.objects.all()
     serializer_class = serializers.CollegeCreateUpdateSerializer
+    plan_serializer_class = serializers.CollegeSerializer
     permission_classes = [permissions.IsAuthenticated & (UserIsAdmin)]
     lookup_field = 'pk'
 
     #? get single College
     def get(self, request, *args, **kwargs):
         college = self.get_object()
-        serializer = serializers.CollegeSerializer(college)
+        serializer = serializers.CollegeSerializer(
+            college, context={'request': request})
         return Response(serializer.data)
 
     #? Update College of given Id
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from . import models
 
 from university import models as uni_models
+from api.fieldsets import SparseFieldsetMixin
 
 ##############################################################################################
 # Start:Nested Serialisers
@@ -36,7 +37,7 @@ class CourseUniSerializer(serializers.ModelSerializer):
 ##############################################################################################
 
 
-class CourseFullSerializer(serializers.ModelSerializer):
+class CourseFullSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer to display course data
         
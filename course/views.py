@@ -16,6 +16,8 @@ from . import serializers, models
 from user.permissions import UserIsAdmin, UserIsPrincipal, UserIsHOD, UserIsTeacher
 
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
+from api.response_cache import ResponseCacheMixin
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +60,8 @@ logger = logging.getLogger(__name__)
         'Returns list of all Courses.\n\nFilters:\n\n- is_practical\n\n- university(id)\n\nOrdering:\n\n- default: -created_on\n\n- allowed: created_on, -created_on'
     ),
 )
-class CourseListCreateAPIView(generics.ListCreateAPIView):
+class CourseListCreateAPIView(ResponseCacheMixin, QueryPlanMixin,
+                              generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -69,6 +72,7 @@ class CourseListCreateAPIView(generics.ListCreateAPIView):
     '''
     queryset = models.CourseModel.objects.all()
     serializer_class = serializers.CourseFullSerializer
+    cache_scope = 'course'
     permission_classes = [
         permissions.IsAuthenticated &
         (UserIsAdmin | UserIsPrincipal | UserIsHOD | UserIsTeacher)
@@ -167,7 +171,8 @@ class CourseListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class CourseRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class CourseRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                         generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -183,6 +188,7 @@ class CourseRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     '''
     queryset = models.CourseModel.objects.all()
     serializer_class = serializers.CourseSerializer
+    plan_serializer_class = serializers.CourseFullSerializer
     permission_classes = [
         permissions.IsAuthenticated &
         (UserIsAdmin | UserIsHOD | UserIsPrincipal | UserIsTeacher)
@@ -192,7 +198,8 @@ class CourseRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single Course
     def get(self, request, *args, **kwargs):
         course = self.get_object()
-        serializer = serializers.CourseFullSerializer(course)
+        serializer = serializers.CourseFullSerializer(
+            course, context={'request': request})
         return Response(serializer.data)
 
     #? Update Course of given Id
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from api.search import AddTrigramIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0010_alter_departmentmodel_college'),
+    ]
+
+    operations = [
+        AddTrigramIndex(
+            model_name='departmenttypemodel',
+            field='department_name',
+            name='dept_type_name_trgm',
+        ),
+    ]
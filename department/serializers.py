@@ -3,6 +3,7 @@ from rest_framework import serializers
 from . import models
 from college import serializers as college_serializers
 from college.models import CollegeModel
+from api.fieldsets import SparseFieldsetMixin
 
 DEPARTMENT_FIELDS = [
     'id',
@@ -47,7 +48,8 @@ class DeptNameRelSerializer(serializers.ModelSerializer):
 
 ##############################################################################################
 # Department Serializers
-class DepartmentFullSerializer(serializers.ModelSerializer):
+class DepartmentFullSerializer(SparseFieldsetMixin,
+                               serializers.ModelSerializer):
     '''
         Serializer to display Department Data
     '''
@@ -91,7 +93,8 @@ class DepartmentTypeSerializer(serializers.ModelSerializer):
         ]
 
 
-class DepartmentTypeFullSerializer(serializers.ModelSerializer):
+class DepartmentTypeFullSerializer(SparseFieldsetMixin,
+                                   serializers.ModelSerializer):
     '''
         Serializer to Add, Edit and List Department Type Data
     '''
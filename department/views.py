@@ -5,7 +5,7 @@ from drf_spectacular.types import OpenApiTypes
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 
 from django_filters.rest_framework import DjangoFilterBackend
 from django.conf import settings
@@ -16,6 +16,9 @@ from .filters import DepartmentTypeFilter
 from user.permissions import UserIsAdmin, UserIsPrincipal, UserIsTeacher, UserIsTeacherRO
 
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
+from api.response_cache import ResponseCacheMixin
+from api.search import TrigramSearchFilter
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +59,7 @@ logger = logging.getLogger(__name__)
         },
         description='Returns list of all Department.'),
 )
-class DepartmentListCreateAPIView(generics.ListCreateAPIView):
+class DepartmentListCreateAPIView(QueryPlanMixin, generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -72,10 +75,12 @@ class DepartmentListCreateAPIView(generics.ListCreateAPIView):
         (UserIsAdmin | UserIsPrincipal | UserIsTeacherRO)
     ]
     pagination_class = StandardPagination
-    filter_backends = [OrderingFilter, SearchFilter, DjangoFilterBackend]
+    filter_backends = [
+        OrderingFilter, TrigramSearchFilter, DjangoFilterBackend
+    ]
     ordering_fields = ['created_on']
     ordering = '-created_on'
-    search_fields = ['$name__department_name']  #? fuzzy search using regex
+    search_fields = ['name__department_name']  #? trigram indexed search
     filterset_fields = [
         'name',
         'college',
@@ -169,7 +174,8 @@ class DepartmentListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class DepartmentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class DepartmentRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                             generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -185,6 +191,7 @@ class DepartmentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     '''
     queryset = models.DepartmentModel.objects.all()
     serializer_class = serializers.DepartmentSerializer
+    plan_serializer_class = serializers.DepartmentFullSerializer
     permission_classes = [
         permissions.IsAuthenticated &
         (UserIsAdmin | UserIsPrincipal | UserIsTeacherRO)
@@ -194,7 +201,8 @@ class DepartmentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single Department
     def get(self, request, *args, **kwargs):
         department = self.get_object()
-        serializer = serializers.DepartmentFullSerializer(department)
+        serializer = serializers.DepartmentFullSerializer(
+            department, context={'request': request})
         return Response(serializer.data)
 
     #? Update Department of given Id
@@ -253,7 +261,8 @@ class DepartmentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
         'Creates a new Department Type Object.\n\nAccessible by: Admin, Teacher'
     ),
 )
-class DepartmentTypeListCreateAPIView(generics.ListCreateAPIView):
+class DepartmentTypeListCreateAPIView(ResponseCacheMixin,
+                                      generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -264,6 +273,7 @@ class DepartmentTypeListCreateAPIView(generics.ListCreateAPIView):
     '''
     queryset = models.DepartmentTypeModel.objects.all()
     serializer_class = serializers.DepartmentTypeFullSerializer
+    cache_scope = 'department-type'
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_class = DepartmentTypeFilter
@@ -350,7 +360,8 @@ class DepartmentTypeRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single Department Type
     def get(self, request, *args, **kwargs):
         department_type = self.get_object()
-        serializer = serializers.DepartmentTypeFullSerializer(department_type)
+        serializer = serializers.DepartmentTypeFullSerializer(
+            department_type, context={'request': request})
 
         return Response(serializer.data)
 
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import JobModel
+
+
+@admin.register(JobModel)
+class JobModelAdmin(admin.ModelAdmin):
+    '''Admin View for JobModel'''
+
+    list_display = [
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'created_on',
+        'finished_on',
+    ]
+    list_filter = [
+        'name',
+        'status',
+    ]
+    ordering = [
+        '-created_on',
+    ]
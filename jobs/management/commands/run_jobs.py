@@ -0,0 +1,91 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs import queue
+
+
+def run_job(job):
+    try:
+        return queue.run_job(job)
+    finally:
+        #? every pool thread holds its own database connection
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Runs queued background Jobs with a pool of worker threads until stopped (or, with --once, until the queue is drained).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.JOBS_WORKERS,
+            help='Jobs run at the same time',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help='Seconds to wait when no Jobs are due',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no Jobs are due',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+
+        #? finish running Jobs before exiting on SIGTERM (e.g. dyno restart)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        self.stdout.write(f'Worker {worker} started with {workers} threads')
+        processed = 0
+        running = set()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while not self.stopping:
+                #? claim as many Jobs as threads are free, one slow Job
+                #? holds only its own thread
+                jobs = queue.claim_jobs(worker, workers - len(running))
+                running.update(executor.submit(run_job, job) for job in jobs)
+
+                if not running:
+                    if options['once']:
+                        break
+
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                #? wait for a free thread, or for Jobs due meanwhile
+                done, running = wait(
+                    running,
+                    timeout=None
+                    if len(running) == workers else options['poll_interval'],
+                    return_when=FIRST_COMPLETED,
+                )
+
+                processed += len(done)
+                for future in done:
+                    self.stdout.write(str(future.result()))
+
+            #? finish running Jobs before exiting
+            for future in running:
+                processed += 1
+                self.stdout.write(str(future.result()))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Worker {worker} processed {processed} Jobs'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+JOB_STATUS_CHOICES = [
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('succeeded', 'Succeeded'),
+    ('failed', 'Failed'),
+]
+
+
+class JobModel(models.Model):
+    '''Model definition for JobModel.'''
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10,
+        choices=JOB_STATUS_CHOICES,
+        default='queued',
+    )
+    result = models.JSONField(
+        blank=True,
+        null=True,
+    )
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(
+        max_length=100,
+        blank=True,
+    )
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='job',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+    )
+    created_on = models.DateTimeField(default=timezone.now)
+    finished_on = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        '''Meta definition for JobModel.'''
+
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            #? jobs due for a worker
+            models.Index(
+                fields=['run_at'],
+                name='job_queued_run_at_idx',
+                condition=models.Q(status='queued'),
+            ),
+            #? jobs of crashed workers
+            models.Index(
+                fields=['locked_at'],
+                name='job_running_locked_at_idx',
+                condition=models.Q(status='running'),
+            ),
+        ]
+
+    def __str__(self):
+        '''Unicode representation of JobModel.'''
+        return f'{self.name} #{self.id} ({self.status})'
@@ -0,0 +1,270 @@
+import datetime
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import JobModel
+
+logger = logging.getLogger(__name__)
+
+#? name -> (function, max attempts) of registered tasks
+TASKS = {}
+
+
+def task(name, max_attempts=None):
+    '''
+        Registers the decorated function as a task runnable by workers
+
+        The function is called with the Job payload as keyword arguments,
+        its return value (JSON serializable) is kept as the Job result.
+
+        args:
+            - name: unique name of the task
+            - max_attempts: runs before the Job is failed,
+              defaults to settings.JOBS_MAX_ATTEMPTS
+    '''
+
+    def decorator(func):
+        if name in TASKS:
+            raise ValueError(f'Task {name} is already registered')
+
+        TASKS[name] = (func, max_attempts)
+        return func
+
+    return decorator
+
+
+def enqueue(name, payload=None, user=None, run_at=None):
+    '''
+        Queues a Job running the task of given name
+
+        Note: Job is picked by workers once the current transaction commits
+
+        returns:
+            - created JobModel
+    '''
+    if name not in TASKS:
+        raise ValueError(f'Task {name} is not registered')
+
+    job = JobModel.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=TASKS[name][1] or settings.JOBS_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+        created_by_id=user.pk if user and user.is_authenticated else None,
+    )
+
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: run_job(claim(job)))
+
+    return job
+
+
+def schedule(name, run_at=None):
+    '''
+        Queues a Job running the task of given name, unless one is already
+        queued to run by run_at
+
+        Used for tasks draining a queue of their own (e.g. email outbox),
+        so a burst of work is picked up by one Job.
+    '''
+    run_at = run_at or timezone.now()
+
+    job = JobModel.objects.filter(
+        name=name,
+        status='queued',
+        run_at__lte=run_at,
+    ).first()
+
+    return job or enqueue(name, run_at=run_at)
+
+
+def get_backoff(attempts):
+    '''
+        Returns seconds to wait before retrying a Job failed attempts times
+    '''
+    return min(
+        settings.JOBS_RETRY_BACKOFF * 2**(attempts - 1),
+        settings.JOBS_RETRY_BACKOFF_MAX,
+    )
+
+
+def claim(job, worker='eager'):
+    '''
+        Marks given Job as running by worker
+
+        returns:
+            - the Job, None if another worker got it first
+    '''
+    now = timezone.now()
+
+    #? only update the Job if nobody changed it since it was read
+    claimed = JobModel.objects.filter(
+        id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+    ).update(
+        status='running',
+        locked_by=worker,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return None
+
+    job.status = 'running'
+    job.locked_by = worker
+    job.locked_at = now
+    job.attempts += 1
+
+    return job
+
+
+def fail_lost_jobs(stale):
+    '''
+        Fails Jobs of lost workers (locked before stale) out of attempts,
+        the lost run counts as one
+    '''
+    return JobModel.objects.filter(
+        status='running',
+        locked_at__lt=stale,
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status='failed',
+        error='Worker was lost while running the Job',
+        locked_by='',
+        locked_at=None,
+        finished_on=timezone.now(),
+    )
+
+
+def claim_jobs(worker, limit):
+    '''
+        Claims up to limit Jobs due for running, oldest first
+
+        Jobs not renewed (see heartbeat) for settings.JOBS_LOCK_TIMEOUT
+        are assumed lost with their worker, and claimed again while they
+        have attempts left.
+
+        returns:
+            - list of claimed JobModel
+    '''
+    now = timezone.now()
+    stale = now - datetime.timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+
+    queryset = JobModel.objects.filter(
+        Q(status='queued', run_at__lte=now)
+        | Q(status='running',
+            locked_at__lt=stale,
+            attempts__lt=F('max_attempts'))).order_by('run_at')
+
+    with transaction.atomic():
+        fail_lost_jobs(stale)
+
+        #? let concurrent workers skip rows already being claimed
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+
+        jobs = [claim(job, worker) for job in queryset[:limit]]
+
+    return [job for job in jobs if job is not None]
+
+
+@contextmanager
+def heartbeat(job):
+    '''
+        Renews locked_at of given running Job every
+        settings.JOBS_HEARTBEAT_INTERVAL seconds, from a thread of its own,
+        so live Jobs are never claimed again however long they run
+    '''
+    stopped = threading.Event()
+
+    def beat():
+        try:
+            while not stopped.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+                JobModel.objects.filter(
+                    id=job.id,
+                    status='running',
+                    locked_by=job.locked_by,
+                ).update(locked_at=timezone.now())
+
+        except Exception as ex:
+            logger.error(f'{job}: heartbeat stopped: {ex}')
+
+        finally:
+            #? connections are per thread
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_job(job):
+    '''
+        Runs the task of a claimed Job and records its outcome
+
+        Failed Jobs are queued again with exponential backoff until they
+        run out of attempts.
+    '''
+    if job is None:
+        return None
+
+    try:
+        func = TASKS[job.name][0]
+
+        with heartbeat(job):
+            result = func(**job.payload)
+
+    except Exception as ex:
+        logger.error(f'{job}: {ex}')
+
+        job.error = str(ex)
+        if job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_at = timezone.now() + datetime.timedelta(
+                seconds=get_backoff(job.attempts))
+        else:
+            job.status = 'failed'
+            job.finished_on = timezone.now()
+
+    else:
+        job.status = 'succeeded'
+        job.result = result
+        job.error = ''
+        job.finished_on = timezone.now()
+
+    job.locked_by = ''
+    job.locked_at = None
+    job.save(update_fields=[
+        'status',
+        'result',
+        'error',
+        'run_at',
+        'locked_by',
+        'locked_at',
+        'finished_on',
+    ])
+    logger.info(str(job))
+
+    return job
+
+
+def run_pending(worker='inline', limit=100):
+    '''
+        Runs Jobs due for running one after another, in this thread
+
+        returns:
+            - list of Jobs run
+    '''
+    return [run_job(job) for job in claim_jobs(worker, limit)]
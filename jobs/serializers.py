@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from .models import JobModel
+
+
+class JobSerializer(serializers.ModelSerializer):
+    '''
+        Serializer to Display Job status
+    '''
+
+    class Meta:
+        model = JobModel
+        fields = [
+            'id',
+            'name',
+            'status',
+            'result',
+            'error',
+            'attempts',
+            'max_attempts',
+            'run_at',
+            'created_on',
+            'finished_on',
+        ]
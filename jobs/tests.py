@@ -0,0 +1,319 @@
+import datetime
+import io
+import time
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from student.models import StudentModel
+
+from . import queue
+from .models import JobModel
+
+User = get_user_model()
+
+CALLS = []
+
+
+@queue.task('test.echo')
+def echo(value):
+    CALLS.append(value)
+    return {'value': value}
+
+
+@queue.task('test.fail', max_attempts=2)
+def fail():
+    raise ValueError('Test Failure')
+
+
+@queue.task('test.sleep')
+def sleep(value, seconds):
+    time.sleep(seconds)
+    CALLS.append(value)
+    return {'value': value}
+
+
+class TestJobQueue(APITestCase):
+    '''
+        Test Case to test Job queue and worker
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        CALLS.clear()
+
+    def test_Job_run(self):
+        '''
+            Test a queued Job is run once and its result kept
+        '''
+        job = queue.enqueue('test.echo', {'value': 1})
+        queue.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.result, {'value': 1})
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(CALLS, [1])
+
+        queue.run_pending()
+        self.assertEqual(CALLS, [1])
+
+    def test_Job_run_later(self):
+        '''
+            Test a Job is not run before its time
+        '''
+        job = queue.enqueue(
+            'test.echo',
+            {'value': 1},
+            run_at=timezone.now() + datetime.timedelta(hours=1),
+        )
+        queue.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+        self.assertEqual(CALLS, [])
+
+    def test_Job_retry(self):
+        '''
+            Test a failing Job is retried with backoff, then failed
+        '''
+        job = queue.enqueue('test.fail')
+        queue.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+        self.assertEqual(job.error, 'Test Failure')
+        self.assertGreater(job.run_at, timezone.now())
+
+        #? not due yet
+        self.assertEqual(queue.run_pending(), [])
+
+        JobModel.objects.filter(id=job.id).update(run_at=timezone.now())
+        queue.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_on)
+
+    def test_Job_stale(self):
+        '''
+            Test a Job left running by a lost worker is run again
+        '''
+        job = queue.enqueue('test.echo', {'value': 1})
+        queue.claim(job, 'lost')
+
+        self.assertEqual(queue.run_pending(), [])
+
+        JobModel.objects.filter(id=job.id).update(locked_at=timezone.now() -
+                                                  datetime.timedelta(days=1))
+        queue.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.attempts, 2)
+
+    def test_Job_stale_out_of_attempts(self):
+        '''
+            Test a Job lost with its worker on the last attempt is failed,
+            not run again
+        '''
+        job = queue.enqueue('test.fail')
+        queue.claim(job, 'lost')
+        queue.claim(job, 'lost')
+
+        JobModel.objects.filter(id=job.id).update(locked_at=timezone.now() -
+                                                  datetime.timedelta(days=1))
+        self.assertEqual(queue.run_pending(), [])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_on)
+
+    def test_Job_unknown(self):
+        '''
+            Test queueing an unregistered task
+        '''
+        with self.assertRaises(ValueError):
+            queue.enqueue('test.unknown')
+
+
+class TestJobViews(APITestCase):
+    '''
+        Test Case to test Job views and endpoints using Jobs
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Male',
+            is_teacher=True,
+        )
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def test_JobRetrieve(self):
+        '''
+            Test Job status is only visible to its creator and Admins
+        '''
+        job = queue.enqueue('test.echo', {'value': 1}, user=self.admin)
+        url = reverse('job-retrieve', kwargs={'pk': job.id})
+
+        self.client.force_authenticate(user=self.teacher)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['status'], 'queued')
+
+    @override_settings(STUDENT_IMPORT_ASYNC_THRESHOLD=2)
+    def test_StudentImport_queued(self):
+        '''
+            Test large Student imports are queued as a Job
+        '''
+        self.client.force_authenticate(user=self.teacher)
+
+        resp = self.client.post(
+            reverse('student-bulk-create'),
+            [{
+                'first_name': f'Test{iter}',
+                'last_name': 'Student',
+                'email': f'student{iter}@mail.com',
+                'mobile': '9999999999',
+                'address': 'Test Address',
+                'profile_image': 'https://example.com/image.png',
+            } for iter in range(3)],
+            format='json',
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(StudentModel.objects.count(), 0)
+
+        queue.run_pending()
+
+        resp = self.client.get(resp['Location'])
+        self.assertEqual(resp.data['status'], 'succeeded')
+        self.assertEqual(resp.data['result']['created'], 3)
+        self.assertEqual(StudentModel.objects.count(), 3)
+
+    def test_UserCreate_email_queued(self):
+        '''
+            Test welcome email of a created User is sent by a Job
+        '''
+        self.client.force_authenticate(user=self.admin)
+
+        resp = self.client.post(
+            reverse('user-list-create'),
+            {
+                'profile_image': 'https://example.com/image.png',
+                'profile_image_public_id': '',
+                'email': 'hod@mail.com',
+                'mobile': '9999999999',
+                'district': 'Jammu',
+                'address': 'Test Address',
+                'first_name': 'Test',
+                'last_name': 'HOD',
+                'gender': 'Male',
+                'is_admin': False,
+                'is_principal': False,
+                'is_hod': True,
+                'is_teacher': False,
+                'college': [],
+            },
+            format='json',
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+
+        #? the Job holds the User's id only
+        self.assertEqual(
+            JobModel.objects.get(name='user.welcome').payload,
+            {'user_id': resp.data['id']},
+        )
+
+        #? the welcome Job, then the dispatch it schedules
+        queue.run_pending()
+        queue.run_pending()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['hod@mail.com'])
+
+        #? a link to set the password, never the password
+        self.assertIn('/set-password/', mail.outbox[0].body)
+        self.assertNotIn('Password:', mail.outbox[0].body)
+
+
+class TestJobWorker(TransactionTestCase):
+    '''
+        Test Case to test worker threads, with Jobs committed as in
+        production
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        CALLS.clear()
+
+    def test_Worker_slow_job(self):
+        '''
+            Test a slow Job doesn't hold back Jobs claimed after it
+        '''
+        queue.enqueue('test.sleep', {'value': 'slow', 'seconds': 1})
+        for value in range(4):
+            queue.enqueue('test.sleep', {'value': value, 'seconds': 0})
+
+        call_command(
+            'run_jobs',
+            workers=2,
+            poll_interval=0.05,
+            once=True,
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(CALLS, [0, 1, 2, 3, 'slow'])
+        self.assertFalse(JobModel.objects.exclude(status='succeeded').exists())
+
+    @override_settings(JOBS_HEARTBEAT_INTERVAL=0.05)
+    def test_Job_heartbeat(self):
+        '''
+            Test locks of running Jobs are renewed, so they are not
+            claimed again
+        '''
+        job = queue.claim(queue.enqueue('test.echo', {'value': 1}), 'worker')
+        locked_at = job.locked_at
+
+        with queue.heartbeat(job):
+            time.sleep(0.3)
+
+        job.refresh_from_db()
+        self.assertGreater(job.locked_at, locked_at)
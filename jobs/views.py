@@ -0,0 +1,82 @@
+import logging
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+
+from rest_framework import status, generics, permissions
+from rest_framework.response import Response
+
+from django.urls import reverse
+
+from authlogic.authentication import AuthenticationPolicyMixin
+from user.roles import get_role_scope
+
+from .serializers import JobSerializer
+from .models import JobModel
+
+logger = logging.getLogger(__name__)
+
+
+def job_accepted(request, job, detail):
+    '''
+        Returns a 202 response for a queued Job, pointing to its status
+    '''
+    url = request.build_absolute_uri(
+        reverse('job-retrieve', kwargs={'pk': job.id}))
+
+    response = {
+        'detail': [detail],
+        'job': {
+            'id': job.id,
+            'status': job.status,
+            'url': url,
+        },
+    }
+    logger.info(response)
+
+    return Response(
+        response,
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': url},
+    )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        description=
+        'Returns status of the Job of given Id, and its result once finished.\n\nargs: pk',
+        responses={
+            #? 200
+            status.HTTP_200_OK:
+            OpenApiResponse(
+                description='Job Status',
+                response=JobSerializer,
+            ),
+            #? 404
+            status.HTTP_404_NOT_FOUND:
+            OpenApiResponse(
+                description='Not found',
+                response=OpenApiTypes.OBJECT,
+            ),
+        }), )
+class JobRetrieveAPIView(AuthenticationPolicyMixin, generics.RetrieveAPIView):
+    '''
+        Allowed methods: GET
+
+        GET: Return status of Job of given Id
+
+        args: pk
+
+        Accessible by: Admin, User who queued the Job
+    '''
+    authentication_policy = 'machine'
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_field = 'pk'
+
+    def get_queryset(self):
+        scope = get_role_scope(self.request)
+        if scope.is_admin:
+            return JobModel.objects.all()
+
+        return JobModel.objects.filter(created_by=scope.user_id)
@@ -0,0 +1,25 @@
+from django.contrib import admin
+
+from .models import EmailModel
+
+
+@admin.register(EmailModel)
+class EmailModelAdmin(admin.ModelAdmin):
+    '''Admin View for EmailModel'''
+
+    list_display = [
+        'subject',
+        'to',
+        'provider',
+        'status',
+        'attempts',
+        'created_on',
+        'sent_on',
+    ]
+    list_filter = [
+        'provider',
+        'status',
+    ]
+    ordering = [
+        '-created_on',
+    ]
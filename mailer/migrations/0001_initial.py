@@ -0,0 +1,46 @@
+# Generated by Django 4.1.3 on 2026-10-18 15:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(default='default', max_length=50)),
+                ('from_email', models.CharField(blank=True, max_length=254)),
+                ('to', models.JSONField(default=list)),
+                ('subject', models.TextField()),
+                ('body', models.TextField()),
+                ('html_body', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_on', models.DateTimeField(blank=True, null=True)),
+                ('locked_on', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Email',
+                'verbose_name_plural': 'Emails',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='emailmodel',
+            index=models.Index(condition=models.Q(('status', 'queued')), fields=['provider', 'send_after'], name='email_queued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailmodel',
+            index=models.Index(condition=models.Q(('status', 'sent')), fields=['provider', 'sent_on'], name='email_sent_on_idx'),
+        ),
+    ]
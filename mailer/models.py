@@ -0,0 +1,68 @@
+from django.db import models
+from django.utils import timezone
+
+EMAIL_STATUS_CHOICES = [
+    ('queued', 'Queued'),
+    ('sending', 'Sending'),
+    ('sent', 'Sent'),
+    ('failed', 'Failed'),
+]
+
+
+class EmailModel(models.Model):
+    '''Model definition for EmailModel, an Email in the outbox.'''
+
+    provider = models.CharField(
+        max_length=50,
+        default='default',
+    )
+    from_email = models.CharField(
+        max_length=254,
+        blank=True,
+    )
+    to = models.JSONField(default=list)
+    subject = models.TextField()
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=EMAIL_STATUS_CHOICES,
+        default='queued',
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    send_after = models.DateTimeField(default=timezone.now)
+    created_on = models.DateTimeField(default=timezone.now)
+    sent_on = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+    #? when a dispatcher claimed it, while sending
+    locked_on = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        '''Meta definition for EmailModel.'''
+
+        verbose_name = 'Email'
+        verbose_name_plural = 'Emails'
+        indexes = [
+            #? Emails due for the dispatcher
+            models.Index(
+                fields=['provider', 'send_after'],
+                name='email_queued_idx',
+                condition=models.Q(status='queued'),
+            ),
+            #? Emails sent recently, for rate limits
+            models.Index(
+                fields=['provider', 'sent_on'],
+                name='email_sent_on_idx',
+                condition=models.Q(status='sent'),
+            ),
+        ]
+
+    def __str__(self):
+        '''Unicode representation of EmailModel.'''
+        return f'{self.subject} to {", ".join(self.to)} ({self.status})'
@@ -0,0 +1,311 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.queue import schedule
+
+from .models import EmailModel
+
+logger = logging.getLogger(__name__)
+
+#? seconds RATE_LIMIT of a provider applies to
+RATE_WINDOW = 60
+
+#? seconds before dispatching again when rate limited
+RATE_RETRY_DELAY = 10
+
+
+def get_provider(name):
+    '''
+        Returns config of given email provider, with defaults filled in
+    '''
+    return {
+        'BACKEND': None,
+        'OPTIONS': {},
+        'RATE_LIMIT': None,
+        'BATCH_SIZE': 50,
+        **settings.EMAIL_PROVIDERS[name],
+    }
+
+
+def schedule_dispatch(run_at=None):
+    '''
+        Queues a dispatcher Job, unless one is already queued to run by then
+    '''
+    return schedule('mailer.dispatch', run_at=run_at)
+
+
+def queue_email(to,
+                subject,
+                body,
+                from_email=None,
+                html_body='',
+                provider='default'):
+    '''
+        Adds an Email to the outbox, sent later by the dispatcher
+
+        args:
+            - to: list of recipients
+            - provider: key of settings.EMAIL_PROVIDERS to send it with
+
+        returns:
+            - created EmailModel
+    '''
+    if provider not in settings.EMAIL_PROVIDERS:
+        raise ValueError(f'Email provider {provider} is not configured')
+
+    email = EmailModel.objects.create(
+        provider=provider,
+        from_email=from_email or '',
+        to=list(to),
+        subject=subject,
+        body=body,
+        html_body=html_body or '',
+    )
+    schedule_dispatch()
+
+    return email
+
+
+def get_allowance(provider, config):
+    '''
+        Returns how many Emails provider may send now
+    '''
+    if not config['RATE_LIMIT']:
+        return config['BATCH_SIZE']
+
+    #? Emails being sent by other dispatchers count too
+    sent = EmailModel.objects.filter(
+        Q(status='sent',
+          sent_on__gte=timezone.now() -
+          datetime.timedelta(seconds=RATE_WINDOW))
+        | Q(status='sending'),
+        provider=provider,
+    ).count()
+
+    return max(0, min(config['BATCH_SIZE'], config['RATE_LIMIT'] - sent))
+
+
+def get_backoff(attempts):
+    '''
+        Returns seconds to wait before retrying an Email failed attempts times
+    '''
+    return min(
+        settings.EMAIL_OUTBOX_RETRY_BACKOFF * 2**(attempts - 1),
+        settings.EMAIL_OUTBOX_RETRY_BACKOFF_MAX,
+    )
+
+
+def claim_batch(provider, size):
+    '''
+        Marks up to size due Emails of provider as sending, in a short
+        transaction of its own
+
+        Emails left sending over settings.EMAIL_OUTBOX_SENDING_TIMEOUT
+        seconds by a crashed dispatcher are claimed again, or failed once
+        they reach settings.EMAIL_OUTBOX_MAX_ATTEMPTS.
+
+        returns:
+            - list of claimed EmailModel, attempts counted
+    '''
+    now = timezone.now()
+    stale = now - datetime.timedelta(
+        seconds=settings.EMAIL_OUTBOX_SENDING_TIMEOUT)
+
+    with transaction.atomic():
+        EmailModel.objects.filter(
+            provider=provider,
+            status='sending',
+            locked_on__lt=stale,
+            attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        ).update(
+            status='failed',
+            error='Dispatcher was lost while sending',
+            body='',
+            html_body='',
+            locked_on=None,
+        )
+
+        queryset = EmailModel.objects.filter(
+            Q(status='queued', send_after__lte=now)
+            | Q(status='sending', locked_on__lt=stale),
+            provider=provider,
+        ).order_by('send_after')
+
+        #? let concurrent dispatchers skip Emails being claimed
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+
+        emails = list(queryset[:size])
+        claimed = EmailModel.objects.filter(
+            id__in=[email.id for email in emails])
+
+        claimed.update(
+            status='sending',
+            locked_on=now,
+            attempts=F('attempts') + 1,
+        )
+
+    for email in emails:
+        email.status = 'sending'
+        email.locked_on = now
+        email.attempts += 1
+
+    return emails
+
+
+def send_batch(provider):
+    '''
+        Sends a batch of due Emails of provider over a single connection
+
+        Emails are claimed (see claim_batch) and their results recorded
+        in short transactions, no transaction is open while sending, so
+        a slow provider holds no locks. A crashed dispatcher leaves them
+        sending until they are claimed again. Failed Emails are retried
+        with exponential backoff until settings.EMAIL_OUTBOX_MAX_ATTEMPTS.
+        Bodies of sent and failed Emails are blanked, they may hold links
+        to set a password.
+
+        returns:
+            - count of sent Emails
+            - count of failed Emails
+    '''
+    config = get_provider(provider)
+    allowance = get_allowance(provider, config)
+    if not allowance:
+        return 0, 0
+
+    emails = claim_batch(provider, allowance)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+
+    try:
+        mail_connection = get_connection(
+            backend=config['BACKEND'],
+            **config['OPTIONS'],
+        )
+
+        with mail_connection:
+            for email in emails:
+                message = EmailMultiAlternatives(
+                    email.subject,
+                    email.body,
+                    email.from_email or settings.DEFAULT_FROM_EMAIL,
+                    email.to,
+                    connection=mail_connection,
+                )
+                if email.html_body:
+                    message.attach_alternative(email.html_body, 'text/html')
+
+                try:
+                    #? one message at a time, so a bad one fails alone
+                    if not mail_connection.send_messages([message]):
+                        raise ValueError('Email was not sent')
+
+                except Exception as ex:
+                    logger.error(f'{email}: {ex}')
+
+                    failed += 1
+                    email.error = str(ex)
+                    if email.attempts < settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                        email.status = 'queued'
+                        email.send_after = timezone.now() + datetime.timedelta(
+                            seconds=get_backoff(email.attempts))
+                    else:
+                        email.status = 'failed'
+                        email.body = email.html_body = ''
+
+                else:
+                    sent += 1
+                    email.status = 'sent'
+                    email.error = ''
+                    email.sent_on = timezone.now()
+                    email.body = email.html_body = ''
+
+    except Exception as ex:
+        #? e.g. provider unreachable, Emails not tried are queued again
+        logger.error(f'{provider}: {ex}')
+
+    finally:
+        for email in emails:
+            email.locked_on = None
+            if email.status == 'sending':
+                email.status = 'queued'
+
+        EmailModel.objects.bulk_update(emails, [
+            'body',
+            'html_body',
+            'status',
+            'attempts',
+            'error',
+            'send_after',
+            'sent_on',
+            'locked_on',
+        ])
+
+    logger.info(f'{provider}: {sent} Emails sent, {failed} failed')
+
+    return sent, failed
+
+
+def purge_sent():
+    '''
+        Deletes Emails sent over settings.EMAIL_OUTBOX_SENT_RETENTION
+        seconds ago
+
+        returns:
+            - count of deleted Emails
+    '''
+    deleted, _ = EmailModel.objects.filter(
+        status='sent',
+        sent_on__lt=timezone.now() -
+        datetime.timedelta(seconds=settings.EMAIL_OUTBOX_SENT_RETENTION),
+    ).delete()
+
+    return deleted
+
+
+def dispatch():
+    '''
+        Sends due Emails of every provider, as allowed by their rate limits
+
+        A dispatcher Job is queued for Emails left in the outbox (rate
+        limited or waiting for a retry).
+
+        returns:
+            - dict of sent and failed counts
+    '''
+    sent = failed = 0
+
+    for provider in settings.EMAIL_PROVIDERS:
+        while True:
+            batch_sent, batch_failed = send_batch(provider)
+            if not batch_sent + batch_failed:
+                break
+
+            sent += batch_sent
+            failed += batch_failed
+
+    purge_sent()
+
+    send_after = EmailModel.objects.filter(
+        status='queued',
+        provider__in=list(settings.EMAIL_PROVIDERS),
+    ).order_by('send_after').values_list('send_after', flat=True).first()
+
+    if send_after:
+        #? due Emails left are rate limited, retry once the window moves on
+        schedule_dispatch(
+            max(
+                send_after,
+                timezone.now() + datetime.timedelta(seconds=RATE_RETRY_DELAY),
+            ))
+
+    return {'sent': sent, 'failed': failed}
@@ -0,0 +1,11 @@
+from jobs.queue import task
+
+from . import outbox
+
+
+@task('mailer.dispatch')
+def dispatch():
+    '''
+        Sends due Emails of the outbox, see outbox.dispatch
+    '''
+    return outbox.dispatch()
@@ -0,0 +1,193 @@
+import datetime
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+
+from jobs.models import JobModel
+from jobs.queue import run_pending
+
+from . import outbox
+from .models import EmailModel
+
+
+class CountingEmailBackend(EmailBackend):
+    '''
+        Local memory backend counting connections, fails to send
+        to recipients at fail.com
+    '''
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(to.endswith('@fail.com') for to in message.to):
+                raise ConnectionError('Recipient refused')
+
+        return super().send_messages(messages)
+
+
+def get_providers(**config):
+    return {
+        'default': {
+            'BACKEND': 'mailer.tests.CountingEmailBackend',
+            'BATCH_SIZE': 10,
+            **config,
+        },
+    }
+
+
+@override_settings(EMAIL_PROVIDERS=get_providers())
+class TestOutbox(TestCase):
+    '''
+        Test Case to test Email outbox and dispatcher
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        CountingEmailBackend.opened = 0
+
+    def queue_emails(self, count, domain='mail.com'):
+        for iter in range(count):
+            outbox.queue_email(
+                [f'user{iter}@{domain}'],
+                'Test Subject',
+                'Test Body',
+            )
+
+    def test_Outbox_dispatch(self):
+        '''
+            Test queued Emails are sent in batches by a single dispatcher Job
+        '''
+        self.queue_emails(25)
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            JobModel.objects.filter(name='mailer.dispatch').count(), 1)
+
+        run_pending()
+
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(CountingEmailBackend.opened, 3)
+        self.assertFalse(EmailModel.objects.exclude(status='sent').exists())
+
+    @override_settings(EMAIL_PROVIDERS=get_providers(RATE_LIMIT=5))
+    def test_Outbox_rate_limit(self):
+        '''
+            Test dispatcher sends no more than rate limit and comes back later
+        '''
+        self.queue_emails(8)
+        run_pending()
+
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertTrue(
+            JobModel.objects.filter(
+                name='mailer.dispatch',
+                status='queued',
+                run_at__gt=timezone.now(),
+            ).exists())
+
+        #? window moved on
+        EmailModel.objects.filter(status='sent').update(
+            sent_on=timezone.now() - datetime.timedelta(minutes=5))
+        JobModel.objects.filter(status='queued').update(run_at=timezone.now())
+        run_pending()
+
+        self.assertEqual(len(mail.outbox), 8)
+
+    def test_Outbox_retry(self):
+        '''
+            Test a failing Email is retried and doesn't hold others back
+        '''
+        self.queue_emails(1, domain='fail.com')
+        self.queue_emails(2)
+        run_pending()
+
+        self.assertEqual(len(mail.outbox), 2)
+
+        failing = EmailModel.objects.get(to=['user0@fail.com'])
+        self.assertEqual(failing.status, 'queued')
+        self.assertEqual(failing.attempts, 1)
+        self.assertEqual(failing.error, 'Recipient refused')
+        self.assertGreater(failing.send_after, timezone.now())
+
+        with self.settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2):
+            EmailModel.objects.filter(id=failing.id).update(
+                send_after=timezone.now())
+            JobModel.objects.filter(status='queued').update(
+                run_at=timezone.now())
+            run_pending()
+
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, 'failed')
+
+    def test_Outbox_bodies_purged(self):
+        '''
+            Test bodies of sent Emails are blanked and old ones deleted
+        '''
+        self.queue_emails(2)
+        run_pending()
+
+        self.assertEqual(mail.outbox[0].body, 'Test Body')
+        self.assertFalse(EmailModel.objects.exclude(body='').exists())
+
+        EmailModel.objects.filter(to=['user0@mail.com']).update(
+            sent_on=timezone.now() - datetime.timedelta(days=30))
+
+        self.assertEqual(outbox.purge_sent(), 1)
+        self.assertEqual(EmailModel.objects.count(), 1)
+
+    def test_Outbox_no_transaction_while_sending(self):
+        '''
+            Test Emails are claimed before sending, with no transaction
+            left open while sending
+        '''
+        self.queue_emails(2)
+        depth = len(connection.atomic_blocks)
+        seen = []
+
+        def send_messages(backend, messages):
+            seen.append((
+                len(connection.atomic_blocks),
+                EmailModel.objects.filter(status='sending').count(),
+            ))
+            return len(messages)
+
+        with mock.patch.object(CountingEmailBackend, 'send_messages',
+                               send_messages):
+            self.assertEqual(outbox.send_batch('default'), (2, 0))
+
+        self.assertEqual(seen, [(depth, 2), (depth, 2)])
+        self.assertFalse(EmailModel.objects.exclude(status='sent').exists())
+
+    def test_Outbox_reclaim(self):
+        '''
+            Test Emails of a lost dispatcher are claimed again, and failed
+            once out of attempts
+        '''
+        self.queue_emails(2)
+        outbox.claim_batch('default', 2)
+
+        #? not stale yet
+        self.assertEqual(outbox.send_batch('default'), (0, 0))
+
+        lost = timezone.now() - datetime.timedelta(hours=1)
+        EmailModel.objects.filter(to=['user0@mail.com']).update(locked_on=lost)
+        EmailModel.objects.filter(to=['user1@mail.com']).update(locked_on=lost,
+                                                                attempts=5)
+
+        with self.settings(EMAIL_OUTBOX_MAX_ATTEMPTS=5):
+            self.assertEqual(outbox.send_batch('default'), (1, 0))
+
+        self.assertEqual(
+            EmailModel.objects.get(to=['user1@mail.com']).status, 'failed')
+        self.assertEqual(
+            EmailModel.objects.get(to=['user0@mail.com']).attempts, 2)
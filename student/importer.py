@@ -0,0 +1,224 @@
+import codecs
+import csv
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from rest_framework.exceptions import ValidationError
+
+from college.models import CollegeModel
+from classes.models import ClassModel
+
+from .models import StudentModel
+from .serializers import StudentImportSerializer
+
+#? values per IN (...) of set queries, keeps under SQLite's variable limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+class StudentImportError(Exception):
+    pass
+
+
+def read_csv(file):
+    '''
+        Yields rows of a CSV file as dicts keyed by its header
+
+        Note: empty cells are left out so model defaults apply
+    '''
+    reader = csv.DictReader(codecs.iterdecode(file, 'utf-8-sig'))
+
+    for row in reader:
+        yield {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and value is not None and value.strip() != ''
+        }
+
+
+def read_rows(data, file=None):
+    '''
+        Returns rows of a Student import
+
+        args:
+            - data: list of Students (JSON body)
+            - file: uploaded CSV or JSON file, takes precedence over data
+    '''
+    if file is not None:
+        if file.name.lower().endswith('.json'):
+            try:
+                data = json.load(file)
+            except ValueError as ex:
+                raise StudentImportError(f'Invalid JSON file: {ex}')
+        else:
+            try:
+                return list(read_csv(file))
+            except (UnicodeDecodeError, csv.Error) as ex:
+                raise StudentImportError(f'Invalid CSV file: {ex}')
+
+    if not isinstance(data, list):
+        raise StudentImportError(
+            'Expected a list of Students or a CSV/JSON file')
+
+    return data
+
+
+def _chunks(values, size=LOOKUP_CHUNK_SIZE):
+    values = list(values)
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
+
+
+def get_existing_roll_nos(roll_nos):
+    '''
+        Returns the given university roll numbers already in use
+    '''
+    existing = set()
+    for chunk in _chunks(roll_nos):
+        existing.update(
+            StudentModel.objects.filter(
+                university_roll_no__in=chunk).values_list(
+                    'university_roll_no',
+                    flat=True,
+                ))
+
+    return existing
+
+
+def get_existing_colleges(ids):
+    '''
+        Returns the given College ids that exist
+    '''
+    existing = set()
+    for chunk in _chunks(ids):
+        existing.update(
+            CollegeModel.objects.filter(id__in=chunk).values_list(
+                'id',
+                flat=True,
+            ))
+
+    return existing
+
+
+def validate_rows(rows):
+    '''
+        Validates rows of a Student import
+
+        Fields of every row are validated on their own, uniqueness of
+        university roll numbers (in the database and within the rows)
+        and existence of Colleges are checked with a query per set.
+
+        returns:
+            - list of (row number, validated data) of valid rows
+            - list of {'row', 'errors'} of invalid rows
+    '''
+    serializer = StudentImportSerializer()
+    valid = []
+    errors = []
+
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({
+                'row': number,
+                'errors': {
+                    'non_field_errors': ['Expected an object']
+                },
+            })
+            continue
+
+        try:
+            valid.append((number, serializer.run_validation(row)))
+        except ValidationError as ex:
+            errors.append({'row': number, 'errors': ex.detail})
+
+    existing_roll_nos = get_existing_roll_nos({
+        item['university_roll_no']
+        for _, item in valid if 'university_roll_no' in item
+    })
+    existing_colleges = get_existing_colleges(
+        {item['college']
+         for _, item in valid if item.get('college')})
+
+    seen_roll_nos = set()
+    checked = []
+
+    for number, item in valid:
+        row_errors = {}
+        roll_no = item.get('university_roll_no')
+
+        if roll_no in existing_roll_nos:
+            row_errors['university_roll_no'] = [
+                'Student with this university roll no already exists.'
+            ]
+        elif roll_no in seen_roll_nos:
+            row_errors['university_roll_no'] = [
+                'Duplicate university roll no in the import.'
+            ]
+
+        if item.get('college') and item['college'] not in existing_colleges:
+            row_errors['college'] = [
+                f'Invalid pk "{item["college"]}" - object does not exist.'
+            ]
+
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+            continue
+
+        if roll_no:
+            seen_roll_nos.add(roll_no)
+        checked.append((number, item))
+
+    errors.sort(key=lambda error: error['row'])
+
+    return checked, errors
+
+
+def import_students(rows, for_class=None, batch_size=None):
+    '''
+        Imports Students from given rows
+
+        Valid rows are inserted in batches, invalid rows are reported and
+        skipped. When for_class is given the created Students are
+        enrolled into it, in the same transaction as the insert.
+
+        args:
+            - rows: list of dicts of Student fields
+            - for_class: ClassModel to enroll Students into
+            - batch_size: Students inserted per query
+
+        returns:
+            - dict of created count, created ids, enrolled count and errors
+    '''
+    batch_size = batch_size or settings.STUDENT_IMPORT_BATCH_SIZE
+    valid, errors = validate_rows(rows)
+
+    students = []
+    for _, item in valid:
+        college = item.pop('college', None)
+        students.append(StudentModel(college_id=college, **item))
+
+    with transaction.atomic():
+        students = StudentModel.objects.bulk_create(
+            students,
+            batch_size=batch_size,
+        )
+
+        enrolled = 0
+        if for_class is not None and students:
+            Roster = ClassModel.student.through
+            Roster.objects.bulk_create(
+                [
+                    Roster(classmodel_id=for_class.id, studentmodel=student)
+                    for student in students
+                ],
+                batch_size=batch_size,
+            )
+            enrolled = len(students)
+
+    return {
+        'created': len(students),
+        'ids': [student.id for student in students],
+        'enrolled': enrolled,
+        'errors': errors,
+    }
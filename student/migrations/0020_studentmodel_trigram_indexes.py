@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from api.search import AddTrigramIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0019_remove_universityrollno_student_and_more'),
+    ]
+
+    operations = [
+        AddTrigramIndex(
+            model_name='studentmodel',
+            field='first_name',
+            name='student_first_name_trgm',
+        ),
+        AddTrigramIndex(
+            model_name='studentmodel',
+            field='last_name',
+            name='student_last_name_trgm',
+        ),
+        AddTrigramIndex(
+            model_name='studentmodel',
+            field='university_roll_no',
+            name='student_uni_roll_no_trgm',
+        ),
+        AddTrigramIndex(
+            model_name='studentmodel',
+            field='class_roll_no',
+            name='student_class_roll_no_trgm',
+        ),
+    ]
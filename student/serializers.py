@@ -3,6 +3,7 @@ from rest_framework import serializers
 from . import models
 from university.models import UniversityModel
 from college.models import CollegeModel
+from api.fieldsets import SparseFieldsetMixin
 
 ##############################################################################################
 # Start:Nested Serialisers
@@ -51,7 +52,7 @@ class CollegeSerializer(serializers.ModelSerializer):
 ##############################################################################################
 
 
-class StudentFullSerializer(serializers.ModelSerializer):
+class StudentFullSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer to Display Student Data
     '''
@@ -86,17 +87,56 @@ class StudentCreateUpdateSerializerFull(serializers.ModelSerializer):
         ]
 
 
-#TODO: implement if possible
-class StudentBulkSerializer(serializers.ListSerializer):
+class StudentImportSerializer(serializers.ModelSerializer):
     '''
-        Parent Serializer for studentSerializer 
-        Used for Bulk Posting objects
+        Serializer to validate a single row of a Student import
+
+        Note: uniqueness of university_roll_no and existence of college
+        are checked for all rows at once by the importer
     '''
+    university_roll_no = serializers.CharField(
+        max_length=15,
+        required=False,
+    )
+    college = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+    )
+
+    class Meta:
+        model = models.StudentModel
+        fields = [
+            'first_name',
+            'last_name',
+            'email',
+            'mobile',
+            'address',
+            'district',
+            'profile_image',
+            'gender',
+            'university_roll_no',
+            'class_roll_no',
+            'college',
+        ]
 
-    def create(self, validated_data):
 
-        studentlist = [models.StudentModel(**item) for item in validated_data]
-        return models.StudentModel.objects.bulk_create(studentlist)
+class StudentImportRequestSerializer(serializers.Serializer):
+    '''
+        Serializer to document a Student import request
+    '''
+    file = serializers.FileField(
+        required=False,
+        help_text='CSV or JSON file of Students',
+    )
+    for_class = serializers.IntegerField(
+        required=False,
+        help_text='Class to enroll the imported Students into',
+    )
+    batch_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text='Students inserted per query',
+    )
 
 
 class StudentCreateUpdateSerializer(serializers.ModelSerializer):
@@ -125,8 +165,6 @@ class StudentSerializer(serializers.ModelSerializer):
     '''
 
     class Meta:
-        #? Nesting Serializer
-        list_serializer_class = StudentBulkSerializer
         model = models.StudentModel
         exclude = [
             'created_on',
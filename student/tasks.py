@@ -0,0 +1,19 @@
+from classes.models import ClassModel
+from jobs.queue import task
+
+from . import importer
+
+
+@task('student.import')
+def import_students(rows, for_class=None, batch_size=None):
+    '''
+        Imports Students from given rows, see importer.import_students
+    '''
+    if for_class is not None:
+        for_class = ClassModel.objects.get(id=for_class)
+
+    return importer.import_students(
+        rows,
+        for_class=for_class,
+        batch_size=batch_size,
+    )
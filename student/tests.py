@@ -1,3 +1,183 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from classes.models import ClassModel
+from college.models import CollegeModel
+
+from . import models
+
+User = get_user_model()
+
+
+class TestStudentImportViews(APITestCase):
+    '''
+        Test Case to test bulk Student import view
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.teacher = User.objects.create(
+            email='teacher@mail.com',
+            first_name='Test',
+            last_name='Teacher',
+            gender='Female',
+            is_teacher=True,
+        )
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            principal=self.teacher,
+        )
+        self.for_class = ClassModel.objects.create(
+            name='Test Class',
+            code='TC-1',
+            teacher=self.teacher,
+        )
+        models.StudentModel.objects.create(
+            first_name='Existing',
+            last_name='Student',
+            university_roll_no='EXISTING',
+        )
+
+        self.client.force_authenticate(user=self.teacher)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.force_authenticate(user=None)
+
+    def get_student(self, iter, **fields):
+        return {
+            'first_name': f'Test{iter}',
+            'last_name': 'Student',
+            'email': f'student{iter}@mail.com',
+            'mobile': '9999999999',
+            'address': 'Test Address',
+            'profile_image': 'https://example.com/image.png',
+            'university_roll_no': f'ROLL{iter}',
+            'college': self.college.id,
+            **fields,
+        }
+
+    def test_StudentImport_json(self):
+        '''
+            Test importing Students with per row errors
+        '''
+        resp = self.client.post(
+            reverse('student-bulk-create'),
+            [
+                self.get_student(1),
+                self.get_student(2, university_roll_no='EXISTING'),
+                self.get_student(3, college=self.college.id + 100),
+                self.get_student(4, email='not an email'),
+                self.get_student(5, university_roll_no='ROLL1'),
+                self.get_student(6),
+            ],
+            format='json',
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data['created'], 2)
+        self.assertEqual([error['row'] for error in resp.data['errors']],
+                         [2, 3, 4, 5])
+        self.assertIn('university_roll_no', resp.data['errors'][0]['errors'])
+        self.assertIn('college', resp.data['errors'][1]['errors'])
+        self.assertIn('email', resp.data['errors'][2]['errors'])
+        self.assertIn('university_roll_no', resp.data['errors'][3]['errors'])
+        self.assertEqual(
+            set(
+                models.StudentModel.objects.filter(
+                    id__in=resp.data['ids']).values_list(
+                        'university_roll_no',
+                        flat=True,
+                    )),
+            {'ROLL1', 'ROLL6'},
+        )
+
+    def test_StudentImport_csv_enroll(self):
+        '''
+            Test importing Students from CSV into a Class
+        '''
+        header = [
+            'first_name', 'last_name', 'email', 'mobile', 'address',
+            'profile_image', 'university_roll_no', 'college'
+        ]
+        lines = [','.join(header)] + [
+            ','.join(str(self.get_student(iter)[key]) for key in header)
+            for iter in range(5)
+        ]
+        file = SimpleUploadedFile(
+            'students.csv',
+            '\n'.join(lines).encode(),
+            content_type='text/csv',
+        )
+
+        resp = self.client.post(
+            reverse('student-bulk-create'),
+            {
+                'file': file,
+                'for_class': self.for_class.id,
+                'batch_size': 2,
+            },
+            format='multipart',
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data['created'], 5)
+        self.assertEqual(resp.data['enrolled'], 5)
+        self.assertEqual(resp.data['errors'], [])
+        self.assertEqual(
+            set(self.for_class.student.values_list('id', flat=True)),
+            set(resp.data['ids']),
+        )
+
+    def test_StudentImport_constant_queries(self):
+        '''
+            Test validation queries don't grow with number of rows
+        '''
+
+        def count_queries(count, offset):
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.client.post(
+                    reverse('student-bulk-create'),
+                    [self.get_student(offset + iter) for iter in range(count)],
+                    format='json',
+                )
+
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(resp.data['created'], count)
+
+            return len(queries)
+
+        self.assertEqual(count_queries(5, 0), count_queries(50, 100))
+
+    def test_StudentImport_invalid(self):
+        '''
+            Test importing only invalid rows or an unknown Class
+        '''
+        resp = self.client.post(
+            reverse('student-bulk-create'),
+            [self.get_student(1, university_roll_no='EXISTING')],
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data['created'], 0)
+
+        resp = self.client.post(
+            reverse('student-bulk-create') +
+            f'?for_class={self.for_class.id + 100}',
+            [self.get_student(1)],
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(
+            models.StudentModel.objects.filter(
+                university_roll_no='ROLL1').exists())
@@ -1,6 +1,6 @@
 import logging
 
-from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, extend_schema_view
 from drf_spectacular.types import OpenApiTypes
 
 from rest_framework import generics, permissions, status
@@ -11,12 +11,17 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from django.conf import settings
 
-from . import serializers, models
+from . import serializers, models, importer
 from .filters import StudentFilter
 
+from classes.models import ClassModel
+from jobs.queue import enqueue
+from jobs.views import job_accepted
 from user.permissions import UserIsAdmin, UserIsHOD, UserIsTeacher
+from authlogic.authentication import AuthenticationPolicyMixin
 
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +66,7 @@ logger = logging.getLogger(__name__)
         'Returns list of all Students.\n\nOrdering:\n\n- default: -created_on\n\n- allowed: created_on, -created_on'
     ),
 )
-class StudentListCreateAPIView(generics.ListCreateAPIView):
+class StudentListCreateAPIView(QueryPlanMixin, generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -180,7 +185,8 @@ class StudentListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class StudentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class StudentRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                          generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -204,7 +210,8 @@ class StudentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single Student
     def get(self, request, *args, **kwargs):
         student = self.get_object()
-        serializer = serializers.StudentFullSerializer(student)
+        serializer = serializers.StudentFullSerializer(
+            student, context={'request': request})
         return Response(serializer.data)
 
     #? Update Student of given Id
@@ -250,15 +257,26 @@ class StudentRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
         return Response(response, status=status.HTTP_200_OK)
 
 
-class StudentBulkCreateAPIView(generics.CreateAPIView):
+class StudentBulkCreateAPIView(AuthenticationPolicyMixin,
+                               generics.CreateAPIView):
     '''
         Allowed methods: Bulk Post
 
         
-        POST: Bulk Creates Student objects
+        POST: Bulk Creates (imports) Student objects from a list of
+        Students (JSON) or an uploaded CSV/JSON `file`
+
+        Valid rows are created, invalid rows are reported by row number.
+        Imports larger than STUDENT_IMPORT_ASYNC_THRESHOLD rows are queued
+        as a Job (202), its result has the same shape.
+
+        query params:
+            - for_class: id of Class to enroll created Students into
+            - batch_size: Students inserted per query
 
         Accessible by: Admin, HOD, Teacher
     '''
+    authentication_policy = 'machine'
     queryset = models.StudentModel.objects.all()
     serializer_class = serializers.StudentFullSerializer
     permission_classes = [
@@ -267,28 +285,74 @@ class StudentBulkCreateAPIView(generics.CreateAPIView):
 
     #? Bulk Create Student Objects
     @extend_schema(
-        request=serializers.StudentSerializer,
+        request={
+            'application/json': serializers.StudentImportSerializer(many=True),
+            'multipart/form-data': serializers.StudentImportRequestSerializer,
+        },
+        parameters=[
+            OpenApiParameter('for_class', OpenApiTypes.INT),
+            OpenApiParameter('batch_size', OpenApiTypes.INT),
+        ],
         responses={
             #? 201
             status.HTTP_201_CREATED:
             OpenApiResponse(description='Students Added Successfully'),
+            #? 202
+            status.HTTP_202_ACCEPTED:
+            OpenApiResponse(description='Students Import Queued'),
             #? 400
             status.HTTP_400_BAD_REQUEST:
             OpenApiResponse({})
         },
         description=
-        'Bulk Post Students \n\nPOST: Bulk Creates Student objects \n\nAccessible by: Admin, HOD, Teacher',
+        'Bulk Post Students \n\nPOST: Bulk Creates (imports) Student objects from a list of Students (JSON) or an uploaded CSV/JSON file. Large imports are queued as a Job, see /api/jobs/<id>/ \n\nAccessible by: Admin, HOD, Teacher',
     )
     def post(self, request, *args, **kwargs):
-        serializer = serializers.StudentSerializer(
-            data=request.data,
-            many=True,
-        )
-        serializer.is_valid(raise_exception=True)
+        params = request.query_params.dict()
+        if hasattr(request.data, 'getlist'):
+            for key in ['for_class', 'batch_size']:
+                if key in request.data:
+                    params.setdefault(key, request.data[key])
+
+        params = serializers.StudentImportRequestSerializer(data=params)
+        params.is_valid(raise_exception=True)
+
+        for_class = None
+        if params.validated_data.get('for_class'):
+            for_class = ClassModel.objects.filter(
+                id=params.validated_data['for_class']).first()
+
+            if for_class is None:
+                return Response(
+                    {'detail': 'Class does not exist'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
         try:
+            rows = importer.read_rows(
+                request.data,
+                file=request.FILES.get('file'),
+            )
 
-            serializer.save()
+            #? large imports are run by a background Job
+            if len(rows) > settings.STUDENT_IMPORT_ASYNC_THRESHOLD:
+                job = enqueue(
+                    'student.import',
+                    {
+                        'rows': rows,
+                        'for_class': for_class and for_class.id,
+                        'batch_size': params.validated_data.get('batch_size'),
+                    },
+                    user=request.user,
+                )
+
+                return job_accepted(request, job, 'Students Import Queued')
+
+            result = importer.import_students(
+                rows,
+                for_class=for_class,
+                batch_size=params.validated_data.get('batch_size'),
+            )
 
         except Exception as ex:
             logger.error(str(ex))
@@ -296,7 +360,20 @@ class StudentBulkCreateAPIView(generics.CreateAPIView):
             return Response({'detail': str(ex)},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        response = {'detail': ['Students Added Successfully']}
-        logger.info(response)
+        if result['errors'] and not result['created']:
+            return Response(
+                {
+                    'detail': ['No Students Added'],
+                    **result
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = {'detail': ['Students Added Successfully'], **result}
+        logger.info({
+            'detail': response['detail'],
+            'created': result['created'],
+            'errors': len(result['errors']),
+        })
 
         return Response(response, status=status.HTTP_201_CREATED)
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from api.search import AddTrigramIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('university', '0007_universitymodel_website'),
+    ]
+
+    operations = [
+        AddTrigramIndex(
+            model_name='universitymodel',
+            field='name',
+            name='university_name_trgm',
+        ),
+    ]
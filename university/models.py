@@ -40,6 +40,10 @@ class UniversityModel(models.Model):
         '''
             Returns the count of Colleges affiliated to this University.
         '''
+        #? annotated by University views, saves a COUNT per University
+        if hasattr(self, 'college_count'):
+            return self.college_count
+
         return self.college.count()
 
     def __str__(self):
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from .models import UniversityModel
 from college.models import CollegeModel
 from college import serializers as college_serializers
+from api.fieldsets import SparseFieldsetMixin
 
 
 ##############################################################################################
@@ -26,18 +27,23 @@ class UniCollegeSerializer(serializers.ModelSerializer):
 ##############################################################################################
 
 
-class UniversitySerializer(serializers.ModelSerializer):
+class UniversitySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer for LIsting University Data
     '''
 
     college_affiliated = UniCollegeSerializer(
-        source='get_college_affiliated',
+        source='college',
         many=True,
         read_only=True,
     )
     college_affiliated_count = serializers.IntegerField(
-        source='get_college_affiliated_count')
+        source='get_college_affiliated_count',
+        read_only=True,
+    )
+
+    #? nested Colleges are heavy, displayed only with `?include=colleges`
+    optional_fields = {'colleges': ['college_affiliated']}
 
     class Meta:
         model = UniversityModel
@@ -1,3 +1,135 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.response_cache import get_response_cache
+from college.models import CollegeModel
+
+from . import models
+
+User = get_user_model()
+
+
+class TestUniversityViews(APITestCase):
+    '''
+        Test Case to test University views
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.university = models.UniversityModel.objects.create(
+            name='Test University',
+            alias='TU',
+        )
+
+        get_response_cache().clear()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        get_response_cache().clear()
+        self.client.force_authenticate(user=None)
+
+    def add_colleges(self, count):
+        '''
+            Adds given number of Universities with as many Colleges each
+        '''
+        offset = models.UniversityModel.objects.count()
+
+        for iter in range(offset, offset + count):
+            university = models.UniversityModel.objects.create(
+                name=f'Test University {iter}',
+                alias='TU',
+            )
+            for college in range(count):
+                principal = User.objects.create(
+                    email=f'principal{iter}-{college}@mail.com',
+                    first_name='Test',
+                    last_name='Principal',
+                    gender='Male',
+                    is_principal=True,
+                )
+                CollegeModel.objects.create(
+                    name=f'Test College {iter}-{college}',
+                    university=university,
+                    principal=principal,
+                ).hod.add(self.admin)
+
+    def count_list_queries(self, params):
+        get_response_cache().clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse('university-list-create'), params)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return len(queries)
+
+    def test_UniversityListing(self):
+        '''
+            Test Colleges are counted and listed only when included
+        '''
+        CollegeModel.objects.create(
+            name='Test College',
+            university=self.university,
+            principal=self.admin,
+        )
+
+        resp = self.client.get(reverse('university-list-create'))
+        item = resp.data['results'][0]
+
+        self.assertEqual(item['college_affiliated_count'], 1)
+        self.assertNotIn('college_affiliated', item)
+
+        resp = self.client.get(
+            reverse('university-list-create'),
+            {'include': 'colleges'},
+        )
+        item = resp.data['results'][0]
+
+        self.assertEqual(item['college_affiliated_count'], 1)
+        self.assertEqual(item['college_affiliated'][0]['name'], 'Test College')
+
+    def test_UniversityListing_constant_queries(self):
+        '''
+            Test listing Universities runs same queries regardless of size
+        '''
+        self.add_colleges(2)
+        small = self.count_list_queries({'include': 'colleges'})
+
+        self.add_colleges(4)
+        large = self.count_list_queries({'include': 'colleges'})
+
+        self.assertEqual(small, large)
+        self.assertLess(self.count_list_queries({}), large)
+
+    def test_UniversityDetail(self):
+        '''
+            Test University details with included Colleges
+        '''
+        resp = self.client.get(
+            reverse(
+                'university-retrieve-update-destroy',
+                kwargs={'pk': self.university.id},
+            ),
+            {'include': 'colleges'},
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['college_affiliated_count'], 0)
+        self.assertEqual(resp.data['college_affiliated'], [])
@@ -5,16 +5,20 @@ from drf_spectacular.types import OpenApiTypes
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 
 from django_filters.rest_framework import DjangoFilterBackend
 from django.conf import settings
+from django.db.models import Count
 
 from . import models, serializers
 
 from user.permissions import UserIsAdmin
 
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
+from api.response_cache import ResponseCacheMixin
+from api.search import TrigramSearchFilter
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +57,12 @@ logger = logging.getLogger(__name__)
                 response=OpenApiTypes.OBJECT,
             ),
         },
-        description='Returns list of all University.'),
+        description=
+        'Returns list of all University.\n\nInclude:\n\n- colleges: affiliated Colleges'
+    ),
 )
-class UniversityListCreateAPIView(generics.ListCreateAPIView):
+class UniversityListCreateAPIView(ResponseCacheMixin, QueryPlanMixin,
+                                  generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -65,20 +72,27 @@ class UniversityListCreateAPIView(generics.ListCreateAPIView):
         Filters:
             district
 
+        Include:
+            colleges: affiliated Colleges
+
         Ordering:
             default: -data_added
             allowed: date_added, -date_added
 
         Accessible by: Admin
     '''
-    queryset = models.UniversityModel.objects.all()
+    queryset = models.UniversityModel.objects.annotate(
+        college_count=Count('college'))
     serializer_class = serializers.UniversitySerializer
+    cache_scope = 'university'
     permission_classes = [permissions.IsAuthenticated & (UserIsAdmin)]
     pagination_class = StandardPagination
-    filter_backends = [OrderingFilter, SearchFilter, DjangoFilterBackend]
+    filter_backends = [
+        OrderingFilter, TrigramSearchFilter, DjangoFilterBackend
+    ]
     ordering_fields = ['date_added']
     ordering = '-date_added'
-    search_fields = ['$name']  #? fuzzy search using regex
+    search_fields = ['name']  #? trigram indexed search
     filterset_fields = ['district']
 
     #? Create a new University
@@ -108,7 +122,7 @@ class UniversityListCreateAPIView(generics.ListCreateAPIView):
 @extend_schema_view(
     get=extend_schema(
         description=
-        'Returns Single Ubiversity registered on Application of given Id.\n\nargs: pk',
+        'Returns Single Ubiversity registered on Application of given Id.\n\nargs: pk\n\nInclude:\n\n- colleges: affiliated Colleges',
         responses={
             #? 200
             status.HTTP_200_OK:
@@ -170,7 +184,8 @@ class UniversityListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class UniversityRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class UniversityRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                             generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -184,7 +199,8 @@ class UniversityRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
         
         Accessible by: Admin
     '''
-    queryset = models.UniversityModel.objects.all()
+    queryset = models.UniversityModel.objects.annotate(
+        college_count=Count('college'))
     serializer_class = serializers.UniversitySerializer
     permission_classes = [permissions.IsAuthenticated & (UserIsAdmin)]
     lookup_field = 'pk'
@@ -192,7 +208,8 @@ class UniversityRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single University
     def get(self, request, *args, **kwargs):
         university = self.get_object()
-        serializer = serializers.UniversitySerializer(university)
+        serializer = serializers.UniversitySerializer(
+            university, context={'request': request})
         return Response(serializer.data)
 
     #? Update University of given Id
@@ -65,6 +65,8 @@ INSTALLED_APPS = [
     'authlogic',
     'university',
     'contact',
+    'jobs',
+    'mailer',
 ]
 
 MIDDLEWARE = [
@@ -113,13 +115,31 @@ DATABASES = {
 # https://docs.djangoproject.com/en/4.0/topics/auth/passwords/#using-argon2-with-django
 
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'user.hashers.TunableArgon2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
     'django.contrib.auth.hashers.ScryptPasswordHasher',
 ]
 
+#? Argon2 costs, see `python manage.py calibrate_argon2` to pick them for
+#? a host, passwords hashed with other costs are rehashed on login
+ARGON2_TIME_COST = env.int('ARGON2_TIME_COST', default=2)
+ARGON2_MEMORY_COST = env.int('ARGON2_MEMORY_COST', default=102400)
+ARGON2_PARALLELISM = env.int('ARGON2_PARALLELISM', default=8)
+
+#? processes verifying passwords of logins (auth/token/), per web process,
+#? 0 verifies them in the request thread
+PASSWORD_HASHING_WORKERS = env.int('PASSWORD_HASHING_WORKERS', default=2)
+
+#? logins waiting for or running in those processes, others wait up to
+#? PASSWORD_HASHING_QUEUE_TIMEOUT seconds before being turned away (429)
+PASSWORD_HASHING_QUEUE_SIZE = 16
+PASSWORD_HASHING_QUEUE_TIMEOUT = 5
+
+#? concurrent logins of an account, more are turned away (429)
+LOGIN_CONCURRENCY_PER_ACCOUNT = 2
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -341,13 +361,37 @@ JAZZMIN_UI_TWEAKS={
 
 # yapf: enable
 
+#? Authentication Config
+#? authentication classes of Views by policy, see authlogic.authentication,
+#? no policy verifies passwords per request (BasicAuthentication)
+AUTHENTICATION_POLICIES = {
+    'default': (
+        'user.authentication.ClaimsJWTAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ),
+    #? machine clients (attendance kiosks, integration scripts)
+    'machine': (
+        'user.authentication.ClaimsJWTAuthentication',
+        'authlogic.authentication.ApiKeyAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ),
+}
+
+#? secret API keys are hashed with, set to keep keys valid across
+#? SECRET_KEY rotations
+API_KEY_SECRET = env.str('API_KEY_SECRET', default=SECRET_KEY)
+
+#? seconds to cache API keys, changes to them invalidate it earlier
+API_KEY_CACHE_TIMEOUT = 60
+
+#? seconds between writes of when API keys were last used
+API_KEY_LAST_USED_INTERVAL = 60
+
 #? DRF Config
 REST_FRAMEWORK = {
     #? Authentication Config
     'DEFAULT_AUTHENTICATION_CLASSES':
-    ('rest_framework_simplejwt.authentication.JWTAuthentication',
-     'rest_framework.authentication.SessionAuthentication',
-     'rest_framework.authentication.BasicAuthentication'),
+    AUTHENTICATION_POLICIES['default'],
 
     #? DRF Schema Class
     'DEFAULT_SCHEMA_CLASS':
@@ -384,6 +428,123 @@ REST_FRAMEWORK = {
     # 'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
 }
 
+#? JWT Config
+#? tokens claim roles and scope of their user, see user.authentication
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER':
+    'user.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER':
+    'user.authentication.ClaimsTokenRefreshSerializer',
+}
+
+#? build request.user from token claims instead of reading the database
+JWT_CLAIMS_AUTHENTICATION = env.bool('JWT_CLAIMS_AUTHENTICATION',
+                                     default=True)
+
+#? seconds between reads of new token revocations, per process, the
+#? process revoking a token rejects it at once
+TOKEN_REVOCATION_REFRESH_INTERVAL = 5
+
+#? seconds between full reloads of token revocations, dropping expired ones
+TOKEN_REVOCATION_RELOAD_INTERVAL = 3600
+
+#? bits and hashes per key of the Bloom filter of revoked tokens,
+#? 1M bits (128 KiB) and 7 hashes are ~1% false positives at 100k keys
+TOKEN_REVOCATION_BLOOM_SIZE = 1048576
+TOKEN_REVOCATION_BLOOM_HASHES = 7
+
+#? Cache Config
+#? default cache holds token versions and role scopes of users, and the
+#? response cache backend is separate, both are configurable, local memory suits a single dyno,
+#? a shared cache (e.g. django.core.cache.backends.redis.RedisCache with
+#? redis://127.0.0.1:6379) is needed once running on multiple nodes
+CACHES = {
+    'default': {
+        'BACKEND':
+        env.str(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION':
+        env.str('CACHE_LOCATION', default=''),
+    },
+    'responses': {
+        'BACKEND':
+        env.str(
+            'RESPONSE_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION':
+        env.str('RESPONSE_CACHE_LOCATION', default='responses'),
+    },
+}
+
+#? cache used by response cache of read heavy views
+RESPONSE_CACHE_ALIAS = 'responses'
+
+#? seconds to cache responses, changes to the data invalidate them earlier
+RESPONSE_CACHE_TIMEOUT = 300
+
+#? seconds to cache payloads of /api/auth/me/, changes to the user or
+#? their colleges invalidate them earlier
+AUTH_ME_CACHE_TIMEOUT = 300
+
+#? Role Config
+#? seconds to cache roles and scope of a user, changes to them
+#? invalidate it earlier
+ROLE_SCOPE_CACHE_TIMEOUT = 60
+
+#? seconds to cache token versions of users, checked on every request.
+#? Only safe with a cache shared between processes, local memory would
+#? trust tokens claiming old roles that long on other processes, so it
+#? defaults to 0 (read from the database) with the local memory cache
+TOKEN_VERSION_CACHE_TIMEOUT = env.int(
+    'TOKEN_VERSION_CACHE_TIMEOUT',
+    default=0 if CACHES['default']['BACKEND'].endswith('LocMemCache') else 30,
+)
+
+#? Pagination Config
+#? result sets up to this size are always counted exactly
+PAGINATION_EXACT_COUNT_LIMIT = 1000
+
+#? seconds to cache counts of larger result sets
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+
+#? Export Config
+#? rows fetched per round trip while streaming Attendance exports
+ATTENDANCE_EXPORT_CHUNK_SIZE = 2000
+
+#? Import Config
+#? Students inserted per query by bulk Student imports
+STUDENT_IMPORT_BATCH_SIZE = 1000
+
+#? Student imports with more rows are run by a background Job
+STUDENT_IMPORT_ASYNC_THRESHOLD = 1000
+
+#? Jobs Config
+#? run Jobs in the web process right after queueing (no worker needed)
+JOBS_EAGER = env.bool('JOBS_EAGER', default=False)
+
+#? threads of a worker (manage.py run_jobs)
+JOBS_WORKERS = env.int('JOBS_WORKERS', default=4)
+
+#? seconds a worker waits when no Jobs are due
+JOBS_POLL_INTERVAL = 2
+
+#? runs of a Job before it is failed, unless set by its task
+JOBS_MAX_ATTEMPTS = 3
+
+#? seconds before first retry of a failed Job, doubles every retry
+JOBS_RETRY_BACKOFF = 10
+JOBS_RETRY_BACKOFF_MAX = 3600
+
+#? seconds after which a running Job is assumed lost with its worker
+JOBS_LOCK_TIMEOUT = 1800
+
+#? seconds between renewals of the lock of a running Job, well below
+#? JOBS_LOCK_TIMEOUT
+JOBS_HEARTBEAT_INTERVAL = 60
+
 #? Spectacular Config
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Upasthiti API',
@@ -438,8 +599,42 @@ LOGGING = {
     },
 }
 
-#? max request size check
-DATA_UPLOAD_MAX_MEMORY_SIZE = None
+#? max request size check (excluding uploaded files)
+DATA_UPLOAD_MAX_MEMORY_SIZE = 2621440  #? 2.5 MB
+
+#? Image Upload Config
+#? storage uploaded images go to, api.image_storage.FileSystemImageStorage
+#? keeps them under MEDIA_ROOT (e.g. offline)
+IMAGE_STORAGE = env.str(
+    'IMAGE_STORAGE',
+    default='api.image_storage.CloudinaryImageStorage',
+)
+
+#? uploaded images larger than this are rejected while streamed to disk
+IMAGE_UPLOAD_MAX_SIZE = 10485760  #? 10 MB
+
+#? images are downscaled to fit in a box of this size (px)
+IMAGE_MAX_DIMENSION = 1600
+
+#? format (WEBP or JPEG) and quality images are re-encoded with
+IMAGE_FORMAT = env.str('IMAGE_FORMAT', default='WEBP')
+IMAGE_QUALITY = 80
+
+#? thumbnails generated for every image, name -> size of box (px)
+IMAGE_THUMBNAIL_SIZES = {
+    'thumbnail': 150,
+    'small': 480,
+}
+
+#? seconds replaced images wait before deletion, deletions meanwhile
+#? are batched together
+IMAGE_DELETE_DELAY = 60
+
+#? deletions of an image before it is failed, and left for a look
+IMAGE_DELETE_MAX_ATTEMPTS = 5
+
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
 
 #? Cloudinary Config
 cloudinary.config(
@@ -449,11 +644,62 @@ cloudinary.config(
     secure=True,
 )
 
+#? cloudinary API server, e.g. a fake server in tests
+CLOUDINARY_UPLOAD_PREFIX = env.str('CLOUDINARY_UPLOAD_PREFIX', default=None)
+
+#? HTTP connections to cloudinary kept alive per process,
+#? also uploads / deletes run in parallel
+CLOUDINARY_POOL_SIZE = 10
+
+#? seconds to wait for cloudinary to connect and respond
+CLOUDINARY_CONNECT_TIMEOUT = 5
+CLOUDINARY_READ_TIMEOUT = 60
+
 #? Email Config
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = env.str(
+    'EMAIL_BACKEND',
+    default='django.core.mail.backends.smtp.EmailBackend',
+)
+#? used by django.core.mail.backends.filebased.EmailBackend
+EMAIL_FILE_PATH = env.str('EMAIL_FILE_PATH', default='logs/emails')
 EMAIL_HOST = env.str('EMAIL_HOST')
 EMAIL_HOST_USER = env.str('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env.str('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = env.int('EMAIL_PORT')
 EMAIL_USE_TLS = True
 DEFAULT_FROM_EMAIL = env.str('DEFAULT_FROM_EMAIL')
+
+#? link to the frontend page setting a password, emailed to new Users,
+#? {uid} and {token} are posted back to /api/auth/password/set/
+PASSWORD_SET_URL = env.str(
+    'PASSWORD_SET_URL',
+    default='http://localhost:3000/set-password/{uid}/{token}/',
+)
+
+#? Email Outbox Config
+#? providers Emails are sent with, by the mailer dispatcher
+#?   BACKEND: email backend, EMAIL_BACKEND when None
+#?   OPTIONS: keyword arguments of the backend (e.g. host, port)
+#?   RATE_LIMIT: Emails sent per minute at most, no limit when None
+#?   BATCH_SIZE: Emails sent per connection
+EMAIL_PROVIDERS = {
+    'default': {
+        'BACKEND': None,
+        'OPTIONS': {},
+        'RATE_LIMIT': env.int('EMAIL_RATE_LIMIT', default=None),
+        'BATCH_SIZE': 50,
+    },
+}
+
+#? sends of an Email before it is failed
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+#? seconds before first retry of a failed Email, doubles every retry
+EMAIL_OUTBOX_RETRY_BACKOFF = 60
+EMAIL_OUTBOX_RETRY_BACKOFF_MAX = 3600
+
+#? seconds before Emails claimed by a lost dispatcher are claimed again
+EMAIL_OUTBOX_SENDING_TIMEOUT = 600
+
+#? seconds sent Emails are kept (without their bodies) before being deleted
+EMAIL_OUTBOX_SENT_RETENTION = 7 * 24 * 60 * 60
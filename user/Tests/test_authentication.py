@@ -0,0 +1,187 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from college.models import CollegeModel
+
+User = get_user_model()
+
+
+class TestClaimsAuthentication(APITestCase):
+    '''
+        Test Case to test JWT authentication from token claims
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        cache.clear()
+
+        self.admin = User.objects.create(
+            email='admin@mail.com',
+            first_name='Test',
+            last_name='Admin',
+            gender='Female',
+            is_admin=True,
+        )
+        self.admin.set_password('Test@123')
+        self.admin.save()
+
+        self.user = User.objects.create(
+            email='user@mail.com',
+            first_name='Test',
+            last_name='User',
+            gender='Male',
+            is_admin=True,
+            is_hod=True,
+        )
+        self.user.set_password('Test@123')
+        self.user.save()
+
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            address='Jammu',
+            alias_name='TC',
+            logo='https://i.pravatar.cc/300',
+            website='https://college.com',
+            mobile='9876543210',
+        )
+        self.college.hod.add(self.user)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        self.client.credentials()
+        cache.clear()
+
+    def get_tokens(self, email):
+        resp = self.client.post(
+            reverse('obtain_token_pair'),
+            {
+                'email': email,
+                'password': 'Test@123'
+            },
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        return resp.data
+
+    def get_list(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse('user-admin-list'))
+
+        return resp, len(queries)
+
+    def test_Token_claims(self):
+        '''
+            Test tokens claim roles and scope of the User
+        '''
+        access = AccessToken(self.get_tokens('user@mail.com')['access'])
+
+        self.assertEqual(access['roles'], ['admin', 'hod'])
+        self.assertEqual(access['college_ids'], [self.college.id])
+        self.assertEqual(
+            access['token_version'],
+            User.objects.get(pk=self.user.pk).token_version,
+        )
+
+    #? as with a cache shared between processes
+    @override_settings(TOKEN_VERSION_CACHE_TIMEOUT=30)
+    def test_ClaimsAuthentication_no_user_query(self):
+        '''
+            Test authenticating from claims skips reading the User
+        '''
+        access = self.get_tokens('user@mail.com')['access']
+        self.get_list(access)
+
+        resp, claims_queries = self.get_list(access)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        with override_settings(JWT_CLAIMS_AUTHENTICATION=False):
+            resp, user_queries = self.get_list(access)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(claims_queries, user_queries - 1)
+
+    def test_ClaimsAuthentication_role_change(self):
+        '''
+            Test role changes apply to tokens issued before them
+        '''
+        access = self.get_tokens('user@mail.com')['access']
+        tokens = self.get_tokens('admin@mail.com')
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        resp = self.client.patch(
+            reverse('user-retrieve-update-destroy',
+                    kwargs={'pk': self.user.pk}),
+            {
+                'is_admin': False,
+                'is_principal': False,
+                'is_hod': False,
+                'is_teacher': True,
+                'college': [],
+            },
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        resp, _ = self.get_list(access)
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ClaimsAuthentication_other_process(self):
+        '''
+            Test role changes made by another process apply at once with
+            the default (per process) cache
+        '''
+        access = self.get_tokens('user@mail.com')['access']
+
+        resp, queries = self.get_list(access)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        #? another process changes roles, its cache isn't this one's
+        User.objects.filter(pk=self.user.pk).update(
+            is_admin=False,
+            token_version='other-process',
+        )
+
+        resp, _ = self.get_list(access)
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_TokenRefresh_claims(self):
+        '''
+            Test refreshed access tokens claim current roles and scope
+        '''
+        refresh = self.get_tokens('user@mail.com')['refresh']
+
+        self.college.hod.remove(self.user)
+        self.user.refresh_from_db()
+        self.user.is_admin = False
+        self.user.save()
+
+        resp = self.client.post(
+            reverse('token_refresh'),
+            {'refresh': refresh},
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        access = AccessToken(resp.data['access'])
+        self.assertEqual(access['roles'], ['hod'])
+        self.assertEqual(access['college_ids'], [])
+
+        resp, _ = self.get_list(resp.data['access'])
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,114 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from user import passwords
+
+User = get_user_model()
+
+
+@override_settings(
+    ARGON2_TIME_COST=1,
+    ARGON2_MEMORY_COST=1024,
+    ARGON2_PARALLELISM=1,
+)
+class TestPasswordHashing(APITestCase):
+    '''
+        Test Case to test verification of passwords on login
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        cache.clear()
+        passwords.get_pool.cache_clear()
+
+        self.user = User.objects.create(
+            email='user@mail.com',
+            first_name='Test',
+            last_name='User',
+            gender='Male',
+        )
+        self.user.set_password('Test@123')
+        self.user.save()
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        pool = passwords.get_pool()
+        if pool is not None:
+            pool.shutdown()
+        passwords.get_pool.cache_clear()
+        cache.clear()
+
+    def login(self, password='Test@123'):
+        return self.client.post(
+            reverse('obtain_token_pair'),
+            {
+                'email': 'user@mail.com',
+                'password': password
+            },
+            format='json',
+        )
+
+    def test_Login_pool(self):
+        '''
+            Test passwords are verified in the process pool
+        '''
+        with self.settings(PASSWORD_HASHING_WORKERS=1):
+            resp = self.login()
+
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertIn('access', resp.data)
+            self.assertIsNotNone(passwords.get_pool())
+
+            resp = self.login('wrong')
+            self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_Login_inline(self):
+        '''
+            Test passwords are verified in the request thread without a pool
+        '''
+        with self.settings(PASSWORD_HASHING_WORKERS=0):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                self.login('wrong').status_code,
+                status.HTTP_401_UNAUTHORIZED,
+            )
+
+    def test_Login_rehash(self):
+        '''
+            Test passwords are rehashed on login when costs change
+        '''
+        with self.settings(PASSWORD_HASHING_WORKERS=0, ARGON2_TIME_COST=2):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        decoded = identify_hasher(self.user.password).decode(
+            self.user.password)
+
+        self.assertEqual(decoded['time_cost'], 2)
+        self.assertTrue(self.user.check_password('Test@123'))
+
+    def test_Login_account_concurrency(self):
+        '''
+            Test concurrent logins of an account beyond the limit are
+            turned away
+        '''
+        with self.settings(PASSWORD_HASHING_WORKERS=0,
+                           LOGIN_CONCURRENCY_PER_ACCOUNT=1):
+            with passwords.account_slot('user@mail.com'):
+                resp = self.login()
+
+            self.assertEqual(resp.status_code,
+                             status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', resp)
+
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
@@ -0,0 +1,128 @@
+from rest_framework.test import APIRequestFactory
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from college.models import CollegeModel
+from user.permissions import UserIsAdmin, UserIsHOD, UserIsTeacher
+from user.roles import get_role_scope
+
+User = get_user_model()
+
+
+class TestRoleScope(TestCase):
+    '''
+        Test Case to test resolution of User roles and scope
+    '''
+
+    def setUp(self):
+        '''
+            Setup for Tests
+        '''
+        cache.clear()
+
+        self.user = User.objects.create(
+            email='hod@mail.com',
+            first_name='Test',
+            last_name='HOD',
+            gender='Female',
+            is_hod=True,
+        )
+
+        self.college = CollegeModel.objects.create(
+            name='Test College',
+            address='Jammu',
+            alias_name='TC',
+            logo='https://i.pravatar.cc/300',
+            website='https://college.com',
+            mobile='9876543210',
+        )
+        self.college.hod.add(self.user)
+
+    def tearDown(self):
+        '''
+            Cleanup after running Tests
+        '''
+        cache.clear()
+
+    def get_request(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+
+        return request
+
+    def test_RoleScope_resolved(self):
+        '''
+            Test roles and scope of a User are resolved
+        '''
+        scope = get_role_scope(self.get_request(self.user))
+
+        self.assertTrue(scope.is_hod)
+        self.assertFalse(scope.is_admin)
+        self.assertEqual(scope.role, 'hod')
+        self.assertEqual(scope.college_ids, {self.college.id})
+
+    #? as with a cache shared between processes
+    @override_settings(TOKEN_VERSION_CACHE_TIMEOUT=30)
+    def test_RoleScope_resolved_once(self):
+        '''
+            Test permission checks run no queries, and scope is read
+            once for later requests
+        '''
+        with self.assertNumQueries(0):
+            for permission in [UserIsAdmin, UserIsHOD, UserIsTeacher]:
+                permission().has_permission(self.get_request(self.user), None)
+
+        get_role_scope(self.get_request(self.user)).college_ids
+
+        request = self.get_request(self.user)
+        with self.assertNumQueries(0):
+            UserIsHOD().has_permission(request, None)
+            self.assertEqual(
+                get_role_scope(request).college_ids,
+                {self.college.id},
+            )
+
+    def test_RoleScope_role_change(self):
+        '''
+            Test role changes take effect before the cache expires
+        '''
+        get_role_scope(self.get_request(self.user))
+
+        self.user.is_hod = False
+        self.user.is_teacher = True
+        self.user.save()
+
+        request = self.get_request(self.user)
+        self.assertFalse(UserIsHOD().has_permission(request, None))
+        self.assertTrue(UserIsTeacher().has_permission(request, None))
+
+    def test_RoleScope_college_change(self):
+        '''
+            Test College membership changes take effect before the cache
+            expires
+        '''
+        get_role_scope(self.get_request(self.user))
+
+        self.college.hod.remove(self.user)
+        self.assertEqual(
+            get_role_scope(self.get_request(self.user)).college_ids, set())
+
+        self.college.principal = self.user
+        self.college.save()
+        self.assertEqual(
+            get_role_scope(self.get_request(self.user)).college_ids,
+            {self.college.id})
+
+    def test_RoleScope_anonymous(self):
+        '''
+            Test anonymous requests have no roles
+        '''
+        from django.contrib.auth.models import AnonymousUser
+
+        scope = get_role_scope(self.get_request(AnonymousUser()))
+
+        self.assertEqual(scope.role, 'anonymous')
+        self.assertFalse(UserIsAdmin().has_permission(
+            self.get_request(AnonymousUser()), None))
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user'
+
+    def ready(self):
+        from .roles import connect_signals
+
+        connect_signals()
+
+        #? registers drf-spectacular extensions
+        from . import schema  # noqa: F401
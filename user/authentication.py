@@ -0,0 +1,180 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.utils.functional import cached_property
+
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from authlogic.revocation import ISSUED_AT_CLAIM, revocation_list
+
+from . import passwords
+from .roles import (
+    ROLES,
+    RoleScope,
+    RolesMixin,
+    get_token_version,
+    get_user_role_scope,
+)
+
+User = get_user_model()
+
+
+def get_token_claims(user):
+    '''
+        Returns claims describing roles and scope of given User, added to
+        their tokens
+    '''
+    scope = get_user_role_scope(user)
+
+    return {
+        'roles': sorted(scope.roles),
+        'college_ids': sorted(scope.college_ids),
+        'department_ids': sorted(scope.department_ids),
+        'class_ids': sorted(scope.class_ids),
+        'token_version': user.token_version,
+    }
+
+
+def is_current(token):
+    '''
+        Returns whether roles and scope claimed by given token are current
+    '''
+    return token.get('token_version') is not None and token.get(
+        'token_version') == get_token_version(
+            token.get(api_settings.USER_ID_CLAIM))
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    '''
+        Issues token pairs claiming roles and scope of the User, and the
+        sub-second time they were issued (see authlogic.revocation)
+
+        Note: passwords are verified in a process pool, see user.passwords
+    '''
+
+    def validate(self, attrs):
+        try:
+            self.user = passwords.authenticate(
+                attrs[self.username_field],
+                attrs['password'],
+                request=self.context.get('request'),
+            )
+        except passwords.LoginBusy as ex:
+            raise Throttled(wait=ex.wait, detail=str(ex))
+
+        if not api_settings.USER_AUTHENTICATION_RULE(self.user):
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        refresh = self.get_token(self.user)
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[ISSUED_AT_CLAIM] = token.current_time.timestamp()
+
+        for claim, value in get_token_claims(user).items():
+            token[claim] = value
+
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    '''
+        Refreshes access tokens, claiming current roles and scope of the
+        User if they changed since the refresh token was issued
+    '''
+
+    def validate(self, attrs):
+        if revocation_list.is_revoked(RefreshToken(attrs['refresh'])):
+            raise InvalidToken('Token is revoked')
+
+        data = super().validate(attrs)
+
+        access = AccessToken(data['access'])
+        if is_current(access):
+            return data
+
+        user = User.objects.filter(
+            pk=access[api_settings.USER_ID_CLAIM],
+            is_active=True,
+        ).first()
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+        for claim, value in get_token_claims(user).items():
+            access[claim] = value
+        data['access'] = str(access)
+
+        return data
+
+
+class ClaimsUser(RolesMixin, TokenUser):
+    '''
+        User built from claims of a token, without reading the database
+
+        Note: not a User model instance, load the User by pk where one
+        is needed
+    '''
+
+    @cached_property
+    def roles(self):
+        return frozenset(self.token.get('roles', ()))
+
+    def get_role_scope(self):
+        return RoleScope(
+            user_id=self.pk,
+            roles=[role for role in ROLES if role in self.roles],
+            ids={
+                'college': self.token.get('college_ids', []),
+                'department': self.token.get('department_ids', []),
+                'class': self.token.get('class_ids', []),
+            },
+        )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    '''
+        JWT authentication building request.user from token claims,
+        when settings.JWT_CLAIMS_AUTHENTICATION is on, rejecting revoked
+        tokens (see authlogic.revocation)
+
+        The token version claimed is checked against the User's current
+        one on every request (see user.roles.get_token_version), tokens
+        issued before a change of roles or scope load the User from the
+        database.
+    '''
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+
+        if revocation_list.is_revoked(validated_token):
+            raise InvalidToken('Token is revoked')
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        if settings.JWT_CLAIMS_AUTHENTICATION and is_current(validated_token):
+            return ClaimsUser(validated_token)
+
+        return super().get_user(validated_token)
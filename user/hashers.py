@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    '''
+        Argon2 hasher with costs of settings.ARGON2_TIME_COST,
+        ARGON2_MEMORY_COST (KiB) and ARGON2_PARALLELISM
+
+        Note: passwords hashed with other costs are rehashed on login,
+        see the calibrate_argon2 command to pick costs for a host
+    '''
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
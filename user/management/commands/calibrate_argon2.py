@@ -0,0 +1,96 @@
+import os
+import statistics
+import time
+
+import argon2
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def time_hash(hasher, samples):
+    '''
+        Returns median milliseconds hashing a password takes with hasher
+    '''
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash('calibrate-argon2')
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks Argon2 on this host and recommends the time cost (ARGON2_TIME_COST) hashing a password in about --target-ms at given memory cost and parallelism.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target-ms',
+            type=float,
+            default=100,
+            help='Milliseconds a password hash should take',
+        )
+        parser.add_argument(
+            '--memory-cost',
+            type=int,
+            default=settings.ARGON2_MEMORY_COST,
+            help='Memory used per hash, in KiB',
+        )
+        parser.add_argument(
+            '--parallelism',
+            type=int,
+            default=settings.ARGON2_PARALLELISM,
+            help='Threads used per hash',
+        )
+        parser.add_argument(
+            '--max-time-cost',
+            type=int,
+            default=20,
+            help='Highest time cost tried',
+        )
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=5,
+            help='Hashes timed per time cost',
+        )
+
+    def handle(self, *args, **options):
+        memory_cost = options['memory_cost']
+        parallelism = options['parallelism']
+
+        self.stdout.write(f'Calibrating on {os.cpu_count()} CPUs, '
+                          f'{memory_cost} KiB, parallelism {parallelism}')
+
+        time_cost, elapsed = 1, 0
+        for time_cost in range(1, options['max_time_cost'] + 1):
+            elapsed = time_hash(
+                argon2.PasswordHasher(
+                    time_cost=time_cost,
+                    memory_cost=memory_cost,
+                    parallelism=parallelism,
+                ),
+                options['samples'],
+            )
+            self.stdout.write(f'  time cost {time_cost}: {elapsed:.1f}ms')
+
+            if elapsed >= options['target_ms']:
+                break
+
+        if time_cost == 1 and elapsed > options['target_ms'] * 1.5:
+            self.stdout.write(
+                self.style.WARNING(
+                    'Memory cost alone exceeds the target, lower --memory-cost'
+                ))
+
+        workers = settings.PASSWORD_HASHING_WORKERS or 1
+        self.stdout.write(f'Logins per second per web process, with '
+                          f'{workers} PASSWORD_HASHING_WORKERS: '
+                          f'{workers * 1000 / elapsed:.0f}'
+                          ' (fewer if they outnumber CPUs)')
+
+        self.stdout.write(self.style.SUCCESS('Recommended settings:'))
+        self.stdout.write(f'ARGON2_TIME_COST={time_cost}\n'
+                          f'ARGON2_MEMORY_COST={memory_cost}\n'
+                          f'ARGON2_PARALLELISM={parallelism}')
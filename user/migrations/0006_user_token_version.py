@@ -0,0 +1,19 @@
+# Generated by Django 4.1.3 on 2026-10-18 15:57
+
+from django.db import migrations, models
+import user.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_user_address_user_district'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.CharField(default=user.models.new_token_version, editable=False, max_length=32),
+        ),
+    ]
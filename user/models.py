@@ -1,13 +1,19 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
-from django.core.mail import send_mail
 from django.contrib.auth.models import PermissionsMixin
+from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.models import AbstractBaseUser
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
 
 from .managers import UserManager
 
 from api.utils import DISTRICTS_CHOICES
+from mailer.outbox import queue_email
 
 GENDER_CHOICES = (
     ('Male', 'Male'),
@@ -16,6 +22,10 @@ GENDER_CHOICES = (
 )
 
 
+def new_token_version():
+    return uuid.uuid4().hex
+
+
 class User(AbstractBaseUser, PermissionsMixin):
     '''Base User Model'''
     username = None
@@ -63,6 +73,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         default=False,
         help_text=_('Is the Person Teacher or not'))
 
+    #? changed with roles and scope of the User, tokens issued before
+    #? are no longer trusted for them, see user.roles
+    token_version = models.CharField(
+        max_length=32,
+        default=new_token_version,
+        editable=False,
+    )
+
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
@@ -91,6 +109,40 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def email_user(self, subject, message, from_email=None, **kwargs):
         '''
-            Sends an email to the User
+            Queues an email to the User in the outbox
+
+            Note: sent by the mailer dispatcher, not in the request
+        '''
+        queue_email(
+            [self.email],
+            subject,
+            message,
+            from_email=from_email,
+            html_body=kwargs.get('html_message', ''),
+        )
+
+    def email_welcome(self):
+        '''
+            Queues the welcome email of a new User, with the link they
+            set their password with
+
+            Note: never put the password in the email, it is stored in the
+            outbox
+        '''
+        subject = 'Welcome to Upasthiti'
+        message = f'Hello {self.first_name},\n\nWelcome to Upasthiti.\n\nYour account has been created with the email {self.email}.\n\nSet your password here:\n\n{self.get_password_set_url()}\n\nRegards,\nUpasthiti'
+
+        self.email_user(subject, message)
+
+    def get_password_set_url(self):
+        '''
+            return link the User sets their password with, see
+            settings.PASSWORD_SET_URL
+
+            Note: valid for settings.PASSWORD_RESET_TIMEOUT seconds and
+            until the password changes
         '''
-        send_mail(subject, message, from_email, [self.email], **kwargs)
+        return settings.PASSWORD_SET_URL.format(
+            uid=urlsafe_base64_encode(force_bytes(self.pk)),
+            token=default_token_generator.make_token(self),
+        )
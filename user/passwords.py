@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+#? settings the pool processes hash passwords with
+POOL_SETTINGS = [
+    'PASSWORD_HASHERS',
+    'ARGON2_TIME_COST',
+    'ARGON2_MEMORY_COST',
+    'ARGON2_PARALLELISM',
+]
+
+
+class LoginBusy(Exception):
+    '''
+        Raised when no password can be verified at the moment
+
+        args:
+            - wait: seconds to wait before retrying
+    '''
+
+    def __init__(self, message, wait):
+        super().__init__(message)
+        self.wait = wait
+
+
+def _init_worker(options):
+    '''
+        Configures settings of a pool process, only hashers are used
+    '''
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure(**options)
+
+
+def verify_password(password, encoded):
+    '''
+        Checks password against encoded hash, in a pool process
+
+        returns:
+            - (valid, new encoded hash if it must be rehashed else None)
+    '''
+    rehashed = []
+    valid = check_password(
+        password,
+        encoded,
+        setter=lambda raw: rehashed.append(make_password(raw)),
+    )
+
+    return valid, rehashed[0] if rehashed else None
+
+
+@lru_cache(maxsize=None)
+def get_pool():
+    '''
+        Returns process pool verifying passwords, of
+        settings.PASSWORD_HASHING_WORKERS processes, None if it is 0
+    '''
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return None
+
+    #? spawn, forking a threaded web worker is unsafe
+    return ProcessPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_WORKERS,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=({name: getattr(settings, name)
+                   for name in POOL_SETTINGS}, ),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_slots():
+    '''
+        Returns semaphore bounding verifications waiting for or running
+        in the pool, settings.PASSWORD_HASHING_QUEUE_SIZE
+    '''
+    return threading.BoundedSemaphore(settings.PASSWORD_HASHING_QUEUE_SIZE)
+
+
+def run_hashing(func, *args):
+    '''
+        Runs a hashing function in the pool, in this thread without one
+
+        raises:
+            - LoginBusy: if the pool stays full for
+              settings.PASSWORD_HASHING_QUEUE_TIMEOUT seconds
+    '''
+    slots = get_slots()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        raise LoginBusy('Too many logins at the moment.',
+                        settings.PASSWORD_HASHING_QUEUE_TIMEOUT)
+
+    try:
+        pool = get_pool()
+        if pool is None:
+            return func(*args)
+
+        try:
+            return pool.submit(func, *args).result()
+        except BrokenProcessPool as ex:
+            #? a process died (e.g. out of memory), start a new pool
+            logger.error(f'Password hashing pool broken: {ex}')
+            get_pool.cache_clear()
+            return func(*args)
+
+    finally:
+        slots.release()
+
+
+@contextmanager
+def account_slot(email):
+    '''
+        Holds one of settings.LOGIN_CONCURRENCY_PER_ACCOUNT concurrent
+        logins of given account
+
+        raises:
+            - LoginBusy: if all are held, e.g. by a credential stuffing burst
+    '''
+    key = 'login:{}:running'.format(
+        hashlib.sha256(email.lower().encode()).hexdigest())
+
+    #? timeout frees slots of crashed requests
+    timeout = settings.PASSWORD_HASHING_QUEUE_TIMEOUT * 2
+
+    running = 1
+    if not cache.add(key, running, timeout):
+        try:
+            running = cache.incr(key)
+        except ValueError:
+            cache.add(key, running, timeout)
+
+    try:
+        if running > settings.LOGIN_CONCURRENCY_PER_ACCOUNT:
+            raise LoginBusy('Too many logins to this account at the moment.',
+                            1)
+
+        yield
+
+    finally:
+        try:
+            cache.decr(key)
+        except ValueError:
+            pass
+
+
+def authenticate(email, password, request=None):
+    '''
+        Returns the User of given credentials, None if they are invalid
+
+        Unlike django.contrib.auth.authenticate the password is verified
+        in the process pool, and rehashed there if the hasher or its costs
+        changed.
+
+        raises:
+            - LoginBusy: see run_hashing and account_slot
+    '''
+    User = get_user_model()
+
+    with account_slot(email):
+        try:
+            user = User._default_manager.get_by_natural_key(email)
+        except User.DoesNotExist:
+            #? hash anyway, so response time doesn't tell the User exists
+            run_hashing(make_password, password)
+            user = None
+        else:
+            valid, rehashed = run_hashing(verify_password, password,
+                                          user.password)
+            if not valid:
+                user = None
+            elif rehashed:
+                user.password = rehashed
+                user.save(update_fields=['password'])
+
+    if user is None:
+        user_login_failed.send(
+            sender=__name__,
+            credentials={'email': email},
+            request=request,
+        )
+
+    return user
@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .roles import get_role_scope
+
 
 class UserIsAdmin(permissions.BasePermission):
     '''
@@ -7,7 +9,7 @@ class UserIsAdmin(permissions.BasePermission):
     '''
 
     def has_permission(self, request, view):
-        if request.user.is_admin:
+        if get_role_scope(request).is_admin:
             return True
         return False
 
@@ -18,7 +20,7 @@ class UserIsPrincipal(permissions.BasePermission):
     '''
 
     def has_permission(self, request, view):
-        if request.user.is_principal:
+        if get_role_scope(request).is_principal:
             return True
         return False
 
@@ -29,7 +31,7 @@ class UserIsHOD(permissions.BasePermission):
     '''
 
     def has_permission(self, request, view):
-        if request.user.is_hod:
+        if get_role_scope(request).is_hod:
             return True
         return False
 
@@ -40,7 +42,7 @@ class UserIsTeacher(permissions.BasePermission):
     '''
 
     def has_permission(self, request, view):
-        if request.user.is_teacher:
+        if get_role_scope(request).is_teacher:
             return True
         return False
 
@@ -51,7 +53,7 @@ class UserIsTeacherRO(permissions.BasePermission):
     '''
 
     def has_permission(self, request, view):
-        if request.user.is_teacher:
+        if get_role_scope(request).is_teacher:
             if request.method in permissions.SAFE_METHODS:
                 return True
             else:
@@ -0,0 +1,372 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+
+from .models import new_token_version
+
+ROLES = ('admin', 'principal', 'hod', 'teacher')
+
+#? saves touching only these fields never change roles or scope
+ROLE_SCOPE_IGNORED_FIELDS = {'last_login', 'password'}
+
+#? models with a User field granting scope over them -> field name
+ROLE_SCOPE_FIELDS = {
+    'college.CollegeModel': 'principal',
+    'department.DepartmentModel': 'hod',
+    'classes.ClassModel': 'teacher',
+}
+
+
+class RolesMixin:
+    '''
+        Role flags of objects with a set of roles
+    '''
+
+    @property
+    def is_admin(self):
+        return 'admin' in self.roles
+
+    @property
+    def is_principal(self):
+        return 'principal' in self.roles
+
+    @property
+    def is_hod(self):
+        return 'hod' in self.roles
+
+    @property
+    def is_teacher(self):
+        return 'teacher' in self.roles
+
+
+class RoleScope(RolesMixin):
+    '''
+        Roles of a User and ids of Colleges, Departments and Classes
+        they are part of
+
+        Note: ids are read on first use and cached for
+        settings.ROLE_SCOPE_CACHE_TIMEOUT seconds under the User's token
+        version, so checking roles alone never runs a query
+
+        usage:
+            scope = get_role_scope(request)
+            if scope.is_hod:
+                queryset = queryset.filter(college__in=scope.college_ids)
+    '''
+
+    def __init__(self, user_id=None, roles=(), ids=None):
+        self.user_id = user_id
+        self.roles = frozenset(roles)
+        self.ids = load_scope_ids(None) if user_id is None else ids
+
+    def __repr__(self):
+        return f'<RoleScope user={self.user_id} roles={sorted(self.roles)}>'
+
+    @property
+    def is_authenticated(self):
+        return self.user_id is not None
+
+    @property
+    def role(self):
+        '''
+            Returns roles joined in a fixed order, e.g. for cache keys
+        '''
+        if not self.is_authenticated:
+            return 'anonymous'
+
+        return '-'.join(role for role in ROLES if role in self.roles) or 'user'
+
+    def get_ids(self, name):
+        if self.ids is None:
+            key = (f'role-scope:{self.user_id}:'
+                   f'{get_token_version(self.user_id)}')
+
+            self.ids = cache.get(key)
+            if self.ids is None:
+                self.ids = load_scope_ids(self.user_id)
+                cache.set(key, self.ids, settings.ROLE_SCOPE_CACHE_TIMEOUT)
+
+        return frozenset(self.ids[name])
+
+    @property
+    def college_ids(self):
+        return self.get_ids('college')
+
+    @property
+    def department_ids(self):
+        return self.get_ids('department')
+
+    @property
+    def class_ids(self):
+        return self.get_ids('class')
+
+
+def get_token_version_key(user_id):
+    return f'user:{user_id}:token-version'
+
+
+def get_token_version(user_id):
+    '''
+        Returns current token version of given User, None if there is no
+        such User
+
+        Note: cached for settings.TOKEN_VERSION_CACHE_TIMEOUT seconds, or
+        read from the database every time when it is 0, the default
+        unless the cache is shared between processes
+    '''
+    key = get_token_version_key(user_id)
+    timeout = settings.TOKEN_VERSION_CACHE_TIMEOUT
+
+    version = cache.get(key) if timeout else None
+    if version is None:
+        User = apps.get_model(settings.AUTH_USER_MODEL)
+        version = User.objects.filter(pk=user_id).values_list(
+            'token_version', flat=True).first()
+
+        if version is not None and timeout:
+            cache.set(key, version, timeout)
+
+    return version
+
+
+def get_user_roles(user_id):
+    '''
+        Returns current roles of given User, None if there is no such
+        active User
+
+        Note: cached for settings.ROLE_SCOPE_CACHE_TIMEOUT seconds under
+        the User's token version, like RoleScope ids
+    '''
+    version = get_token_version(user_id)
+    if version is None:
+        return None
+
+    key = f'user-roles:{user_id}:{version}'
+
+    roles = cache.get(key)
+    if roles is None:
+        User = apps.get_model(settings.AUTH_USER_MODEL)
+        flags = User.objects.filter(
+            pk=user_id,
+            is_active=True).values(*[f'is_{role}' for role in ROLES]).first()
+
+        #? inactive Users are cached as False, None is a miss
+        roles = False if flags is None else [
+            role for role in ROLES if flags[f'is_{role}']
+        ]
+        cache.set(key, roles, settings.ROLE_SCOPE_CACHE_TIMEOUT)
+
+    return None if roles is False else frozenset(roles)
+
+
+def cache_token_versions(versions):
+    '''
+        Caches token versions of a dict of User id -> version, now and
+        again once the current transaction commits
+    '''
+
+    def set_many():
+        cache.set_many(
+            {
+                get_token_version_key(user_id): version
+                for user_id, version in versions.items()
+            },
+            settings.TOKEN_VERSION_CACHE_TIMEOUT,
+        )
+
+    if not settings.TOKEN_VERSION_CACHE_TIMEOUT:
+        return
+
+    #? a version read by another request before the commit may be cached
+    set_many()
+    transaction.on_commit(set_many)
+
+
+def bump_token_versions(user_ids):
+    '''
+        Changes token version of given Users, dropping their cached
+        RoleScope and their tokens' claims
+    '''
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    version = new_token_version()
+
+    User.objects.filter(pk__in=user_ids).update(token_version=version)
+    cache_token_versions({user_id: version for user_id in user_ids})
+
+
+def load_scope_ids(user_id):
+    '''
+        Returns ids of Colleges, Departments and Classes of given User,
+        read from the database
+    '''
+    if user_id is None:
+        return {'college': [], 'department': [], 'class': []}
+
+    College = apps.get_model('college.CollegeModel')
+    Department = apps.get_model('department.DepartmentModel')
+    Class = apps.get_model('classes.ClassModel')
+
+    return {
+        'college':
+        list(
+            College.objects.filter(
+                Q(principal=user_id) | Q(hod=user_id)
+                | Q(teacher=user_id)).values_list('id', flat=True).distinct()),
+        'department':
+        list(
+            Department.objects.filter(hod=user_id).values_list('id',
+                                                               flat=True)),
+        'class':
+        list(
+            Class.objects.filter(teacher=user_id).values_list('id',
+                                                              flat=True)),
+    }
+
+
+def get_user_role_scope(user):
+    '''
+        Returns RoleScope of given User
+    '''
+    if not user or not user.is_authenticated:
+        return RoleScope()
+
+    #? scope of a user built from token claims comes with the token
+    if hasattr(user, 'get_role_scope'):
+        return user.get_role_scope()
+
+    return RoleScope(
+        user_id=user.pk,
+        roles=[role for role in ROLES if getattr(user, f'is_{role}')],
+    )
+
+
+def get_role_scope(request):
+    '''
+        Returns RoleScope of the user of given request, resolved once
+        per request
+
+        Note: kept on the underlying HttpRequest, so it is shared by
+        permission classes, views and querysets
+    '''
+    request = getattr(request, '_request', request)
+
+    scope = getattr(request, 'role_scope', None)
+    if scope is None or scope.user_id != getattr(request.user, 'pk', None):
+        scope = get_user_role_scope(request.user)
+        request.role_scope = scope
+
+    return scope
+
+
+def _is_ignored(update_fields):
+    return update_fields and set(update_fields) <= ROLE_SCOPE_IGNORED_FIELDS
+
+
+def _user_saving(instance, raw=False, update_fields=None, **kwargs):
+    if raw or _is_ignored(update_fields):
+        return
+
+    #? any other save may change roles, trust no token issued before
+    instance.token_version = new_token_version()
+
+
+def _user_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or _is_ignored(update_fields):
+        return
+
+    if update_fields and 'token_version' not in update_fields:
+        sender.objects.filter(pk=instance.pk).update(
+            token_version=instance.token_version)
+
+    cache_token_versions({instance.pk: instance.token_version})
+
+
+def _user_deleted(instance, **kwargs):
+    cache.delete(get_token_version_key(instance.pk))
+
+
+def _get_scope_field_receivers(field):
+    '''
+        Returns signal receivers bumping versions of the previous and
+        current User of given field
+    '''
+
+    def pre_save_receiver(sender, instance, raw=False, **kwargs):
+        instance._role_scope_user_id = None
+        if instance.pk and not raw:
+            instance._role_scope_user_id = sender.objects.filter(
+                pk=instance.pk).values_list(f'{field}_id', flat=True).first()
+
+    def receiver(instance, **kwargs):
+        bump_token_versions([
+            getattr(instance, '_role_scope_user_id', None),
+            getattr(instance, f'{field}_id'),
+        ])
+
+    return pre_save_receiver, receiver
+
+
+def _get_members_receiver(field):
+    '''
+        Returns signal receiver bumping versions of Users added to or
+        removed from given many to many field of a College
+    '''
+
+    def receiver(instance, action, reverse, pk_set=None, **kwargs):
+        if action in ('post_add', 'post_remove'):
+            bump_token_versions([instance.pk] if reverse else pk_set)
+
+        #? members are unknown once cleared
+        elif action == 'pre_clear':
+            bump_token_versions([instance.pk] if reverse else getattr(
+                instance, field).values_list('id', flat=True))
+
+    return receiver
+
+
+def connect_signals():
+    '''
+        Connects version bumps of Users to changes of their roles and scope
+
+        Called once from UserConfig.ready
+    '''
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    pre_save.connect(_user_saving, sender=User, dispatch_uid='role-scope')
+    post_save.connect(_user_saved, sender=User, dispatch_uid='role-scope')
+    post_delete.connect(_user_deleted, sender=User, dispatch_uid='role-scope')
+
+    for label, field in ROLE_SCOPE_FIELDS.items():
+        model = apps.get_model(label)
+        pre_save_receiver, receiver = _get_scope_field_receivers(field)
+        uid = f'role-scope:{label}'
+
+        pre_save.connect(pre_save_receiver,
+                         sender=model,
+                         weak=False,
+                         dispatch_uid=uid)
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver,
+                            sender=model,
+                            weak=False,
+                            dispatch_uid=uid)
+
+    College = apps.get_model('college.CollegeModel')
+    for field in ('hod', 'teacher'):
+        m2m_changed.connect(
+            _get_members_receiver(field),
+            sender=getattr(College, field).through,
+            weak=False,
+            dispatch_uid=f'role-scope:{College._meta.label}.{field}',
+        )
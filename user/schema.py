@@ -0,0 +1,21 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+    TokenRefreshSerializerExtension,
+)
+
+#? drf-spectacular extensions only match their exact class,
+#? document subclasses of user.authentication like their bases
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = 'user.authentication.ClaimsJWTAuthentication'
+
+
+class ClaimsTokenObtainPairSerializerExtension(
+        TokenObtainPairSerializerExtension):
+    target_class = 'user.authentication.ClaimsTokenObtainPairSerializer'
+
+
+class ClaimsTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = 'user.authentication.ClaimsTokenRefreshSerializer'
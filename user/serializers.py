@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 
 from college.models import CollegeModel
+from api.fieldsets import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -55,7 +56,7 @@ class TeacherCollegeSerializer(serializers.ModelSerializer):
 ##############################################################################################
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer for User
     '''
@@ -220,7 +221,7 @@ class UserPasswordSerializer(serializers.Serializer):
         return attrs
 
 
-class HODSerializer(serializers.ModelSerializer):
+class HODSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer for listing HODs
     '''
@@ -257,7 +258,7 @@ class HODSerializer(serializers.ModelSerializer):
         ]
 
 
-class PrincipalSerializer(serializers.ModelSerializer):
+class PrincipalSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     '''
         Serializer for listing Principals
     '''
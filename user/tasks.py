@@ -0,0 +1,14 @@
+from django.contrib.auth import get_user_model
+
+from jobs.queue import task
+
+User = get_user_model()
+
+
+@task('user.welcome', max_attempts=5)
+def email_welcome(user_id):
+    '''
+        Queues the welcome email of the User of given id, see
+        User.email_welcome
+    '''
+    User.objects.get(id=user_id).email_welcome()
@@ -19,8 +19,11 @@ from .permissions import UserIsAdmin
 from .filters import HODFilter, TeacherFilter
 
 from api.paginator import StandardPagination
+from api.query_planner import QueryPlanMixin
 
 from college.models import CollegeModel
+from jobs.queue import enqueue
+from authlogic.revocation import revoke_user_tokens
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -62,7 +65,7 @@ logger = logging.getLogger(__name__)
         },
         description='Returns list of all Users.'),
 )
-class UserListCreateAPIView(generics.ListCreateAPIView):
+class UserListCreateAPIView(QueryPlanMixin, generics.ListCreateAPIView):
     '''
         Allowed methods: GET, POST
 
@@ -169,10 +172,8 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
                     logger.info('User(HOD) assigned to the Colleges')
 
             #? send email to user
-            subject = 'Welcome to Upasthiti'
-            message = f'Hello {user.first_name},\n\nWelcome to Upasthiti.\n\nYour login credentials are:\n\nEmail: {user.email}\nPassword: {request.data["password"]}\n\nRegards,\nUpasthiti'
-
-            user.email_user(subject, message)
+            #! Note: queued by id only, the Job payload is stored
+            enqueue('user.welcome', {'user_id': user.id}, user=request.user)
 
             #? if development environment, log password
             if settings.DEBUG:
@@ -180,7 +181,6 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
                 logger.info(
                     f'>>>>>>>>>>>>>>>>>>>>>>>>>>> password for user {request.data["email"]} is {request.data["password"]} <<<<<<<<<<<<<<<<<<<<<<<<<<<'
                 )
-                logger.info(message)
 
         except Exception as ex:
             logger.error(str(ex))
@@ -260,7 +260,8 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
             ),
         }),
 )
-class UserRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
+class UserRetrieveUpdateDestroyAPIView(QueryPlanMixin,
+                                       generics.GenericAPIView):
     '''
         Allowed methods: GET, PATCH, DELETE
 
@@ -282,7 +283,7 @@ class UserRetrieveUpdateDestroyAPIView(generics.GenericAPIView):
     #? get single User
     def get(self, request, *args, **kwargs):
         user = self.get_object()
-        serializer = UserSerializer(user)
+        serializer = UserSerializer(user, context={'request': request})
         return Response(serializer.data)
 
     #? Update User of given Id
@@ -426,6 +427,8 @@ class UserPasswordUpdateAPIView(generics.GenericAPIView):
     '''
         Updates the Password of User of given Id.
 
+        Note: tokens of the User issued before are revoked
+
         Accessible by: Admin
     '''
     queryset = User.objects.all()
@@ -443,6 +446,9 @@ class UserPasswordUpdateAPIView(generics.GenericAPIView):
         user.set_password(serializer.validated_data['password'])
         user.save()
 
+        #? sessions on other devices must log in with the new password
+        revoke_user_tokens(user.id)
+
         response = {'detail': ['Password Updated Successfully']}
         logger.info(response)
 
@@ -466,7 +472,7 @@ class UserPasswordUpdateAPIView(generics.GenericAPIView):
                 response=OpenApiTypes.OBJECT,
             ),
         }), )
-class UsersAdminListAPIView(generics.ListAPIView):
+class UsersAdminListAPIView(QueryPlanMixin, generics.ListAPIView):
     '''
         returns all Admin Users
 
@@ -499,7 +505,7 @@ class UsersAdminListAPIView(generics.ListAPIView):
                 response=OpenApiTypes.OBJECT,
             ),
         }), )
-class UsersPrincipalListAPIView(generics.ListAPIView):
+class UsersPrincipalListAPIView(QueryPlanMixin, generics.ListAPIView):
     '''
         returns all Principal Users
 
@@ -532,7 +538,7 @@ class UsersPrincipalListAPIView(generics.ListAPIView):
                 response=OpenApiTypes.OBJECT,
             ),
         }), )
-class UsersTeacherListAPIView(generics.ListAPIView):
+class UsersTeacherListAPIView(QueryPlanMixin, generics.ListAPIView):
     '''
         returns all Teacher Users
 
@@ -570,7 +576,7 @@ class UsersTeacherListAPIView(generics.ListAPIView):
                 response=OpenApiTypes.OBJECT,
             ),
         }), )
-class UsersHodListAPIView(generics.ListAPIView):
+class UsersHodListAPIView(QueryPlanMixin, generics.ListAPIView):
     '''
         returns all HOD Users
 